@@ -0,0 +1,222 @@
+"""Minimal OpenAI-compatible HTTP server for offline tests.
+
+Serves ``GET /v1/models`` and ``POST /v1/chat/completions`` (plain and
+``stream=True`` server-sent events).  Replies echo the last user message, so
+the ``openai_compatible`` provider can be exercised without a GPU::
+
+    with OpenAICompatibleStubServer() as server:
+        os.environ["OPENAI_COMPATIBLE_BASE_URLS"] = server.base_url
+        client, model, provider = setup_llm_client("local-openai-compatible")
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+def _reply_text(body: Dict[str, Any]) -> str:
+    for message in reversed(body.get("messages") or []):
+        if message.get("role") != "user":
+            continue
+        content = message.get("content")
+        if isinstance(content, list):  # multimodal parts
+            content = " ".join(
+                part.get("text", "") for part in content if isinstance(part, dict)
+            )
+        return f"stub: {content}"
+    return "stub:"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_StubHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass  # keep test output quiet
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.rstrip("/") != "/v1/models":
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        model = self.server.stub.model_name
+        self._send_json(200, {"object": "list", "data": [{"id": model, "object": "model"}]})
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON body"}})
+            return
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        stub = self.server.stub
+        stub._record(body)
+        if stub.latency_seconds:
+            time.sleep(stub.latency_seconds)
+        if stub.hold is not None:
+            stub.hold.wait()
+        text = _reply_text(body)
+        model = body.get("model") or stub.model_name
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        if body.get("stream"):
+            self._stream(completion_id, model, text)
+            return
+        prompt_tokens = sum(
+            len(str(m.get("content", "")).split()) for m in body.get("messages") or []
+        )
+        completion_tokens = len(text.split())
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _stream(self, completion_id: str, model: str, text: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            delta = {"content": word if i == 0 else f" {word}"}
+            if i == 0:
+                delta["role"] = "assistant"
+            self._event({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+            })
+        self._event({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        })
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _event(self, payload: Dict[str, Any]) -> None:
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode())
+        self.wfile.flush()
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    stub: "OpenAICompatibleStubServer"
+
+
+class OpenAICompatibleStubServer:
+    """Background-thread OpenAI-compatible server bound to localhost.
+
+    Parameters
+    ----------
+    host, port:
+        Bind address; ``port=0`` picks a free port.
+    model_name:
+        Model id advertised by ``/v1/models``.
+    latency_seconds:
+        Delay added before each completion.
+    hold:
+        Event every completion waits on before replying, so a test decides
+        exactly when a slow endpoint finishes.
+
+    ``requests`` holds the decoded JSON bodies of completion requests received.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        model_name: str = "stub-model",
+        latency_seconds: float = 0.0,
+        hold: Optional[threading.Event] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.model_name = model_name
+        self.latency_seconds = latency_seconds
+        self.hold = hold
+        self.requests: list[Dict[str, Any]] = []
+        self._received = threading.Condition()
+        self._httpd: Optional[_StubHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("Stub server is not running.")
+        return f"http://{self.host}:{self._httpd.server_address[1]}/v1"
+
+    def _record(self, body: Dict[str, Any]) -> None:
+        with self._received:
+            self.requests.append(body)
+            self._received.notify_all()
+
+    def wait_for_requests(self, count: int, timeout: float = 5.0) -> bool:
+        """Block until ``count`` completion requests have arrived."""
+        with self._received:
+            return self._received.wait_for(lambda: len(self.requests) >= count, timeout)
+
+    def start(self) -> "OpenAICompatibleStubServer":
+        if self._httpd is not None:
+            return self
+        httpd = _StubHTTPServer((self.host, self.port), _Handler)
+        httpd.stub = self
+        self._httpd = httpd
+        self._thread = threading.Thread(
+            target=httpd.serve_forever, name="openai-stub-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        httpd, self._httpd = self._httpd, None
+        if httpd is None:
+            return
+        if self.hold is not None:
+            self.hold.set()  # never leave a handler blocked on shutdown
+        httpd.shutdown()
+        httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "OpenAICompatibleStubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+__all__ = ["OpenAICompatibleStubServer"]
@@ -0,0 +1,173 @@
+"""Artifact path resolution, compression and index behaviour."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.artifacts import resolve_artifact_path, save_artifact  # noqa: E402
+from utils.errors import ArtifactSecurityError  # noqa: E402
+
+
+def test_directory_swapped_for_symlink_cannot_escape(tmp_path):
+    base = tmp_path / 'artifacts'
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    save_artifact('ok', 'notes.txt', base_dir=base, subdir='reports')
+
+    (base / 'reports' / 'notes.txt').unlink()
+    (base / 'reports').rmdir()
+    (base / 'reports').symlink_to(outside, target_is_directory=True)
+
+    with pytest.raises(ArtifactSecurityError):
+        resolve_artifact_path('notes.txt', base_dir=base, subdir='reports')
+    with pytest.raises(ArtifactSecurityError):
+        save_artifact('escaped', 'notes.txt', base_dir=base, subdir='reports')
+    assert not (outside / 'notes.txt').exists()
+
+
+def test_index_is_opt_in(tmp_path, monkeypatch):
+    from utils.artifacts import list_artifacts
+
+    monkeypatch.delenv('AGA_ARTIFACT_INDEX', raising=False)
+    save_artifact('a', 'a.txt', base_dir=tmp_path)
+    assert list_artifacts(base_dir=tmp_path) == []
+
+    monkeypatch.setenv('AGA_ARTIFACT_INDEX', '1')
+    save_artifact('b', 'b.txt', base_dir=tmp_path)
+    save_artifact('c', 'c.txt', base_dir=tmp_path, index=False)
+    assert [r.path for r in list_artifacts(base_dir=tmp_path)] == ['b.txt']
+
+
+def test_list_artifacts_filters_and_rebuild(tmp_path):
+    from utils.artifacts import list_artifacts, rebuild_index
+
+    save_artifact('# prd', 'prd.md', base_dir=tmp_path, index=True)
+    save_artifact(b'\x89PNG', 'shot.png', base_dir=tmp_path, subdir='screens', index=True)
+    save_artifact(b'\x89PNG', 'deep.png', base_dir=tmp_path, subdir='screens/v2', index=True)
+
+    paths = lambda **kw: sorted(r.path for r in list_artifacts(base_dir=tmp_path, **kw))  # noqa: E731
+    assert paths(subdir='') == ['prd.md']
+    assert paths(subdir='screens') == ['screens/shot.png', 'screens/v2/deep.png']
+    assert paths(kind='image') == paths(kind='.png') == paths(kind='image/png')
+    assert paths(kind='.md') == ['prd.md']
+
+    (tmp_path / 'prd.md').unlink()
+    (tmp_path / 'notes.txt').write_text('untracked')
+    assert rebuild_index(tmp_path) == 3
+    assert paths(subdir='') == ['notes.txt']
+    record = list_artifacts(kind='.txt', base_dir=tmp_path)[0]
+    assert record.size == len('untracked') and record.sha256
+
+
+def test_compressed_and_raw_forms_are_one_artifact(tmp_path):
+    from utils.artifacts import load_artifact
+    from utils.errors import ArtifactError
+
+    save_artifact('old', 'a.md', base_dir=tmp_path)
+    written = save_artifact('new', 'a.md', base_dir=tmp_path, overwrite=True, compress='gzip')
+    assert written.name == 'a.md.gz'
+    assert not (tmp_path / 'a.md').exists()
+    assert load_artifact('a.md', base_dir=tmp_path) == 'new'
+
+    save_artifact('zipped', 'b.md', base_dir=tmp_path, compress='gzip')
+    with pytest.raises(ArtifactError):
+        save_artifact('raw', 'b.md', base_dir=tmp_path)
+    save_artifact('raw', 'b.md', base_dir=tmp_path, overwrite=True)
+    assert sorted(p.name for p in tmp_path.glob('b.md*')) == ['b.md']
+    assert load_artifact('b.md', base_dir=tmp_path) == 'raw'
+
+
+def test_user_gzip_files_are_loaded_as_stored(tmp_path):
+    import gzip
+
+    from utils.artifacts import load_artifact
+
+    blob = gzip.compress(b'payload')
+    save_artifact(blob, 'dump.gz', base_dir=tmp_path)
+    assert load_artifact('dump.gz', base_dir=tmp_path) == blob
+    with load_artifact('dump.gz', base_dir=tmp_path, as_='mmap') as mm:
+        assert mm[:] == blob
+
+
+def test_forced_compression_leaves_binary_artifacts_raw(tmp_path, monkeypatch):
+    monkeypatch.setenv('AGA_ARTIFACT_COMPRESSION', 'gzip')
+    png = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+    assert save_artifact(png, 'x.png', base_dir=tmp_path).name == 'x.png'
+    assert (tmp_path / 'x.png').read_bytes() == png
+    assert save_artifact('{}', 'x.json', base_dir=tmp_path).name == 'x.json.gz'
+
+
+def test_mapped_loads_are_read_only_views_of_the_file(tmp_path, monkeypatch):
+    import mmap
+
+    from utils.artifacts import load_artifact
+    from utils.errors import ArtifactError
+
+    payload = bytes(range(256)) * 64
+    save_artifact(payload, 'blob.bin', base_dir=tmp_path)
+    with load_artifact('blob.bin', base_dir=tmp_path, as_='mmap') as mm:
+        assert isinstance(mm, mmap.mmap) and mm[256:260] == payload[256:260]
+        with pytest.raises(TypeError):
+            mm[0] = 1
+    view = load_artifact('blob.bin', base_dir=tmp_path, as_='memoryview')
+    assert view.readonly and view.nbytes == len(payload) and view[-1] == 255
+    view.release()
+
+    save_artifact(b'', 'empty.bin', base_dir=tmp_path)
+    assert load_artifact('empty.bin', base_dir=tmp_path, as_='memoryview').nbytes == 0
+
+    monkeypatch.setenv('AGA_ARTIFACT_COMPRESSION', 'gzip')
+    save_artifact('{"a": 1}', 'small.json', base_dir=tmp_path)
+    with pytest.raises(ArtifactError, match='Cannot memory-map'):
+        load_artifact('small.json', base_dir=tmp_path, as_='mmap')
+
+
+def test_async_artifact_io_runs_on_the_bounded_pool(tmp_path, monkeypatch):
+    import asyncio
+    import threading
+    import time
+
+    from utils import artifacts
+    from utils.logging import get_log_context, log_context
+
+    monkeypatch.setattr(artifacts, 'ARTIFACT_IO_WORKERS', 2)
+    monkeypatch.setattr(artifacts, '_IO_EXECUTOR', None)
+    real_save = artifacts.save_artifact
+    lock = threading.Lock()
+    seen = {'active': 0, 'peak': 0, 'threads': set(), 'contexts': set()}
+
+    def save(*args, **kwargs):
+        with lock:
+            seen['active'] += 1
+            seen['peak'] = max(seen['peak'], seen['active'])
+            seen['threads'].add(threading.current_thread().name)
+            seen['contexts'].add(get_log_context().get('provider'))
+        time.sleep(0.01)
+        try:
+            return real_save(*args, **kwargs)
+        finally:
+            with lock:
+                seen['active'] -= 1
+
+    monkeypatch.setattr(artifacts, 'save_artifact', save)
+
+    async def main():
+        with log_context(provider='fake'):
+            paths = await asyncio.gather(*(
+                artifacts.async_save_artifact(f'n{i}', f'{i}.txt', base_dir=tmp_path)
+                for i in range(6)
+            ))
+        text = await artifacts.async_load_artifact('3.txt', base_dir=tmp_path, as_='text')
+        return paths, text
+
+    try:
+        paths, text = asyncio.run(main())
+    finally:
+        artifacts._IO_EXECUTOR.shutdown()
+    assert [p.name for p in paths] == [f'{i}.txt' for i in range(6)]
+    assert text == 'n3'
+    assert seen['peak'] <= 2
+    assert all(name.startswith('artifact-io') for name in seen['threads'])
+    assert seen['contexts'] == {'fake'}
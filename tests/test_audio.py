@@ -0,0 +1,221 @@
+"""Chunked and streaming audio transcription helpers."""
+import os
+import sys
+import types
+import wave
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import audio  # noqa: E402
+from utils.models import RECOMMENDED_MODELS  # noqa: E402
+from utils.providers import PROVIDERS  # noqa: E402
+
+RATE = 100
+
+
+def _write_wav(path, frames, sampwidth):
+    with wave.open(str(path), 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(sampwidth)
+        writer.setframerate(RATE)
+        writer.writeframes(frames)
+    return str(path)
+
+
+def _second_words(path):
+    """Transcribe 8-bit test audio whose sample value encodes the second."""
+    with wave.open(path, 'rb') as reader:
+        data = reader.readframes(reader.getnframes())
+    return ' '.join(f'w{data[i] - 10}' for i in range(0, len(data), RATE))
+
+
+def test_plan_chunks_reports_the_strategy_used(tmp_path):
+    loud = b'\x00\x40' * RATE
+    quiet = b'\x00\x00' * (RATE // 2)
+    path16 = _write_wav(tmp_path / 's16.wav', loud * 3 + quiet + loud * 3, 2)
+    with wave.open(path16, 'rb') as reader:
+        plan, overlapped = audio._plan_chunks(reader, 4.0, 1.0, True)
+    assert not overlapped
+    assert plan[0][0] == 0 and plan[-1][1] == 6.5 * RATE
+    assert all(a[1] == b[0] for a, b in zip(plan, plan[1:]))
+    assert 3 * RATE <= plan[0][1] <= 3.5 * RATE  # cut inside the quiet gap
+
+    path8 = _write_wav(tmp_path / 's8.wav', bytes(10 * RATE), 1)
+    with wave.open(path8, 'rb') as reader:
+        plan, overlapped = audio._plan_chunks(reader, 4.0, 2.0, True)
+    assert overlapped
+    assert plan == [(0, 400), (200, 600), (400, 800), (600, 1000)]
+
+
+def test_trim_overlap_and_stitch():
+    assert audio._trim_overlap('so we ship Friday.', 'ship friday, then test') == 'then test'
+    assert audio._trim_overlap('alpha beta', 'gamma delta') == 'gamma delta'
+
+    chunks = [(0.0, 4.0, 'a'), (2.0, 6.0, 'b')]
+    texts = ['one two three', 'two three four']
+    assert audio._stitch(chunks, texts, overlapped=True).text == 'one two three four'
+    assert audio._stitch(chunks, texts, overlapped=False).text == (
+        'one two three two three four'
+    )
+
+
+def test_silence_split_fallback_trims_seams(tmp_path, monkeypatch):
+    provider = types.SimpleNamespace(
+        transcribe_audio=lambda client, path, model, lang: _second_words(path)
+    )
+    monkeypatch.setitem(PROVIDERS, 'seconds', provider)
+    monkeypatch.setitem(
+        RECOMMENDED_MODELS, 'seconds-model',
+        {'provider': 'seconds', 'audio_transcription': True},
+    )
+    frames = b''.join(bytes([10 + s]) * RATE for s in range(10))
+    path = _write_wav(tmp_path / 'count.wav', frames, 1)
+
+    result = audio.transcribe_audio_chunked(
+        path, object(), 'seconds-model', 'seconds',
+        window_seconds=4, overlap_seconds=2, split_on_silence=True,
+    )
+    assert result.text == ' '.join(f'w{s}' for s in range(10))
+
+
+def test_stream_transcribe_native_yields_interim_then_final():
+    from utils.providers.fake import FakeClient
+
+    pcm = [b'\x00\x00' * 8000] * 3  # 3 x 0.5 s at 16 kHz mono
+    client = FakeClient('fake-model')
+    segments = list(audio.stream_transcribe_audio(pcm, client, 'fake-model', 'fake'))
+    assert [s.is_final for s in segments] == [False, False, False, True]
+    assert segments[-1].end == 1.5 and segments[-1].text == 'fake transcript of 1.50 seconds'
+
+
+def test_stream_transcribe_windows_audio_for_batch_providers(monkeypatch):
+    durations = []
+
+    def transcribe(client, path, model, lang):
+        with wave.open(path, 'rb') as reader:
+            durations.append(reader.getnframes() / reader.getframerate())
+        return f' part {len(durations)} '
+
+    monkeypatch.setitem(PROVIDERS, 'batch', types.SimpleNamespace(transcribe_audio=transcribe))
+    monkeypatch.setitem(
+        RECOMMENDED_MODELS, 'batch-model', {'provider': 'batch', 'audio_transcription': True}
+    )
+    pcm = (b'\x00\x00' * 700 for _ in range(5))  # 3500 frames at 1 kHz
+    segments = list(audio.stream_transcribe_audio(
+        pcm, object(), 'batch-model', 'batch', sample_rate_hertz=1000, window_seconds=1.5,
+    ))
+    assert durations == [1.5, 1.5, 0.5]
+    assert [(s.start, s.end, s.text) for s in segments] == [
+        (0.0, 1.5, 'part 1'), (1.5, 3.0, 'part 2'), (3.0, 3.5, 'part 3'),
+    ]
+    assert all(s.is_final for s in segments)
+
+
+def test_transcript_cache_hits_with_compressed_artifacts(tmp_path, monkeypatch):
+    from utils.providers.fake import FakeClient
+
+    monkeypatch.setenv('AGA_ARTIFACTS_DIR', str(tmp_path / 'artifacts'))
+    monkeypatch.setenv('AGA_ARTIFACT_COMPRESSION', 'gzip')
+    path = _write_wav(tmp_path / 'talk.wav', b'\x00\x00' * RATE * 2, 2)
+    client = FakeClient('fake-model')
+    results = [
+        audio.transcribe_audio_with_timings(path, client, 'fake-model', 'fake', cache=True)
+        for _ in range(3)
+    ]
+    assert client.calls.count('transcribe_audio') == 1
+    assert results[0] == results[1] == results[2]
+    assert list((tmp_path / 'artifacts' / '.cache').rglob('*.json.gz'))
+
+
+class _FakeOperation:
+    def __init__(self, results, polls=2):
+        self.metadata = types.SimpleNamespace(progress_percent=0)
+        self._results = results
+        self._polls = polls
+
+    def done(self):
+        self.metadata.progress_percent += 50
+        self._polls -= 1
+        return self._polls < 0
+
+    def result(self):
+        return types.SimpleNamespace(results=self._results)
+
+
+class _FakeSpeechClient:
+    """Speech client recording which recognize method each request used."""
+
+    def __init__(self):
+        self.calls = []
+
+    @staticmethod
+    def _results(text):
+        alternative = types.SimpleNamespace(transcript=f' {text} ', words=[])
+        return [types.SimpleNamespace(alternatives=[alternative])]
+
+    def recognize(self, config, audio, timeout):
+        self.calls.append(('recognize', sorted(audio)))
+        return types.SimpleNamespace(results=self._results('sync'))
+
+    def long_running_recognize(self, config, audio):
+        self.calls.append(('long_running', sorted(audio)))
+        return _FakeOperation(self._results('long'))
+
+
+def test_google_recognize_method_follows_audio_source_and_size(tmp_path, monkeypatch):
+    from utils.errors import ProviderOperationError
+    from utils.providers import google
+
+    monkeypatch.setattr(google, 'LRO_POLL_SECONDS', 0)
+    client = _FakeSpeechClient()
+    progress = []
+
+    assert google.transcribe_audio(
+        client, 'gs://bucket/talk.wav', 'm', progress=progress.append
+    ) == 'long'
+    assert client.calls == [('long_running', ['uri'])]
+    assert progress == [0.5, 1.0, 1.0]
+
+    short = _write_wav(tmp_path / 'short.wav', b'\x00\x00' * RATE * 5, 2)
+    long = _write_wav(tmp_path / 'long.wav', b'\x00\x00' * RATE * 60, 2)
+    assert google.transcribe_audio(client, short, 'm') == 'sync'
+    assert google.transcribe_audio(client, long, 'm') == 'long'
+    assert client.calls[1:] == [('recognize', ['content']), ('long_running', ['content'])]
+
+    # Over the inline limit: 16-bit WAV is streamed, anything else refused.
+    monkeypatch.setattr(google, 'INLINE_AUDIO_MAX_BYTES', 1000)
+    eight_bit = _write_wav(tmp_path / 'eight.wav', bytes(RATE * 20), 1)
+    with pytest.raises(ProviderOperationError, match='16-bit PCM WAV'):
+        google.transcribe_audio(client, eight_bit, 'm')
+    with pytest.raises(ProviderOperationError, match='require a gs:// URI'):
+        google.transcribe_audio_words(client, long, 'm')
+    assert len(client.calls) == 3
+
+
+def test_google_streams_large_local_wav_in_bounded_sessions(tmp_path, monkeypatch):
+    from utils.providers import google
+
+    frames = bytes(range(256)) * (RATE * 2 * 90 // 256)
+    path = _write_wav(tmp_path / 'big.wav', frames, 2)
+    monkeypatch.setattr(google, 'INLINE_AUDIO_MAX_BYTES', 1000)
+    monkeypatch.setattr(google, 'STREAM_SESSION_SECONDS', 30.0)
+    monkeypatch.setattr(google, '_AUDIO_READ_BYTES', 1024)
+    sessions = []
+
+    def stream_transcribe_audio(client, chunks, model_name, language_code, **kwargs):
+        chunks = list(chunks)
+        sessions.append((chunks, kwargs['sample_rate_hertz']))
+        yield audio.TranscriptSegment(0, 1, 'interim', is_final=False)
+        yield audio.TranscriptSegment(0, 1, f'part{len(sessions)}')
+
+    monkeypatch.setattr(google, 'stream_transcribe_audio', stream_transcribe_audio)
+    progress = []
+    text = google.transcribe_audio(object(), path, 'm', progress=progress.append)
+
+    assert text == 'part1 part2 part3'
+    assert [rate for _, rate in sessions] == [RATE] * 3
+    assert all(len(chunk) <= 1024 for chunks, _ in sessions for chunk in chunks)
+    assert b''.join(b''.join(chunks) for chunks, _ in sessions) == frames
+    assert progress == sorted(progress) and progress[-1] == 1.0
@@ -0,0 +1,82 @@
+"""ArtifactCache expiry, eviction and manifest writes."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import cache as cache_module  # noqa: E402
+from utils.artifacts import load_artifact, save_artifact  # noqa: E402
+from utils.cache import ArtifactCache  # noqa: E402
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+def _cache(tmp_path, monkeypatch, **kwargs):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, 'time', clock.time)
+    return ArtifactCache('t', base_dir=tmp_path, **kwargs), clock
+
+
+def _payload(tmp_path, cache, key, size=10):
+    return save_artifact(b'x' * size, f'{cache.directory}/{key}.bin', base_dir=tmp_path)
+
+
+def test_ttl_expiry_drops_entry_and_files(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch, ttl_seconds=60)
+    path = _payload(tmp_path, cache, 'a')
+    cache.put('a', {'v': 1}, files=[path])
+
+    clock.now += 59
+    assert cache.get('a') == {'v': 1}
+    clock.now += 2
+    assert cache.get('a') is None
+    assert not path.exists()
+
+
+def test_lru_eviction_by_entries_and_bytes(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch, max_entries=2, max_bytes=25)
+    for key in 'abc':
+        clock.now += 1
+        cache.put(key, key, files=[_payload(tmp_path, cache, key)])
+        if key == 'b':
+            clock.now += 1
+            assert cache.get('a') == 'a'  # 'b' becomes least recently used
+    assert [cache.get(k) for k in 'abc'] == ['a', None, 'c']
+
+    clock.now += 1
+    cache.put('d', 'd', files=[_payload(tmp_path, cache, 'd', size=20)])
+    assert [cache.get(k) for k in 'acd'] == [None, None, 'd']
+
+
+def test_hits_do_not_rewrite_manifest_until_flush(tmp_path, monkeypatch):
+    cache, clock = _cache(tmp_path, monkeypatch)
+    cache.put('a', 1)
+    writes = []
+    real_persist = cache._persist
+    monkeypatch.setattr(cache, '_persist', lambda *a: writes.append(a) or real_persist(*a))
+
+    clock.now += 5
+    for _ in range(10):
+        assert cache.get('a') == 1
+    assert writes == []
+    cache.flush()
+    assert len(writes) == 1
+    manifest = load_artifact(cache._manifest_name(), base_dir=tmp_path, as_='json')
+    assert manifest['a']['accessed'] == clock.now
+
+
+def test_put_records_compressed_payloads(tmp_path, monkeypatch):
+    monkeypatch.setenv('AGA_ARTIFACT_COMPRESSION', 'gzip')
+    cache, _ = _cache(tmp_path, monkeypatch)
+    name = f'{cache.directory}/a.json'
+    save_artifact({'text': 'hi'}, name, base_dir=tmp_path)
+    cache.put('a', {'path': name}, files=[name])
+
+    assert cache.get('a') == {'path': name}
+    assert cache._manifests[tmp_path]['a']['files'] == [f'{name}.gz']
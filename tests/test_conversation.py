@@ -0,0 +1,38 @@
+"""Conversation history budgeting against the fake provider."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.conversation import Conversation  # noqa: E402
+from utils.providers.fake import FakeClient  # noqa: E402
+
+
+def test_compaction_keeps_budget_and_stable_prefix():
+    chat = Conversation(
+        FakeClient('fake-model'), 'fake-model', 'fake',
+        system='Be brief.', max_history_tokens=400, summarize=False,
+    )
+    sent = []
+    for i in range(40):
+        assert chat.send(f'question {i} ' + 'lorem ipsum ' * 8).startswith(f'[fake-model] question {i} ')
+        sent.append(chat.messages)
+        assert chat.context_tokens() <= 400
+
+    assert len(chat.history) == 80
+    assert chat.messages[0] == {'role': 'system', 'content': 'Be brief.'}
+    assert chat.messages[1]['role'] == 'user'
+    # Most requests extend the previous one, so provider prompt caches hit.
+    breaks = sum(1 for a, b in zip(sent, sent[1:]) if b[:len(a)] != a)
+    assert 0 < breaks < 40 // 3
+
+
+def test_folded_turns_are_summarized():
+    client = FakeClient('fake-model')
+    chat = Conversation(client, 'fake-model', 'fake', max_history_tokens=120)
+    for i in range(4):
+        chat.send(f'fact {i} ' + 'detail ' * 20)
+
+    assert chat.summary and 'fact 0' in chat.summary
+    assert chat.messages[0]['content'].startswith('Summary of the earlier conversation')
+    assert 'fact 0' not in ''.join(m['content'] for m in chat.messages[1:])
@@ -0,0 +1,51 @@
+"""Load-test harness around the deterministic fake provider."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.benchmarks import benchmark_fake_provider  # noqa: E402
+from utils.providers.fake import FakeBehavior  # noqa: E402
+
+
+def test_benchmark_reports_injected_errors_and_tokens(tmp_path):
+    behavior = FakeBehavior(latency_ms=1, error_rate=0.25, output_tokens=3, seed=7)
+    results = benchmark_fake_provider(
+        ['completion', 'async_image'],
+        calls=40,
+        concurrency=8,
+        behavior=behavior,
+        artifacts_dir=str(tmp_path),
+    )
+
+    by_op = {r['operation']: r for r in results}
+    assert by_op['completion']['errors'] == by_op['async_image']['errors'] > 0
+    ok_calls = 40 - by_op['completion']['errors']
+    assert by_op['completion']['completion_tokens'] == 3 * ok_calls
+    assert by_op['completion']['p99_ms'] >= by_op['completion']['p50_ms'] >= 1
+    assert len(list((tmp_path / 'screens').glob('*.png'))) == ok_calls
+
+
+def test_throughput_metrics_round_trip_into_registry(tmp_path, monkeypatch):
+    from utils import providers
+    from utils.benchmarks import benchmark_model_throughput
+    from utils.models import ModelRegistry, RECOMMENDED_MODELS, load_model_metrics
+
+    # A non-test provider backed by the fake implementation.
+    monkeypatch.setitem(providers.PROVIDERS, 'bench', providers.PROVIDERS['fake'])
+    monkeypatch.setitem(
+        RECOMMENDED_MODELS, 'bench-model', {'provider': 'bench', 'text_generation': True}
+    )
+    monkeypatch.setenv('AGA_FAKE_LATENCY_MS', '5')
+    results = benchmark_model_throughput(
+        ['bench-model', 'fake-model'], prompts=['one two three'], base_dir=str(tmp_path)
+    )
+    assert results['bench-model']['error_rate'] == 0.0
+    assert results['bench-model']['ttft_ms'] >= 5
+    assert results['fake-model']['error_rate'] == 0.0
+
+    registry = ModelRegistry(RECOMMENDED_MODELS)
+    saved = load_model_metrics(base_dir=str(tmp_path), registry=registry)
+    assert saved == {'bench-model': results['bench-model']}
+    assert registry.best('text', provider='bench', order_by='ttft_ms').name == 'bench-model'
+
@@ -0,0 +1,104 @@
+"""Image artifact naming and batch generation."""
+import asyncio
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.image_gen import (  # noqa: E402
+    _image_filename,
+    async_get_image_generation_batch,
+    get_image_generation_batch,
+)
+from utils.images import ImageData  # noqa: E402
+from utils.providers import PROVIDERS  # noqa: E402
+
+
+def test_name_template_fields_are_validated():
+    image = ImageData(b'\x89PNG', 'image/png')
+    name, content_addressed = _image_filename(image, 'shot_{index}_{hash}', 'A cat', 2)
+    assert name.startswith('shot_2_') and name.endswith('.png') and content_addressed
+
+    with pytest.raises(ValueError, match=r"'slug'.*allowed fields: .*\{prompt_slug\}"):
+        _image_filename(image, 'img_{slug}', 'A cat')
+    with pytest.raises(ValueError, match='Invalid image name template'):
+        _image_filename(image, 'img_{ulid', 'A cat')
+
+
+def _png(prompt, i):
+    return ImageData(b'\x89PNG' + f'{prompt}:{i}'.encode(), 'image/png')
+
+
+def _batch_provider(calls):
+    """Provider with native ``n`` capped at two images per request."""
+    lock = threading.Lock()
+
+    def record(kind, prompt, n):
+        with lock:
+            calls.append((kind, prompt, n))
+            return sum(1 for c in calls if c[1] == prompt) - 1
+
+    def image_generation(client, prompt, model_name):
+        return _png(prompt, record('single', prompt, 1))
+
+    def image_generation_batch(client, prompt, model_name, n=1):
+        start = record('batch', prompt, n)
+        return [_png(prompt, f'{start}.{i}') for i in range(n)]
+
+    async def async_image_generation_batch(client, prompt, model_name, n=1):
+        return image_generation_batch(client, prompt, model_name, n)
+
+    return types.SimpleNamespace(
+        image_generation=image_generation,
+        image_generation_batch=image_generation_batch,
+        async_image_generation_batch=async_image_generation_batch,
+        max_images_per_request=lambda model_name: 2,
+    )
+
+
+def _contents(saved):
+    return [img.image.data[4:].decode().split(':')[0] for img in saved]
+
+
+def test_batch_uses_native_n_up_to_the_provider_limit(tmp_path, monkeypatch):
+    monkeypatch.setenv('AGA_ARTIFACTS_DIR', str(tmp_path))
+    calls = []
+    monkeypatch.setitem(PROVIDERS, 'batchy', _batch_provider(calls))
+
+    saved = get_image_generation_batch(['a', 'b'], object(), 'm', 'batchy', n=3)
+    assert sorted(calls) == [
+        ('batch', 'a', 2), ('batch', 'b', 2), ('single', 'a', 1), ('single', 'b', 1)
+    ]
+    assert _contents(saved) == ['a', 'a', 'a', 'b', 'b', 'b']
+    assert all(os.path.dirname(s.path) == str(tmp_path / 'screens') for s in saved)
+    assert len(set(s.path for s in saved)) == 6
+
+    calls.clear()
+    saved = asyncio.run(
+        async_get_image_generation_batch('c', object(), 'm', 'batchy', n=4)
+    )
+    assert calls == [('batch', 'c', 2), ('batch', 'c', 2)]
+    assert len(saved) == 4 and all(os.path.exists(s.path) for s in saved)
+
+
+def test_batch_falls_back_to_one_request_per_image(tmp_path, monkeypatch):
+    monkeypatch.setenv('AGA_ARTIFACTS_DIR', str(tmp_path))
+    calls = []
+    provider = _batch_provider(calls)
+    monkeypatch.setitem(
+        PROVIDERS, 'single', types.SimpleNamespace(image_generation=provider.image_generation)
+    )
+
+    saved = get_image_generation_batch(['a', 'b'], object(), 'm', 'single', n=2)
+    assert sorted(calls) == [('single', 'a', 1)] * 2 + [('single', 'b', 1)] * 2
+    assert _contents(saved) == ['a', 'a', 'b', 'b']
+
+    calls.clear()
+    saved = asyncio.run(
+        async_get_image_generation_batch('c', object(), 'm', 'single', n=3)
+    )
+    assert calls == [('single', 'c', 1)] * 3 and len(saved) == 3
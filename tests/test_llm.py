@@ -0,0 +1,54 @@
+"""Prompt enhancer memoization and client pooling."""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import llm  # noqa: E402
+from utils.llm import (  # noqa: E402
+    clear_prompt_enhancer_cache,
+    prompt_enhancer,
+    prompt_enhancer_batch,
+)
+from utils.providers import PROVIDERS  # noqa: E402
+from utils.providers.fake import FakeClient  # noqa: E402
+
+
+def test_prompt_enhancer_batch_dedupes_and_memoizes():
+    clear_prompt_enhancer_cache()
+    client = FakeClient('fake-model')
+    inputs = ['summarize logs', 'draft tests', 'summarize logs']
+    first = asyncio.run(prompt_enhancer_batch(inputs, 'fake-model', client, 'fake'))
+    assert first[0] == first[2] and len(client.calls) == 2
+    assert prompt_enhancer('draft tests', 'fake-model', client, 'fake') == first[1]
+    assert len(client.calls) == 2
+
+
+def test_memoized_enhancements_are_per_provider(monkeypatch):
+    clear_prompt_enhancer_cache()
+    monkeypatch.setitem(PROVIDERS, 'other', PROVIDERS['fake'])
+    fake_client, other_client = FakeClient('fake-model'), FakeClient('fake-model')
+
+    prompt_enhancer('draft tests', 'fake-model', fake_client, 'fake')
+    prompt_enhancer('draft tests', 'fake-model', other_client, 'other')
+    assert len(fake_client.calls) == len(other_client.calls) == 1
+    # The pooled client serves the model's own provider, 'fake'.
+    prompt_enhancer('draft tests', 'fake-model')
+    assert len(fake_client.calls) == 1
+    clear_prompt_enhancer_cache()
+
+
+def test_pooled_client_is_set_up_outside_the_lock(monkeypatch):
+    clear_prompt_enhancer_cache()
+    setups = []
+
+    def setup_llm_client(model_name):
+        setups.append(llm._CLIENT_POOL_LOCK.locked())
+        return FakeClient(model_name), model_name, 'fake'
+
+    monkeypatch.setattr(llm, 'setup_llm_client', setup_llm_client)
+    first = llm._pooled_client('fake-model', 'draft tests')
+    assert llm._pooled_client('fake-model', 'draft tests') is first
+    assert setups == [False]
+    clear_prompt_enhancer_cache()
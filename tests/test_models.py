@@ -0,0 +1,42 @@
+"""Model registry queries and tables."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.models import RECOMMENDED_MODELS, ModelRegistry  # noqa: E402
+
+
+def _names(specs):
+    return {spec.name for spec in specs}
+
+
+def test_test_and_unconfigured_endpoint_models_are_hidden_by_default(monkeypatch):
+    monkeypatch.delenv('OPENAI_COMPATIBLE_BASE_URLS', raising=False)
+    registry = ModelRegistry(RECOMMENDED_MODELS)
+
+    default = _names(registry.query('text'))
+    assert 'fake-model' not in default and 'local-openai-compatible' not in default
+    assert 'local-openai-compatible' not in (registry.markdown_table('text') or '')
+    assert _names(registry.query('text', provider='openai_compatible')) == {
+        'local-openai-compatible'
+    }
+
+    monkeypatch.setenv('OPENAI_COMPATIBLE_BASE_URLS', 'http://gpu1:8000/v1')
+    assert 'local-openai-compatible' in _names(registry.query('text'))
+    registry['gpu-model'] = {
+        'provider': 'openai_compatible', 'text_generation': True,
+        'base_urls': ['http://gpu2:8000/v1'],
+    }
+    monkeypatch.delenv('OPENAI_COMPATIBLE_BASE_URLS')
+    assert 'gpu-model' in _names(registry.query('text'))
+
+
+def test_markdown_table_is_cached_until_the_registry_changes():
+    registry = ModelRegistry({'a': {'provider': 'p', 'text_generation': True}})
+    table = registry.markdown_table('text')
+    assert '| a | p |' in table
+    assert registry.markdown_table('text') is table
+    registry['b'] = {'provider': 'p', 'text_generation': True}
+    assert '| b | p |' in registry.markdown_table('text')
+    assert registry.markdown_table('vision') is None
@@ -0,0 +1,121 @@
+"""Checks for the OpenAI-compatible provider's load balancing."""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from utils.errors import ProviderOperationError  # noqa: E402
+from utils.providers import openai as openai_provider  # noqa: E402
+from utils.providers import openai_compatible  # noqa: E402
+from utils.providers.openai_compatible import LeastOutstandingClient  # noqa: E402
+from stub_server import OpenAICompatibleStubServer  # noqa: E402
+
+
+class _StreamingCompletions:
+    """Client whose streamed completions yield a few chunks."""
+
+    def __init__(self):
+        self.chat = self
+        self.completions = self
+
+    def create(self, **params):
+        return iter(['a', 'b', 'c'])
+
+
+class _FailingCompletions(_StreamingCompletions):
+    def create(self, **params):
+        raise RuntimeError('endpoint down')
+
+
+def _outstanding(client):
+    return [s['outstanding'] for s in client.endpoint_stats()]
+
+
+def test_busy_endpoint_is_skipped_through_the_openai_call_path():
+    pytest.importorskip('openai')
+    hold = threading.Event()
+    with OpenAICompatibleStubServer(hold=hold) as slow, \
+            OpenAICompatibleStubServer() as fast:
+        client = openai_compatible.setup_client('local-openai-compatible', {
+            'base_urls': [slow.base_url, fast.base_url],
+            'served_model_name': 'served-model',
+        })
+        # Ties go to the first endpoint, so this call occupies the slow one.
+        first = threading.Thread(target=openai_compatible.text_completion, args=(
+            client, 'first', 'local-openai-compatible',
+        ))
+        first.start()
+        assert slow.wait_for_requests(1)
+        replies = [
+            openai_compatible.text_completion(client, f'ping {i}', 'local-openai-compatible')
+            for i in range(4)
+        ]
+        assert _outstanding(client) == [1, 0]
+        hold.set()
+        first.join(timeout=5)
+
+    assert len(slow.requests) == 1 and len(fast.requests) == 4
+    assert {r['model'] for r in slow.requests + fast.requests} == {'served-model'}
+    assert replies[0] == 'stub: ping 0'
+    assert _outstanding(client) == [0, 0]
+
+
+def test_stream_releases_its_slot_when_abandoned():
+    client = LeastOutstandingClient([('a', _StreamingCompletions())])
+
+    stream = client.chat.completions.create(model='m', stream=True)
+    assert _outstanding(client) == [1]
+    for _ in stream:
+        break
+    assert _outstanding(client) == [0]
+
+    with client.chat.completions.create(model='m', stream=True) as stream:
+        assert _outstanding(client) == [1]
+    assert _outstanding(client) == [0]
+
+    stream = client.chat.completions.create(model='m', stream=True)
+    assert list(stream) == ['a', 'b', 'c']
+    stream.close()
+    assert _outstanding(client) == [0]
+    assert client.endpoint_stats()[0]['served'] == 3
+    assert client.endpoint_stats()[0]['failed'] == 0
+
+
+def test_operations_use_their_own_provider_name(monkeypatch):
+    calls = []
+    monkeypatch.setattr(openai_provider, 'rate_limit', lambda *args: calls.append(args))
+    monkeypatch.setenv('OPENAI_API_KEY', 'openai-key')
+    monkeypatch.setenv(openai_compatible.API_KEY_ENV, 'local-key')
+    client = LeastOutstandingClient([('a', _FailingCompletions())])
+
+    with pytest.raises(ProviderOperationError) as excinfo:
+        openai_compatible.chat_completion(
+            client, [{'role': 'user', 'content': 'hi'}], 'local-openai-compatible'
+        )
+
+    assert excinfo.value.provider == 'openai_compatible'
+    assert calls == [('openai_compatible', 'local-key', 'local-openai-compatible')]
+    assert client.endpoint_stats()[0]['failed'] == 1
+
+
+def test_cancelled_async_call_releases_its_slot():
+    import asyncio
+
+    class _SlowCompletions(_StreamingCompletions):
+        async def create(self, **params):
+            await asyncio.sleep(10)
+
+    async def main():
+        client = LeastOutstandingClient([('a', _SlowCompletions())])
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.chat.completions.create(model='m'), 0.01)
+        return client
+
+    client = asyncio.run(main())
+    assert client.endpoint_stats() == [
+        {'base_url': 'a', 'outstanding': 0, 'served': 1, 'failed': 1}
+    ]
@@ -0,0 +1,98 @@
+"""PlantUML render cache and batch rendering."""
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import plantuml  # noqa: E402
+from utils.errors import ArtifactError  # noqa: E402
+
+SOURCE = '@startuml\nAlice -> Bob: hi\n@enduml'
+
+
+def _fake_renderer(monkeypatch):
+    renders = []
+
+    def render(source, destination, *, server_url, backend):
+        renders.append(destination)
+        destination.write_bytes(b'<svg>' + b'x' * 4096 + b'</svg>')
+
+    monkeypatch.setattr(plantuml, '_render', render)
+    return renders
+
+
+def test_cache_hits_for_compressed_svg_renders(tmp_path, monkeypatch):
+    monkeypatch.setenv('AGA_ARTIFACT_COMPRESSION', 'gzip')
+    monkeypatch.setenv('AGA_PLANTUML_CACHE', '1')
+    renders = _fake_renderer(monkeypatch)
+
+    first = plantuml.render_plantuml_diagram(SOURCE, 'a.svg', base_dir=tmp_path)
+    first.unlink()
+    second = plantuml.render_plantuml_diagram(SOURCE, 'a.svg', base_dir=tmp_path)
+    assert len(renders) == 1
+    assert second.read_bytes().startswith(b'<svg>')
+    assert list((tmp_path / '.cache' / 'plantuml').glob('*.svg.*'))
+
+
+def test_render_cache_is_per_artifacts_dir(tmp_path, monkeypatch):
+    renders = _fake_renderer(monkeypatch)
+    for base in ('one', 'two', 'one'):
+        plantuml.render_plantuml_diagram(SOURCE, 'd.svg', base_dir=tmp_path / base, cache=True)
+    assert len(renders) == 2
+    assert list((tmp_path / 'two' / '.cache' / 'plantuml').glob('*.svg'))
+
+
+def test_render_cache_is_opt_in_and_per_backend(tmp_path, monkeypatch):
+    monkeypatch.delenv('AGA_PLANTUML_CACHE', raising=False)
+    renders = _fake_renderer(monkeypatch)
+    for _ in range(2):
+        plantuml.render_plantuml_diagram(SOURCE, 'd.svg', base_dir=tmp_path)
+    assert len(renders) == 2
+    assert not (tmp_path / '.cache').exists()
+
+    for url in ('http://one/plantuml/', 'http://two/plantuml/', 'http://one/plantuml/'):
+        plantuml.render_plantuml_diagram(
+            SOURCE, 'd.svg', base_dir=tmp_path, server_url=url, cache=True
+        )
+    assert len(renders) == 4
+
+
+def test_batch_renders_concurrently_and_aggregates_errors(tmp_path, monkeypatch):
+    barrier = threading.Barrier(2, timeout=5)
+    lock = threading.Lock()
+    active = {'now': 0, 'peak': 0}
+
+    def render(source, destination, *, server_url, backend):
+        with lock:
+            active['now'] += 1
+            active['peak'] = max(active['peak'], active['now'])
+        try:
+            barrier.wait()  # only passes when two renders run at once
+            if 'boom' in source:
+                raise ArtifactError('bad diagram')
+            destination.write_bytes(source.encode())
+        finally:
+            with lock:
+                active['now'] -= 1
+
+    monkeypatch.setattr(plantuml, '_render', render)
+    sources = {'a': SOURCE, 'b.svg': SOURCE + "'b", 'c': SOURCE + "'c", 'd': SOURCE + "'d"}
+    paths = plantuml.render_plantuml_diagrams(
+        sources, base_dir=tmp_path, cache=False, max_concurrency=2
+    )
+    assert {name: p.name for name, p in paths.items()} == {
+        'a': 'a.png', 'b.svg': 'b.svg', 'c': 'c.png', 'd': 'd.png'
+    }
+    assert (tmp_path / 'c.png').read_text() == SOURCE + "'c"
+    assert active['peak'] == 2
+
+    sources['b.svg'] = 'boom'
+    with pytest.raises(ArtifactError, match=r'1 of 4 diagrams failed.*b\.svg: bad diagram') as exc:
+        plantuml.render_plantuml_diagrams(
+            sources, base_dir=tmp_path / 'again', cache=False, max_concurrency=2
+        )
+    assert str(exc.value.__cause__) == 'bad diagram'
+    assert sorted(p.name for p in (tmp_path / 'again').iterdir()) == ['a.png', 'c.png', 'd.png']
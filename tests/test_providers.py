@@ -0,0 +1,86 @@
+"""Provider registry: entry-point discovery and runtime registration."""
+import importlib.metadata
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils import providers  # noqa: E402
+from utils.models import RECOMMENDED_MODELS  # noqa: E402
+from utils.providers import (  # noqa: E402
+    ENTRY_POINT_GROUP,
+    PROVIDERS,
+    register_provider,
+    unregister_provider,
+)
+
+
+def test_entry_point_plugins_are_discovered_lazily(tmp_path, monkeypatch):
+    (tmp_path / 'plugin_provider.py').write_text('def text_completion(*a):\n    return "plugin"\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    entry_points = [
+        importlib.metadata.EntryPoint('plug', 'plugin_provider', ENTRY_POINT_GROUP),
+        importlib.metadata.EntryPoint('fake', 'no_such_module', ENTRY_POINT_GROUP),
+    ]
+    scans = []
+
+    def fake_entry_points(**kwargs):
+        scans.append(kwargs)
+        return entry_points if kwargs.get('group') == ENTRY_POINT_GROUP else []
+
+    monkeypatch.setattr(importlib.metadata, 'entry_points', fake_entry_points)
+    registry = providers._ProviderRegistry(providers._BUILTIN_PROVIDERS)
+
+    assert registry['fake'].__name__ == 'utils.providers.fake'
+    assert scans == []  # built-ins never trigger a scan
+    assert 'plug' in registry and 'plugin_provider' not in sys.modules
+    assert registry['plug'].text_completion() == 'plugin'
+    # Plugins never shadow built-ins, and discovery runs once.
+    assert registry['fake'].__name__ == 'utils.providers.fake'
+    assert sorted(registry)[:3] == ['anthropic', 'fake', 'gemini'] and len(scans) == 1
+
+
+def test_register_and_unregister_restore_models():
+    original = dict(RECOMMENDED_MODELS['fake-model'])
+    first = types.SimpleNamespace(text_completion=lambda *a: 'first')
+    second = types.SimpleNamespace(text_completion=lambda *a: 'second')
+    try:
+        register_provider('plugged', first, models={
+            'plugged-model': {'text_generation': True},
+            'fake-model': {'text_generation': True},
+        })
+        assert PROVIDERS['plugged'] is first
+        assert RECOMMENDED_MODELS['fake-model']['provider'] == 'plugged'
+
+        with pytest.raises(ValueError, match='already registered'):
+            register_provider('plugged', second, models={'other-model': {}})
+        assert PROVIDERS['plugged'] is first and 'other-model' not in RECOMMENDED_MODELS
+
+        register_provider('plugged', second, models={'other-model': {}}, replace=True)
+        assert PROVIDERS['plugged'] is second
+        assert 'plugged-model' not in RECOMMENDED_MODELS
+        assert RECOMMENDED_MODELS['fake-model'] == original
+        assert RECOMMENDED_MODELS.spec('other-model').provider == 'plugged'
+    finally:
+        unregister_provider('plugged')
+    assert 'plugged' not in PROVIDERS
+    assert 'other-model' not in RECOMMENDED_MODELS
+    assert RECOMMENDED_MODELS['fake-model'] == original
+    unregister_provider('plugged')  # unknown names are ignored
+
+
+def test_broken_plugin_is_logged_and_treated_as_unknown(monkeypatch, caplog):
+    broken = importlib.metadata.EntryPoint('broken', 'no_such_module', ENTRY_POINT_GROUP)
+    monkeypatch.setattr(
+        importlib.metadata, 'entry_points',
+        lambda **kwargs: [broken] if kwargs.get('group') == ENTRY_POINT_GROUP else [],
+    )
+    registry = providers._ProviderRegistry(providers._BUILTIN_PROVIDERS)
+
+    assert registry.get('broken') is None
+    assert 'broken' not in registry
+    assert registry['openai_compatible'].PROVIDER == 'openai_compatible'
+    assert "'broken'" in caplog.text and 'no_such_module' in caplog.text
@@ -0,0 +1,111 @@
+"""Fenced-block extraction and incremental JSON parsing."""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.structured import (  # noqa: E402
+    IncrementalJSONParser,
+    extract_code_blocks,
+    extract_json,
+    iter_json,
+)
+
+STORIES = [
+    {'id': i, 'title': f'Story {i} with ] and }} and "quotes"', 'tags': ['a', 'b']}
+    for i in range(5)
+]
+
+
+def test_array_elements_are_emitted_as_they_close():
+    text = 'Here you go:\n```json\n' + json.dumps(STORIES, indent=2) + '\n```\nDone {ok}.'
+    for size in (1, 3, 7, len(text)):
+        parser = IncrementalJSONParser()
+        emitted = []
+        for start in range(0, len(text), size):
+            emitted.extend(parser.feed(text[start:start + size]))
+        parser.close()
+        assert emitted == STORIES
+
+
+def test_first_element_is_available_before_the_array_closes():
+    parser = IncrementalJSONParser()
+    assert parser.feed('[{"id": 1}, {"id"') == [{'id': 1}]
+    assert parser.feed(': 2}]') == [{'id': 2}]
+
+
+def test_unclosed_prose_bracket_does_not_swallow_a_fenced_block():
+    text = 'Use [brackets like this.\n```json\n{"a":1}\n```'
+    for size in (1, 2, len(text)):
+        parser = IncrementalJSONParser()
+        emitted = []
+        for start in range(0, len(text), size):
+            emitted.extend(parser.feed(text[start:start + size]))
+        assert emitted == [{'a': 1}]
+        assert parser.close() == []
+
+
+def test_prose_brackets_before_a_fence_are_not_values():
+    chunks = ['Sure! Here it is (see [1]):\n', '```json\n{"a": 1}\n```']
+    assert list(iter_json(chunks)) == [{'a': 1}]
+    # Without a fence, mid-line values surface once the stream ends.
+    assert list(iter_json(['The id is {"id": 7}', ' (see [1'])) == [{'id': 7}]
+    assert extract_json('See [1] and then\n{"a": 2}') == {'a': 2}
+
+
+def test_extract_code_blocks_by_language():
+    text = '```python\nprint(1)\n```\n```JSON\n{}\n```\n```\nplain\n```'
+    assert extract_code_blocks(text) == ['print(1)', '{}', 'plain']
+    assert extract_code_blocks(text, 'json') == ['{}']
+
+
+def test_structured_completion_retries_only_invalid_output():
+    import types
+
+    from utils import get_structured_completion, register_provider, unregister_provider
+
+    schema = {'type': 'object', 'properties': {'title': {'type': 'string'}}}
+    replies = iter(['not json', '```json\n{"title": "ok"}\n```'])
+    calls = []
+
+    def text_completion(client, prompt, model_name, temperature):
+        calls.append(prompt)
+        return next(replies)
+
+    register_provider('text-only', types.SimpleNamespace(text_completion=text_completion))
+    try:
+        result = get_structured_completion('Story', schema, object(), 'm', 'text-only')
+    finally:
+        unregister_provider('text-only')
+    assert result == {'title': 'ok'}
+    assert len(calls) == 2 and 'did not match the required schema' in calls[1]
+
+
+def test_dict_schemas_check_type_and_required_without_jsonschema(monkeypatch):
+    import pytest
+
+    from utils import structured
+
+    monkeypatch.setattr(structured, '_jsonschema', lambda: None)
+    schema = {'type': 'object', 'required': ['title'], 'properties': {'title': {}}}
+    assert structured.validate_structured({'title': 'ok'}, schema) == {'title': 'ok'}
+    with pytest.raises(ValueError, match="'title' is a required property"):
+        structured.validate_structured({'name': 'x'}, schema)
+    with pytest.raises(ValueError, match='is not of type'):
+        structured.validate_structured(['title'], schema)
+    with pytest.raises(ValueError, match='is not of type'):
+        structured.validate_structured(True, {'type': ['integer', 'null']})
+    assert structured.validate_structured(None, {'type': ['integer', 'null']}) is None
+
+
+def test_google_structured_completion_reports_missing_sdk_once(monkeypatch):
+    import pytest
+
+    from utils.errors import ProviderOperationError
+    from utils.providers import google
+
+    monkeypatch.setattr(google, '_GENAI_IMPORTS', (None, None))
+    with pytest.raises(ProviderOperationError) as excinfo:
+        google.structured_completion(object(), 'Story', 'gemini-2.5-flash', {'type': 'object'})
+    assert str(excinfo.value).count('[google:') == 1
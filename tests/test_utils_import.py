@@ -0,0 +1,48 @@
+"""Guard the lazy-import contract of the ``utils`` package."""
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+
+from utils.benchmarks import benchmark_import_time  # noqa: E402
+
+
+def test_import_utils_does_not_load_providers_or_optional_deps():
+    result = benchmark_import_time('utils', runs=1, cwd=ROOT)
+    assert result['heavy_modules'] == []
+
+
+@pytest.mark.parametrize('name', ['get_completion', 'PROVIDERS', 'render_plantuml_diagram'])
+def test_lazy_exports_resolve(name):
+    module = 'utils.providers' if name == 'PROVIDERS' else 'utils'
+    subprocess.run(
+        [sys.executable, '-c', f'import {module}; getattr({module}, {name!r})'],
+        cwd=ROOT,
+        check=True,
+    )
+
+
+def test_every_exported_name_is_served():
+    code = (
+        'import utils, utils.settings as s\n'
+        'missing = [n for n in utils.__all__ if n not in utils._EXPORT_MODULES]\n'
+        'missing += [n for n in s.__all__ if not hasattr(s, n)]\n'
+        'assert not missing, missing'
+    )
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+
+
+def test_type_checking_names_are_exported():
+    import ast
+
+    import utils
+
+    with open(os.path.join(ROOT, 'utils', '__init__.py')) as f:
+        tree = ast.parse(f.read())
+    block = next(n for n in tree.body if isinstance(n, ast.If))
+    names = [a.name for node in block.body for a in node.names]
+    assert sorted(set(names) - set(utils.__all__)) == []
@@ -3,49 +3,179 @@
 This module re-exports the public API that historically lived in a single
 ``utils.py`` file.  The implementation is now split across a number of
 submodules to make it easier to maintain and to add new providers.
+
+Re-exports are resolved lazily (PEP 562): ``import utils`` is cheap and a
+submodule, along with the SDKs it needs, is imported on first attribute
+access.
 """
-from .settings import load_environment, load_dotenv, display, Markdown, IPyImage, PlantUML
-from .models import RECOMMENDED_MODELS, recommended_models_table
-from .llm import (
-    setup_llm_client, async_setup_llm_client,
-    get_completion, get_completion_compat,
-    async_get_completion, async_get_completion_compat,
-    get_vision_completion, get_vision_completion_compat,
-    async_get_vision_completion, async_get_vision_completion_compat,
-    clean_llm_output,
-    prompt_enhancer, prompt_enhancer_compat,
-)
-from .image_gen import (
-    get_image_generation_completion, get_image_generation_completion_compat,
-    async_get_image_generation_completion, async_get_image_generation_completion_compat,
-    get_image_edit_completion, get_image_edit_completion_compat,
-    async_get_image_edit_completion, async_get_image_edit_completion_compat,
-)
-from .audio import (
-    transcribe_audio,
-    transcribe_audio_compat,
-    async_transcribe_audio,
-    async_transcribe_audio_compat,
-)
-from .artifacts import *  # noqa: F401,F403 re-export for backwards compatibility
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .errors import *  # noqa: F401,F403
-from .logging import *  # noqa: F401,F403
-from .plantuml import render_plantuml_diagram
+
+_LAZY_EXPORTS: dict[str, tuple[str, ...]] = {
+    'settings': (
+        'load_environment', 'load_dotenv', 'display', 'Markdown', 'IPyImage', 'PlantUML',
+    ),
+    'models': (
+        'RECOMMENDED_MODELS', 'recommended_models_table',
+        'Capability', 'ModelRegistry', 'ModelSpec',
+        'save_model_metrics', 'load_model_metrics',
+    ),
+    'llm': (
+        'setup_llm_client', 'async_setup_llm_client',
+        'get_completion', 'get_completion_compat',
+        'async_get_completion', 'async_get_completion_compat',
+        'stream_completion', 'get_chat_completion', 'async_get_chat_completion',
+        'get_structured_completion', 'async_get_structured_completion',
+        'get_vision_completion', 'get_vision_completion_compat',
+        'async_get_vision_completion', 'async_get_vision_completion_compat',
+        'clean_llm_output',
+        'prompt_enhancer', 'prompt_enhancer_compat',
+        'async_prompt_enhancer', 'prompt_enhancer_batch', 'clear_prompt_enhancer_cache',
+    ),
+    'image_gen': (
+        'get_image_generation_completion', 'get_image_generation_completion_compat',
+        'async_get_image_generation_completion', 'async_get_image_generation_completion_compat',
+        'get_image_edit_completion', 'get_image_edit_completion_compat',
+        'async_get_image_edit_completion', 'async_get_image_edit_completion_compat',
+        'get_image_generation_batch', 'async_get_image_generation_batch',
+    ),
+    'images': ('ImageData', 'SavedImage'),
+    'conversation': ('Conversation',),
+    'structured': (
+        'extract_code_block', 'extract_code_blocks', 'code_blocks_by_language',
+        'extract_json', 'IncrementalJSONParser', 'iter_json', 'aiter_json',
+    ),
+    'audio': (
+        'transcribe_audio', 'transcribe_audio_compat',
+        'async_transcribe_audio', 'async_transcribe_audio_compat',
+        'transcribe_audio_chunked', 'async_transcribe_audio_chunked',
+        'stream_transcribe_audio',
+        'transcribe_audio_with_timings', 'async_transcribe_audio_with_timings',
+        'TranscriptSegment', 'ChunkedTranscript', 'TimedTranscript', 'WordTiming',
+    ),
+    # Formerly ``from .artifacts import *`` / ``from .logging import *``.
+    'artifacts': (
+        'set_artifacts_dir', 'get_artifacts_dir', 'resolve_artifact_path',
+        'save_artifact', 'save_artifacts', 'load_artifact',
+        'async_save_artifact', 'async_load_artifact',
+        'list_artifacts', 'rebuild_index', 'train_compression_dictionary',
+        'ArtifactRecord', 'detect_project_root', 'clear_artifact_path_caches',
+        '_find_project_root',
+    ),
+    'logging': ('get_logger', 'log_context', 'get_log_context'),
+    'plantuml': ('render_plantuml_diagram', 'render_plantuml_diagrams'),
+    'providers': ('register_provider', 'unregister_provider'),
+}
+_EXPORT_MODULES: dict[str, str] = {
+    name: module for module, names in _LAZY_EXPORTS.items() for name in names
+}
+
+
+if TYPE_CHECKING:  # static analysers see the lazily exported names
+    from .settings import (  # noqa: F401
+        load_environment, load_dotenv, display, Markdown, IPyImage, PlantUML,
+    )
+    from .models import (  # noqa: F401
+        RECOMMENDED_MODELS, recommended_models_table, Capability, ModelRegistry,
+        ModelSpec, save_model_metrics, load_model_metrics,
+    )
+    from .llm import (  # noqa: F401
+        setup_llm_client, async_setup_llm_client, get_completion, get_completion_compat,
+        async_get_completion, async_get_completion_compat, stream_completion,
+        get_chat_completion, async_get_chat_completion, get_structured_completion,
+        async_get_structured_completion, get_vision_completion,
+        get_vision_completion_compat, async_get_vision_completion,
+        async_get_vision_completion_compat, clean_llm_output, prompt_enhancer,
+        prompt_enhancer_compat, async_prompt_enhancer, prompt_enhancer_batch,
+        clear_prompt_enhancer_cache,
+    )
+    from .image_gen import (  # noqa: F401
+        get_image_generation_completion, get_image_generation_completion_compat,
+        async_get_image_generation_completion,
+        async_get_image_generation_completion_compat, get_image_edit_completion,
+        get_image_edit_completion_compat, async_get_image_edit_completion,
+        async_get_image_edit_completion_compat, get_image_generation_batch,
+        async_get_image_generation_batch,
+    )
+    from .images import ImageData, SavedImage  # noqa: F401
+    from .conversation import Conversation  # noqa: F401
+    from .structured import (  # noqa: F401
+        extract_code_block, extract_code_blocks, code_blocks_by_language, extract_json,
+        IncrementalJSONParser, iter_json, aiter_json,
+    )
+    from .audio import (  # noqa: F401
+        transcribe_audio, transcribe_audio_compat, async_transcribe_audio,
+        async_transcribe_audio_compat, transcribe_audio_chunked,
+        async_transcribe_audio_chunked, stream_transcribe_audio,
+        transcribe_audio_with_timings, async_transcribe_audio_with_timings,
+        TranscriptSegment, ChunkedTranscript, TimedTranscript, WordTiming,
+    )
+    from .artifacts import (  # noqa: F401
+        set_artifacts_dir, get_artifacts_dir, resolve_artifact_path, save_artifact,
+        save_artifacts, load_artifact, async_save_artifact, async_load_artifact,
+        list_artifacts, rebuild_index, train_compression_dictionary, ArtifactRecord,
+        detect_project_root, clear_artifact_path_caches,
+    )
+    from .logging import get_logger, log_context, get_log_context  # noqa: F401
+    from .plantuml import (  # noqa: F401
+        render_plantuml_diagram, render_plantuml_diagrams,
+    )
+    from .providers import register_provider, unregister_provider  # noqa: F401
+
+
+def __getattr__(name: str) -> object:
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORT_MODULES))
+
 
 __all__ = [
     'load_environment', 'load_dotenv', 'display', 'Markdown', 'IPyImage', 'PlantUML',
     'RECOMMENDED_MODELS', 'recommended_models_table',
+    'Capability', 'ModelRegistry', 'ModelSpec',
+    'save_model_metrics', 'load_model_metrics',
     'setup_llm_client', 'async_setup_llm_client',
     'get_completion', 'get_completion_compat',
     'async_get_completion', 'async_get_completion_compat',
+    'stream_completion', 'get_chat_completion', 'async_get_chat_completion',
+    'Conversation',
+    'get_structured_completion', 'async_get_structured_completion',
     'get_vision_completion', 'get_vision_completion_compat',
     'async_get_vision_completion', 'async_get_vision_completion_compat',
     'get_image_generation_completion', 'get_image_generation_completion_compat',
     'async_get_image_generation_completion', 'async_get_image_generation_completion_compat',
     'get_image_edit_completion', 'get_image_edit_completion_compat',
     'async_get_image_edit_completion', 'async_get_image_edit_completion_compat',
+    'get_image_generation_batch', 'async_get_image_generation_batch',
+    'ImageData', 'SavedImage',
     'transcribe_audio', 'transcribe_audio_compat',
     'async_transcribe_audio', 'async_transcribe_audio_compat',
+    'transcribe_audio_chunked', 'async_transcribe_audio_chunked',
+    'stream_transcribe_audio',
+    'transcribe_audio_with_timings', 'async_transcribe_audio_with_timings',
+    'TimedTranscript', 'WordTiming',
+    'TranscriptSegment', 'ChunkedTranscript',
     'clean_llm_output', 'prompt_enhancer', 'prompt_enhancer_compat',
-    'render_plantuml_diagram',
+    'async_prompt_enhancer', 'prompt_enhancer_batch', 'clear_prompt_enhancer_cache',
+    'extract_code_block', 'extract_code_blocks', 'code_blocks_by_language',
+    'extract_json', 'IncrementalJSONParser', 'iter_json', 'aiter_json',
+    'render_plantuml_diagram', 'render_plantuml_diagrams',
+    'register_provider', 'unregister_provider',
+    'set_artifacts_dir', 'get_artifacts_dir', 'resolve_artifact_path',
+    'save_artifact', 'save_artifacts', 'load_artifact',
+    'async_save_artifact', 'async_load_artifact',
+    'list_artifacts', 'rebuild_index', 'train_compression_dictionary',
+    'ArtifactRecord', 'detect_project_root', 'clear_artifact_path_caches',
+    'get_logger', 'log_context', 'get_log_context',
 ]
@@ -0,0 +1,299 @@
+"""SQLite index of saved artifacts.
+
+The index lives next to the artifacts it describes
+(``<artifacts_dir>/.artifact_index.sqlite3``).  Indexing is opt-in: set
+``AGA_ARTIFACT_INDEX=1`` (or pass ``index=True``) to have
+:func:`utils.artifacts.save_artifact` record each save, or populate it on
+demand with :func:`utils.artifacts.rebuild_index`.  Query it through
+:func:`utils.artifacts.list_artifacts` instead of walking the directory tree.
+"""
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+INDEX_FILENAME = ".artifact_index.sqlite3"
+_HASH_CHUNK = 1024 * 1024
+_COMPRESSED_SUFFIXES = frozenset({".gz", ".zst"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    subdir TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT,
+    mime TEXT,
+    created_at REAL NOT NULL,
+    provider TEXT,
+    model TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_subdir ON artifacts(subdir);
+CREATE INDEX IF NOT EXISTS idx_artifacts_mime ON artifacts(mime);
+CREATE INDEX IF NOT EXISTS idx_artifacts_ext ON artifacts(ext);
+CREATE INDEX IF NOT EXISTS idx_artifacts_created_at ON artifacts(created_at);
+"""
+
+_UPSERT = """
+INSERT INTO artifacts (path, subdir, ext, size, sha256, mime, created_at, provider, model)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(path) DO UPDATE SET
+    subdir = excluded.subdir,
+    ext = excluded.ext,
+    size = excluded.size,
+    sha256 = excluded.sha256,
+    mime = excluded.mime,
+    created_at = excluded.created_at,
+    provider = COALESCE(excluded.provider, artifacts.provider),
+    model = COALESCE(excluded.model, artifacts.model)
+"""
+
+# One connection per (thread, database) keeps sqlite3 thread-safe and cheap.
+_LOCAL = threading.local()
+
+
+@dataclass(frozen=True)
+class ArtifactRecord:
+    """A row of the artifact index."""
+
+    path: str
+    subdir: str
+    size: int
+    sha256: Optional[str]
+    mime: Optional[str]
+    created_at: float
+    provider: Optional[str] = None
+    model: Optional[str] = None
+
+
+def index_enabled() -> bool:
+    """Return ``True`` when ``AGA_ARTIFACT_INDEX`` turns on indexing at save time."""
+    return os.getenv("AGA_ARTIFACT_INDEX", "0").lower() in {"1", "true", "yes", "on"}
+
+
+def _connect(base: Path) -> sqlite3.Connection:
+    conns = getattr(_LOCAL, "conns", None)
+    if conns is None:
+        conns = _LOCAL.conns = {}
+    db_path = str(base / INDEX_FILENAME)
+    conn = conns.get(db_path)
+    if conn is None or not os.path.exists(db_path):
+        base.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        conns[db_path] = conn
+    return conn
+
+
+def _is_index_file(name: str) -> bool:
+    return name.startswith(INDEX_FILENAME) or name.endswith(".tmp")
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 of ``path``, reading it in bounded chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _row(
+    path: Path,
+    base: Path,
+    *,
+    size: int,
+    sha256: Optional[str],
+    created_at: float,
+    provider: Optional[str],
+    model: Optional[str],
+) -> tuple:
+    rel = path.relative_to(base)
+    subdir = rel.parent.as_posix()
+    ext = path.suffix.lower()
+    if ext in _COMPRESSED_SUFFIXES:
+        # Index compressed artifacts by their content type (prd.md.gz -> .md)
+        ext = path.with_suffix("").suffix.lower()
+    return (
+        rel.as_posix(),
+        "" if subdir == "." else subdir,
+        ext,
+        size,
+        sha256,
+        mimetypes.guess_type(path.name)[0],
+        created_at,
+        provider,
+        model,
+    )
+
+
+def record_artifacts(
+    entries: Iterable[tuple[Path, Optional[bytes]]],
+    base: Path,
+    *,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+) -> None:
+    """Insert or update index entries for ``(path, data)`` pairs in one transaction.
+
+    ``data`` is the written content when known; otherwise the file is hashed.
+    """
+    rows = []
+    now = time.time()
+    for path, data in entries:
+        if _is_index_file(path.name):
+            continue
+        if data is not None:
+            size, sha256 = len(data), hashlib.sha256(data).hexdigest()
+        else:
+            size, sha256 = path.stat().st_size, hash_file(path)
+        rows.append(
+            _row(
+                path,
+                base,
+                size=size,
+                sha256=sha256,
+                created_at=now,
+                provider=provider,
+                model=model,
+            )
+        )
+    if not rows:
+        return
+    conn = _connect(base)
+    with conn:
+        conn.executemany(_UPSERT, rows)
+
+
+def record_artifact(
+    path: Path,
+    base: Path,
+    *,
+    data: Optional[bytes] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+) -> None:
+    """Insert or update the index entry for ``path`` (inside ``base``)."""
+    record_artifacts([(path, data)], base, provider=provider, model=model)
+
+
+def _timestamp(value: Union[datetime, float, int, None]) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def query_artifacts(
+    base: Path,
+    *,
+    kind: Optional[str] = None,
+    subdir: Optional[str] = None,
+    since: Union[datetime, float, None] = None,
+    until: Union[datetime, float, None] = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[ArtifactRecord]:
+    """Return index rows matching all given filters, newest first.
+
+    ``kind`` is an extension (``".png"``), a full MIME type (``"image/png"``)
+    or a MIME major type (``"image"``).  ``subdir`` also matches nested
+    directories; ``subdir=""`` selects top-level artifacts only.
+    """
+    clauses: List[str] = []
+    params: List[object] = []
+    if kind:
+        if kind.startswith("."):
+            clauses.append("ext = ?")
+            params.append(kind.lower())
+        elif "/" in kind:
+            clauses.append("mime = ?")
+            params.append(kind)
+        else:
+            clauses.append("mime LIKE ?")
+            params.append(f"{kind}/%")
+    if subdir is not None:
+        sub = Path(subdir).as_posix().strip("/")
+        sub = "" if sub == "." else sub
+        if sub:
+            clauses.append("(subdir = ? OR subdir LIKE ?)")
+            params.extend([sub, f"{sub}/%"])
+        else:
+            clauses.append("subdir = ''")
+    if since is not None:
+        clauses.append("created_at >= ?")
+        params.append(_timestamp(since))
+    if until is not None:
+        clauses.append("created_at < ?")
+        params.append(_timestamp(until))
+    if provider is not None:
+        clauses.append("provider = ?")
+        params.append(provider)
+    if model is not None:
+        clauses.append("model = ?")
+        params.append(model)
+
+    sql = (
+        "SELECT path, subdir, size, sha256, mime, created_at, provider, model "
+        "FROM artifacts"
+    )
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY created_at DESC, path"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    rows = _connect(base).execute(sql, params).fetchall()
+    return [ArtifactRecord(*row) for row in rows]
+
+
+def _walk(base: Path) -> Iterable[Path]:
+    for root, dirs, files in os.walk(base):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if not _is_index_file(name):
+                yield Path(root) / name
+
+
+def rebuild(base: Path) -> int:
+    """Re-index every file under ``base`` and drop rows for missing files.
+
+    Provider/model attribution recorded at save time is preserved.  Returns
+    the number of indexed artifacts.
+    """
+    conn = _connect(base)
+    seen: List[tuple] = []
+    with conn:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _seen (path TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM _seen")
+        for path in _walk(base):
+            stat = path.stat()
+            row = _row(
+                path,
+                base,
+                size=stat.st_size,
+                sha256=hash_file(path),
+                created_at=stat.st_mtime,
+                provider=None,
+                model=None,
+            )
+            conn.execute(_UPSERT, row)
+            seen.append((row[0],))
+        conn.executemany("INSERT OR IGNORE INTO _seen (path) VALUES (?)", seen)
+        conn.execute("DELETE FROM artifacts WHERE path NOT IN (SELECT path FROM _seen)")
+    return len(seen)
+
+
+__all__ = ["ArtifactRecord", "INDEX_FILENAME", "hash_file", "index_enabled"]
@@ -11,21 +11,38 @@ All operations raise :class:`ArtifactError` subclasses instead of returning
 error strings.
 """
 
+import asyncio
+import contextvars
+import functools
 import io
 import json
+import mmap
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Union, Literal, Any
+from typing import Optional, Union, Literal, Any, Callable, Iterable, TypeVar
 
+from . import artifact_index, compression
+from .artifact_index import ArtifactRecord
 from .errors import ArtifactError, ArtifactNotFoundError, ArtifactSecurityError
+from .logging import get_log_context, get_logger
+
+logger = get_logger()
 
 # Global, overridable at runtime
 _ARTIFACTS_DIR: Optional[Path] = None
 _PROJECT_MARKERS = frozenset({"pyproject.toml", ".git", "requirements.txt", "setup.cfg", "README.md"})
 
-def detect_project_root(start: Optional[Path] = None) -> Path:
-    """Walk upward from ``start`` to locate a project root."""
-    start = start or Path.cwd()
+# Bounded pool used by the async helpers so artifact I/O never blocks the loop
+ARTIFACT_IO_WORKERS = int(os.getenv("UTILS_ARTIFACT_IO_WORKERS", "4"))
+_IO_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_IO_EXECUTOR_LOCK = threading.Lock()
+
+_T = TypeVar("_T")
+
+@functools.lru_cache(maxsize=64)
+def _detect_project_root_cached(start: Path) -> Path:
     for p in [start, *start.parents]:
         if any((p / m).exists() for m in _PROJECT_MARKERS):
             return p
@@ -37,11 +54,37 @@ def detect_project_root(start: Optional[Path] = None) -> Path:
     return Path.cwd()
 
 
+def detect_project_root(start: Optional[Path] = None) -> Path:
+    """Walk upward from ``start`` to locate a project root.
+
+    Results are memoized per ``start`` directory; call
+    :func:`clear_artifact_path_caches` after creating or removing marker files.
+    """
+    return _detect_project_root_cached(Path(start) if start else Path.cwd())
+
+
 def _find_project_root() -> str:
     """Historically exported project root helper (string form)."""
 
     return str(detect_project_root())
 
+
+# Key (env value, cwd) that produced the cached default artifacts directory
+_DEFAULT_DIR_KEY: Optional[tuple] = None
+_DEFAULT_DIR: Optional[Path] = None
+
+
+def clear_artifact_path_caches() -> None:
+    """Drop memoized project roots and the default artifacts directory.
+
+    Called automatically by :func:`set_artifacts_dir`; call it manually after
+    creating or removing project marker files.
+    """
+    global _DEFAULT_DIR_KEY, _DEFAULT_DIR
+    _detect_project_root_cached.cache_clear()
+    _DEFAULT_DIR_KEY = None
+    _DEFAULT_DIR = None
+
 def set_artifacts_dir(path: Union[str, Path]) -> Path:
     """Set a custom artifacts directory.
 
@@ -55,6 +98,7 @@ def set_artifacts_dir(path: Union[str, Path]) -> Path:
     global _ARTIFACTS_DIR
     p = Path(path).expanduser().resolve()
     p.mkdir(parents=True, exist_ok=True)
+    clear_artifact_path_caches()
     _ARTIFACTS_DIR = p
     return p
 
@@ -66,16 +110,26 @@ def get_artifacts_dir(base_dir: Optional[Union[str, Path]] = None) -> Path:
       2. Directory previously set via :func:`set_artifacts_dir`
       3. ``AGA_ARTIFACTS_DIR`` environment variable
       4. ``<project_root>/artifacts``
+
+    Options 3 and 4 are cached and recomputed only when ``AGA_ARTIFACTS_DIR``
+    or the working directory changes.
     """
+    global _DEFAULT_DIR_KEY, _DEFAULT_DIR
     if base_dir is not None:
         return Path(base_dir).expanduser().resolve()
     if _ARTIFACTS_DIR is not None:
         return _ARTIFACTS_DIR
     env_dir = os.getenv("AGA_ARTIFACTS_DIR")
+    key = (env_dir, os.getcwd())
+    if _DEFAULT_DIR is not None and _DEFAULT_DIR_KEY == key:
+        return _DEFAULT_DIR
     if env_dir:
-        return set_artifacts_dir(env_dir)
-    root = detect_project_root()
-    return set_artifacts_dir(root / "artifacts")
+        p = Path(env_dir).expanduser().resolve()
+    else:
+        p = detect_project_root() / "artifacts"
+    p.mkdir(parents=True, exist_ok=True)
+    _DEFAULT_DIR_KEY, _DEFAULT_DIR = key, p
+    return p
 
 def _is_within(child: Path, parent: Path) -> bool:
     try:
@@ -84,6 +138,14 @@ def _is_within(child: Path, parent: Path) -> bool:
     except ValueError:
         return False
 
+def _strip_base_prefix(target: Path, base_name: str) -> Path:
+    """Drop leading ``<base_name>/`` segments (``artifacts/x`` -> ``x``)."""
+    parts = target.parts
+    i = 0
+    while i < len(parts) - 1 and parts[i] == base_name:
+        i += 1
+    return Path(*parts[i:]) if i else target
+
 def resolve_artifact_path(
     filename: Union[str, Path],
     *,
@@ -93,6 +155,9 @@ def resolve_artifact_path(
 ) -> Path:
     """Resolve ``filename`` against the artifacts directory.
 
+    The full path is canonicalized on every call, so symlinks created after
+    earlier saves cannot redirect writes outside the artifacts directory.
+
     Raises
     ------
     ArtifactSecurityError
@@ -115,21 +180,9 @@ def resolve_artifact_path(
             base_name = base.name
             # Validate base_name: must be non-empty and not contain path separators
             if base_name and os.sep not in base_name and (os.altsep is None or os.altsep not in base_name):
-                base_segment = Path(base_name)
-                while True:
-                    try:
-                        relative_target = cleaned_target.relative_to(base_segment)
-                    except ValueError:
-                        break
-                    if relative_target == Path('.'):
-                        break
-                    cleaned_target = relative_target
+                cleaned_target = _strip_base_prefix(target, base_name)
         # allow optional subdir
-        final = (
-            base
-            / (Path(subdir) if subdir else Path())
-            / cleaned_target
-        ).resolve()
+        final = (base / (Path(subdir) if subdir else Path()) / cleaned_target).resolve()
         if not _is_within(final, base):
             raise ArtifactSecurityError(
                 f"Resolved path '{final}' escapes artifacts dir '{base}'."
@@ -138,6 +191,15 @@ def resolve_artifact_path(
         raise ArtifactNotFoundError(f"Artifact not found: {final}")
     return final
 
+def _map_readonly(path: Path) -> Union[mmap.mmap, memoryview]:
+    """Return a read-only mapping of ``path`` without copying its contents."""
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            # Zero-length files cannot be mapped; an empty view behaves the same.
+            return memoryview(b"")
+        # The mapping stays valid after the descriptor is closed.
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
 # Public API (backward compatible names)
 def save_artifact(
     content: Union[str, bytes, dict, io.BytesIO],
@@ -147,41 +209,139 @@ def save_artifact(
     subdir: Optional[Union[str, Path]] = None,
     overwrite: bool = False,
     encoding: str = "utf-8",
+    index: Optional[bool] = None,
+    compress: Optional[Literal["gzip", "zstd", "auto"]] = None,
 ) -> Path:
     """Persist ``content`` to the artifacts directory.
 
+    With ``index=True`` (default: ``AGA_ARTIFACT_INDEX``, off) the artifact
+    is recorded in the SQLite index together with the ``provider``/``model``
+    bound via :func:`~utils.logging.log_context`.
+
+    ``compress`` (default: ``AGA_ARTIFACT_COMPRESSION``) stores the content
+    with a ``.gz``/``.zst`` suffix; ``"auto"`` only compresses text-like
+    artifacts above ``AGA_ARTIFACT_COMPRESS_MIN_BYTES``.  The returned path
+    is the file actually written, and :func:`load_artifact` reads it back
+    transparently under the original name.  Raw and compressed forms of a
+    name are one artifact: ``overwrite=True`` removes the form not written.
+
     Raises
     ------
     ArtifactError
-        If the file exists and ``overwrite`` is ``False`` or the content type
-        is unsupported.
+        If the artifact exists in either form and ``overwrite`` is ``False``
+        or the content type is unsupported.
 
     Example
     -------
     >>> save_artifact("hello", "greeting.txt")
     PosixPath('.../artifacts/greeting.txt')
     """
+    path, data = _write_artifact(
+        content,
+        filename,
+        base_dir=base_dir,
+        subdir=subdir,
+        overwrite=overwrite,
+        encoding=encoding,
+        compress=compress,
+    )
+    if _should_index(index):
+        _index_saved([(path, data)], get_artifacts_dir(base_dir))
+    return path
+
+
+def save_artifacts(
+    items: Iterable[tuple[Any, str]],
+    *,
+    base_dir: Optional[Union[str, Path]] = None,
+    subdir: Optional[Union[str, Path]] = None,
+    overwrite: bool = False,
+    encoding: str = "utf-8",
+    index: Optional[bool] = None,
+    compress: Optional[Literal["gzip", "zstd", "auto"]] = None,
+) -> list[Path]:
+    """Persist many ``(content, filename)`` pairs in one bulk write.
+
+    Behaves like repeated :func:`save_artifact` calls but resolves the
+    artifacts directory once and records all files in a single index
+    transaction.  Files written before an error are kept.
+
+    Example
+    -------
+    >>> save_artifacts([(b"...", "a.png"), (b"...", "b.png")], subdir="screens")
+    [PosixPath('.../screens/a.png'), PosixPath('.../screens/b.png')]
+    """
+    base = get_artifacts_dir(base_dir)
+    written: list[tuple[Path, Optional[bytes]]] = []
+    try:
+        for content, filename in items:
+            written.append(
+                _write_artifact(
+                    content,
+                    filename,
+                    base_dir=base,
+                    subdir=subdir,
+                    overwrite=overwrite,
+                    encoding=encoding,
+                    compress=compress,
+                )
+            )
+    finally:
+        if written and _should_index(index):
+            _index_saved(written, base)
+    return [path for path, _ in written]
+
+
+def _write_artifact(
+    content: Any,
+    filename: str,
+    *,
+    base_dir: Optional[Union[str, Path]],
+    subdir: Optional[Union[str, Path]],
+    overwrite: bool,
+    encoding: str,
+    compress: Optional[str],
+) -> tuple[Path, Optional[bytes]]:
+    """Atomically write one artifact; return its path and bytes if known."""
     path = resolve_artifact_path(
         filename, base_dir=base_dir, subdir=subdir, must_exist=False
     )
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if path.exists() and not overwrite:
+    # Any stored form (raw or compressed) of this name counts as the artifact.
+    existing = [p for p in _stored_forms(path) if p.exists()]
+    if existing and not overwrite:
         raise ArtifactError(
-            f"Artifact already exists: {path}. Pass overwrite=True to replace."
+            f"Artifact already exists: {existing[0]}. Pass overwrite=True to replace."
         )
+    mode = compress if compress is not None else compression.default_mode()
+    if mode and isinstance(content, (bytes, io.BytesIO, dict, str)):
+        payload = _serialize(content, encoding)
+        codec = compression.choose_codec(mode, path.suffix, len(payload))
+        if codec:
+            content = compression.compress(
+                payload, codec, _dict_dir(get_artifacts_dir(base_dir))
+            )
+            path = path.with_name(path.name + compression.SUFFIXES[codec])
+    path.parent.mkdir(parents=True, exist_ok=True)
 
     tmp = path.with_suffix(path.suffix + ".tmp")
+    # Written bytes, when known up front, let the index skip re-reading the file
+    data: Optional[bytes] = None
     try:
         if isinstance(content, bytes):
+            data = content
             tmp.write_bytes(content)
         elif isinstance(content, io.BytesIO):
-            tmp.write_bytes(content.getvalue())
-        elif isinstance(content, dict):
-            tmp.write_text(
-                json.dumps(content, ensure_ascii=False, indent=2), encoding=encoding
+            data = content.getvalue()
+            tmp.write_bytes(data)
+        elif isinstance(content, (dict, str)):
+            text = (
+                json.dumps(content, ensure_ascii=False, indent=2)
+                if isinstance(content, dict)
+                else content
             )
-        elif isinstance(content, str):
-            tmp.write_text(content, encoding=encoding)
+            tmp.write_text(text, encoding=encoding)
+            if os.linesep == "\n":
+                data = text.encode(encoding)
         else:
             # Attempt best-effort for objects with .save or .read
             if hasattr(content, "save") and callable(getattr(content, "save")):
@@ -195,7 +355,6 @@ def save_artifact(
                     f"Unsupported content type: {type(content)!r}"
                 )
         os.replace(tmp, path)  # atomic
-        return path
     except Exception:
         # clean up temp on error
         try:
@@ -203,17 +362,78 @@ def save_artifact(
                 tmp.unlink()
         finally:
             raise
+    # Drop the other stored form so loads never see stale content.
+    for stale in existing:
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return path, data
+
+
+def _stored_forms(path: Path) -> list[Path]:
+    """Return ``path`` and the compressed names it may be stored under."""
+    return [path] + [
+        path.with_name(path.name + suffix) for suffix in compression.SUFFIXES.values()
+    ]
+
+
+def _serialize(content: Union[str, bytes, dict, io.BytesIO], encoding: str) -> bytes:
+    if isinstance(content, bytes):
+        return content
+    if isinstance(content, io.BytesIO):
+        return content.getvalue()
+    if isinstance(content, dict):
+        content = json.dumps(content, ensure_ascii=False, indent=2)
+    return content.encode(encoding)
+
+
+def _dict_dir(base: Path) -> Path:
+    return base / compression.DICT_DIRNAME
+
+
+def _should_index(index: Optional[bool]) -> bool:
+    return artifact_index.index_enabled() if index is None else index
+
+
+def _index_saved(entries: list[tuple[Path, Optional[bytes]]], base: Path) -> None:
+    """Record saved artifacts in the index; indexing never fails a save."""
+    context = get_log_context()
+    try:
+        artifact_index.record_artifacts(
+            entries,
+            base,
+            provider=context.get("provider"),
+            model=context.get("model"),
+        )
+    except Exception as exc:  # pragma: no cover - index is best effort
+        logger.warning(
+            "Failed to index artifact: %s",
+            exc,
+            extra={"artifacts_path": str(entries[0][0])},
+        )
 
 def load_artifact(
     filename: str,
     *,
     base_dir: Optional[Union[str, Path]] = None,
     subdir: Optional[Union[str, Path]] = None,
-    as_: Optional[Literal["bytes", "text", "json", "auto"]] = "auto",
+    as_: Optional[
+        Literal["bytes", "text", "json", "auto", "mmap", "memoryview"]
+    ] = "auto",
     encoding: str = "utf-8",
-) -> Union[bytes, str, dict, Any]:
+) -> Union[bytes, str, dict, mmap.mmap, memoryview, Any]:
     """Load content from the artifacts directory.
 
+    ``as_="mmap"`` returns a read-only :class:`mmap.mmap` and
+    ``as_="memoryview"`` a read-only :class:`memoryview` over the same mapping.
+    Neither copies the file, so large artifacts can be sliced or handed to
+    ``base64``, ``PIL.Image.open`` or ``numpy.frombuffer`` in constant memory.
+    Close the map (or release the view) when done.
+
+    Artifacts that :func:`save_artifact` stored compressed
+    (``name.gz``/``name.zst``) are found under their original name and
+    decompressed for every mode except the mapped ones.  Files requested by
+    their ``.gz``/``.zst`` name are returned as stored.
+
     Raises
     ------
     ArtifactNotFoundError
@@ -223,24 +443,228 @@ def load_artifact(
     -------
     >>> load_artifact("greeting.txt", as_="text")
     'hello'
+    >>> with load_artifact("waffle_tech_suite.db", as_="mmap") as mm:
+    ...     header = mm[:16]
     """
     path = resolve_artifact_path(
-        filename, base_dir=base_dir, subdir=subdir, must_exist=True
+        filename, base_dir=base_dir, subdir=subdir, must_exist=False
     )
+    codec = None
+    if not path.exists():
+        path = _find_compressed(path)
+        with open(path, "rb") as fh:
+            # Only trust the suffix when the header agrees.
+            codec = compression.sniff_codec(fh.read(4))
+    if as_ in ("mmap", "memoryview"):
+        if codec is not None:
+            raise ArtifactError(
+                f"Cannot memory-map compressed artifact {path}; load it as bytes."
+            )
+        mapped = _map_readonly(path)
+        return memoryview(mapped) if as_ == "memoryview" else mapped
+    if codec is not None:
+        raw = compression.decompress(
+            path.read_bytes(), codec, _dict_dir(get_artifacts_dir(base_dir))
+        )
+        # Type detection uses the inner name: ``prd.md.gz`` -> ``.md``
+        ext = path.with_suffix("").suffix.lower()
+    else:
+        raw = None
+        ext = path.suffix.lower()
+
+    def _bytes() -> bytes:
+        return raw if raw is not None else path.read_bytes()
+
+    def _text() -> str:
+        return raw.decode(encoding) if raw is not None else path.read_text(encoding=encoding)
+
     if as_ == "bytes":
-        return path.read_bytes()
+        return _bytes()
     if as_ == "text":
-        return path.read_text(encoding=encoding)
+        return _text()
     if as_ == "json":
-        return json.loads(path.read_text(encoding=encoding))
+        return json.loads(_text())
     # auto by extension
-    ext = path.suffix.lower()
     if ext in {".json"}:
-        return json.loads(path.read_text(encoding=encoding))
+        return json.loads(_text())
     # Include Python files in the text category
     if ext in {".txt", ".md", ".csv", ".tsv", ".log", ".sql", ".py"}:
-        return path.read_text(encoding=encoding)
-    return path.read_bytes()
+        return _text()
+    return _bytes()
+
+
+def _find_compressed(path: Path) -> Path:
+    """Return the compressed variant of a missing ``path`` or raise."""
+    for candidate in _stored_forms(path)[1:]:
+        if candidate.exists():
+            return candidate
+    raise ArtifactNotFoundError(f"Artifact not found: {path}")
+
+
+def train_compression_dictionary(
+    filenames: Optional[list[Union[str, Path]]] = None,
+    *,
+    kind: str = ".json",
+    dict_size: int = 112_640,
+    base_dir: Optional[Union[str, Path]] = None,
+) -> int:
+    """Train and activate a zstd dictionary for many small artifacts.
+
+    Samples come from ``filenames`` or, by default, every artifact of
+    ``kind`` (the index is rebuilt first unless saves keep it current).
+    Later ``save_artifact(..., compress="zstd")`` calls use the dictionary;
+    loads find it by the id embedded in each frame.  Requires the optional
+    ``zstandard`` package.
+
+    Example
+    -------
+    >>> train_compression_dictionary(kind=".json")
+    2871023921
+    """
+    base = get_artifacts_dir(base_dir)
+    if filenames is None:
+        if not artifact_index.index_enabled():
+            rebuild_index(base)
+        # Indexed paths are the stored names; load by the original name.
+        filenames = [
+            str(Path(rec.path).with_suffix(""))
+            if compression.codec_for_path(Path(rec.path))
+            else rec.path
+            for rec in list_artifacts(kind=kind, base_dir=base)
+        ]
+    samples = [load_artifact(str(f), base_dir=base, as_="bytes") for f in filenames]
+    return compression.train_dictionary(samples, _dict_dir(base), dict_size=dict_size)
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    global _IO_EXECUTOR
+    if _IO_EXECUTOR is None:
+        with _IO_EXECUTOR_LOCK:
+            if _IO_EXECUTOR is None:
+                _IO_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=max(1, ARTIFACT_IO_WORKERS),
+                    thread_name_prefix="artifact-io",
+                )
+    return _IO_EXECUTOR
+
+
+async def _run_io(func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    """Run blocking artifact work on the dedicated I/O executor."""
+    loop = asyncio.get_running_loop()
+    # Carry log_context() bindings (provider/model) into the worker thread.
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _get_io_executor(), functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+def list_artifacts(
+    *,
+    kind: Optional[str] = None,
+    subdir: Optional[Union[str, Path]] = None,
+    since: Any = None,
+    until: Any = None,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    limit: Optional[int] = None,
+    base_dir: Optional[Union[str, Path]] = None,
+) -> list[ArtifactRecord]:
+    """Query the artifact index without walking the directory tree.
+
+    Only indexed artifacts are returned: enable ``AGA_ARTIFACT_INDEX`` or call
+    :func:`rebuild_index` first.  ``kind`` accepts an extension (``".md"``), a
+    MIME type (``"image/png"``) or a MIME major type (``"image"``).
+    ``subdir=""`` selects top-level artifacts.  ``since``/``until`` accept
+    :class:`~datetime.datetime` objects or POSIX timestamps.
+
+    Example
+    -------
+    >>> list_artifacts(kind="image", subdir="screens", limit=5)
+    [ArtifactRecord(path='screens/image_...png', ...)]
+    """
+    return artifact_index.query_artifacts(
+        get_artifacts_dir(base_dir),
+        kind=kind,
+        subdir=None if subdir is None else str(subdir),
+        since=since,
+        until=until,
+        provider=provider,
+        model=model,
+        limit=limit,
+    )
+
+
+def rebuild_index(base_dir: Optional[Union[str, Path]] = None) -> int:
+    """Index every existing artifact and prune entries for deleted files.
+
+    Returns the number of indexed artifacts.
+
+    Example
+    -------
+    >>> rebuild_index()
+    42
+    """
+    return artifact_index.rebuild(get_artifacts_dir(base_dir))
+
+
+async def async_save_artifact(
+    content: Union[str, bytes, dict, io.BytesIO],
+    filename: str,
+    *,
+    base_dir: Optional[Union[str, Path]] = None,
+    subdir: Optional[Union[str, Path]] = None,
+    overwrite: bool = False,
+    encoding: str = "utf-8",
+    index: Optional[bool] = None,
+    compress: Optional[Literal["gzip", "zstd", "auto"]] = None,
+) -> Path:
+    """Asynchronous :func:`save_artifact` backed by a bounded thread pool.
+
+    The pool size is controlled by ``UTILS_ARTIFACT_IO_WORKERS`` (default 4).
+
+    Example
+    -------
+    >>> await async_save_artifact("hello", "greeting.txt")
+    PosixPath('.../artifacts/greeting.txt')
+    """
+    return await _run_io(
+        save_artifact,
+        content,
+        filename,
+        base_dir=base_dir,
+        subdir=subdir,
+        overwrite=overwrite,
+        encoding=encoding,
+        index=index,
+        compress=compress,
+    )
+
+
+async def async_load_artifact(
+    filename: str,
+    *,
+    base_dir: Optional[Union[str, Path]] = None,
+    subdir: Optional[Union[str, Path]] = None,
+    as_: Optional[
+        Literal["bytes", "text", "json", "auto", "mmap", "memoryview"]
+    ] = "auto",
+    encoding: str = "utf-8",
+) -> Union[bytes, str, dict, mmap.mmap, memoryview, Any]:
+    """Asynchronous :func:`load_artifact` backed by a bounded thread pool.
+
+    Example
+    -------
+    >>> await async_load_artifact("greeting.txt", as_="text")
+    'hello'
+    """
+    return await _run_io(
+        load_artifact,
+        filename,
+        base_dir=base_dir,
+        subdir=subdir,
+        as_=as_,
+        encoding=encoding,
+    )
 
 
 __all__ = [
@@ -248,7 +672,15 @@ __all__ = [
     "get_artifacts_dir",
     "resolve_artifact_path",
     "save_artifact",
+    "save_artifacts",
     "load_artifact",
+    "async_save_artifact",
+    "async_load_artifact",
+    "list_artifacts",
+    "rebuild_index",
+    "train_compression_dictionary",
+    "ArtifactRecord",
     "detect_project_root",
+    "clear_artifact_path_caches",
     "_find_project_root",
 ]
@@ -1,21 +1,76 @@
 from __future__ import annotations
 
 import asyncio
+import math
 import os
-from typing import Any, Optional, Tuple
+import re
+import tempfile
+import wave
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
 
-from .errors import ProviderOperationError
+from .artifact_index import hash_file
+from .artifacts import _run_io, load_artifact, save_artifact
+from .cache import ArtifactCache
+from .errors import ArtifactError, ProviderOperationError
 from .helpers import ensure_provider
+from .logging import get_logger
 from .models import RECOMMENDED_MODELS
 
+logger = get_logger()
 
-def transcribe_audio(
-    audio_path: str,
-    client: Any,
-    model_name: str,
-    api_provider: str,
-    language_code: str = "en-US",
-) -> str:
+# Opt-in cache of transcripts keyed by (audio SHA-256, model, language).
+# Transcripts are stored as JSON artifacts owned by the cache.
+TRANSCRIPT_CACHE = ArtifactCache(
+    "transcripts",
+    ttl_seconds=float(os.getenv("AGA_TRANSCRIPT_CACHE_TTL", str(30 * 24 * 3600))),
+    max_bytes=int(os.getenv("AGA_TRANSCRIPT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+)
+
+
+@dataclass(frozen=True)
+class TranscriptSegment:
+    """Transcribed text for the audio between ``start`` and ``end`` seconds.
+
+    Streaming transcription also yields interim hypotheses
+    (``is_final=False``) that later segments for the same audio replace.
+    """
+
+    start: float
+    end: float
+    text: str
+    is_final: bool = True
+
+
+@dataclass(frozen=True)
+class WordTiming:
+    """A recognised word and its offsets (seconds) in the audio."""
+
+    word: str
+    start: float
+    end: float
+
+
+@dataclass(frozen=True)
+class TimedTranscript:
+    """Transcript text together with per-word timings."""
+
+    text: str
+    words: List[WordTiming] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class ChunkedTranscript:
+    """Stitched transcript of a chunked transcription."""
+
+    text: str
+    segments: List[TranscriptSegment] = field(default_factory=list)
+
+
+def _check_model(client: Any, model_name: str, api_provider: str) -> Any:
     provider_module = ensure_provider(
         client, api_provider, model_name, "audio transcription"
     )
@@ -26,48 +81,584 @@ def transcribe_audio(
             "audio transcription",
             f"Model '{model_name}' does not support audio transcription.",
         )
-    if not os.path.exists(audio_path):
+    return provider_module
+
+
+def _check_request(
+    audio_path: str, client: Any, model_name: str, api_provider: str
+) -> Any:
+    """Validate a transcription request and return the provider module."""
+    provider_module = _check_model(client, model_name, api_provider)
+    # gs:// URIs are transcribed server-side by Google long-running recognize.
+    if not audio_path.startswith("gs://") and not os.path.exists(audio_path):
         raise ProviderOperationError(
             api_provider,
             model_name,
             "audio transcription",
             f"Audio file not found at {audio_path}",
         )
-    return provider_module.transcribe_audio(
-        client, audio_path, model_name, language_code
+    return provider_module
+
+
+def _progress_kwargs(progress: Optional[Callable[[float], None]]) -> dict:
+    # Only pass ``progress`` when set so providers without it keep working.
+    return {} if progress is None else {"progress": progress}
+
+
+def _cache_enabled(cache: Optional[bool]) -> bool:
+    if cache is not None:
+        return cache
+    return os.getenv("AGA_TRANSCRIPT_CACHE", "0").lower() in {"1", "true", "yes", "on"}
+
+
+def _transcript_cache_key(
+    audio_path: str, model_name: str, language_code: str
+) -> Optional[str]:
+    if audio_path.startswith("gs://"):
+        return None
+    # hash_file reads in bounded chunks, so long recordings are never loaded whole.
+    return TRANSCRIPT_CACHE.make_key(
+        hash_file(Path(audio_path)), model_name, language_code
     )
 
 
+def _cached_transcript(key: str, words: bool) -> Optional[TimedTranscript]:
+    value = TRANSCRIPT_CACHE.get(key)
+    if value is None or (words and not value.get("words")):
+        return None
+    try:
+        data = load_artifact(value["path"], as_="json")
+    except (ArtifactError, ValueError):
+        TRANSCRIPT_CACHE.invalidate(key)
+        return None
+    logger.info("Transcript cache hit.", extra={"artifacts_path": value["path"]})
+    timings = [WordTiming(*w) for w in data.get("words") or []] if words else []
+    return TimedTranscript(data["text"], timings)
+
+
+def _remember_transcript(key: str, transcript: TimedTranscript, words: bool) -> None:
+    name = f"{TRANSCRIPT_CACHE.directory}/{key}.json"
+    payload = {
+        "text": transcript.text,
+        "words": [[w.word, w.start, w.end] for w in transcript.words] if words else None,
+    }
+    stored = save_artifact(payload, name, overwrite=True, index=False)
+    # ``name`` loads the payload; ``stored`` may carry a compression suffix.
+    TRANSCRIPT_CACHE.put(key, {"path": name, "words": words}, files=[stored])
+
+
+def _word_transcriber(provider_module: Any, api_provider: str, model_name: str) -> Any:
+    transcriber = getattr(provider_module, "transcribe_audio_words", None)
+    if transcriber is None:
+        raise ProviderOperationError(
+            api_provider,
+            model_name,
+            "audio transcription",
+            "Word timings are not supported by this provider.",
+        )
+    return transcriber
+
+
+def transcribe_audio(
+    audio_path: str,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    language_code: str = "en-US",
+    *,
+    progress: Optional[Callable[[float], None]] = None,
+    cache: Optional[bool] = None,
+    refresh: bool = False,
+) -> str:
+    """Transcribe ``audio_path`` and return the text.
+
+    ``progress``, when given, is called with the completed fraction
+    (0.0-1.0); Google reports it while long-running recognition is polled.
+    With ``cache=True`` (or ``AGA_TRANSCRIPT_CACHE=1``) audio already
+    transcribed by the same model and language is answered from the
+    transcript cache; ``refresh=True`` re-transcribes and updates it.
+    """
+    provider_module = _check_request(audio_path, client, model_name, api_provider)
+    key = None
+    if _cache_enabled(cache):
+        key = _transcript_cache_key(audio_path, model_name, language_code)
+        cached = None if refresh or key is None else _cached_transcript(key, False)
+        if cached is not None:
+            return cached.text
+    text = provider_module.transcribe_audio(
+        client, audio_path, model_name, language_code, **_progress_kwargs(progress)
+    )
+    if key:
+        _remember_transcript(key, TimedTranscript(text), words=False)
+    return text
+
+
 async def async_transcribe_audio(
     audio_path: str,
     client: Any,
     model_name: str,
     api_provider: str,
     language_code: str = "en-US",
+    *,
+    progress: Optional[Callable[[float], None]] = None,
+    cache: Optional[bool] = None,
+    refresh: bool = False,
 ) -> str:
-    provider_module = ensure_provider(
-        client, api_provider, model_name, "audio transcription"
+    provider_module = _check_request(audio_path, client, model_name, api_provider)
+    key = None
+    if _cache_enabled(cache):
+        key = await _run_io(
+            _transcript_cache_key, audio_path, model_name, language_code
+        )
+        if key is not None and not refresh:
+            cached = await _run_io(_cached_transcript, key, False)
+            if cached is not None:
+                return cached.text
+    kwargs = _progress_kwargs(progress)
+    if hasattr(provider_module, "async_transcribe_audio"):
+        text = await provider_module.async_transcribe_audio(
+            client, audio_path, model_name, language_code, **kwargs
+        )
+    else:
+        text = await asyncio.to_thread(
+            provider_module.transcribe_audio,
+            client,
+            audio_path,
+            model_name,
+            language_code,
+            **kwargs,
+        )
+    if key:
+        await _run_io(_remember_transcript, key, TimedTranscript(text), False)
+    return text
+
+
+def transcribe_audio_with_timings(
+    audio_path: str,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    language_code: str = "en-US",
+    *,
+    progress: Optional[Callable[[float], None]] = None,
+    cache: Optional[bool] = None,
+    refresh: bool = False,
+) -> TimedTranscript:
+    """Transcribe ``audio_path`` and return the text with per-word timings.
+
+    Supported by the OpenAI (Whisper), Google and fake providers.  Cached
+    entries with word timings also answer plain :func:`transcribe_audio`
+    calls for the same audio.
+
+    Raises
+    ------
+    ProviderOperationError
+        If the provider cannot return word timings or the request fails.
+
+    Example
+    -------
+    >>> result = transcribe_audio_with_timings("clip.wav", client, "whisper-1", "openai")
+    >>> [(w.word, w.start) for w in result.words[:3]]
+    """
+    provider_module = _check_request(audio_path, client, model_name, api_provider)
+    transcriber = _word_transcriber(provider_module, api_provider, model_name)
+    key = None
+    if _cache_enabled(cache):
+        key = _transcript_cache_key(audio_path, model_name, language_code)
+        cached = None if refresh or key is None else _cached_transcript(key, True)
+        if cached is not None:
+            return cached
+    result = transcriber(
+        client, audio_path, model_name, language_code, **_progress_kwargs(progress)
     )
-    if not RECOMMENDED_MODELS.get(model_name, {}).get("audio_transcription"):
+    if key:
+        _remember_transcript(key, result, words=True)
+    return result
+
+
+async def async_transcribe_audio_with_timings(
+    audio_path: str,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    language_code: str = "en-US",
+    *,
+    progress: Optional[Callable[[float], None]] = None,
+    cache: Optional[bool] = None,
+    refresh: bool = False,
+) -> TimedTranscript:
+    """Asynchronous :func:`transcribe_audio_with_timings`."""
+    return await asyncio.to_thread(
+        transcribe_audio_with_timings,
+        audio_path,
+        client,
+        model_name,
+        api_provider,
+        language_code,
+        progress=progress,
+        cache=cache,
+        refresh=refresh,
+    )
+
+
+# Google's synchronous recognize accepts ~60 s; stay just below it.
+DEFAULT_WINDOW_SECONDS = 55.0
+DEFAULT_OVERLAP_SECONDS = 2.0
+_SILENCE_PROBE_SECONDS = 0.02
+# Silence search covers the tail of each window: [60%, 100%] of its length.
+_SILENCE_SEARCH_FRACTION = 0.4
+
+
+def _as_wav(audio_path: str, workdir: str) -> str:
+    """Return a PCM WAV version of ``audio_path`` (decoded via pydub if needed)."""
+    try:
+        with wave.open(audio_path, "rb"):
+            return audio_path
+    except (wave.Error, EOFError):
+        pass
+    try:
+        from pydub import AudioSegment  # type: ignore
+    except ImportError as exc:
+        raise ValueError(
+            "Chunked transcription of non-WAV audio requires 'pip install pydub' "
+            "and ffmpeg."
+        ) from exc
+    wav_path = os.path.join(workdir, "source.wav")
+    AudioSegment.from_file(audio_path).export(wav_path, format="wav")
+    return wav_path
+
+
+def _rms(frames: bytes, sampwidth: int) -> float:
+    if sampwidth != 2 or not frames:
+        return 0.0
+    samples = array("h", frames[: len(frames) - len(frames) % 2])
+    return math.sqrt(sum(x * x for x in samples) / len(samples)) if samples else 0.0
+
+
+def _quietest_frame(reader: wave.Wave_read, start: int, end: int) -> int:
+    """Return the frame offset of the quietest probe window in ``[start, end)``."""
+    rate, width, channels = reader.getframerate(), reader.getsampwidth(), reader.getnchannels()
+    probe = max(1, int(rate * _SILENCE_PROBE_SECONDS))
+    best, best_rms = end, math.inf
+    reader.setpos(start)
+    pos = start
+    while pos + probe <= end:
+        level = _rms(reader.readframes(probe), width) / max(1, channels)
+        if level < best_rms:
+            best, best_rms = pos + probe // 2, level
+        pos += probe
+    return best
+
+
+def _plan_chunks(
+    reader: wave.Wave_read,
+    window_seconds: float,
+    overlap_seconds: float,
+    split_on_silence: bool,
+) -> Tuple[List[Tuple[int, int]], bool]:
+    """Return ``(start_frame, end_frame)`` pairs covering the whole file.
+
+    The flag tells whether the chunks overlap: silence splitting needs 16-bit
+    audio and falls back to overlapping fixed windows otherwise.
+    """
+    rate, total = reader.getframerate(), reader.getnframes()
+    window = max(1, int(window_seconds * rate))
+    chunks: List[Tuple[int, int]] = []
+    if split_on_silence and reader.getsampwidth() == 2:
+        # Cut at the quietest point near each window end; no overlap needed.
+        start = 0
+        while start < total:
+            end = start + window
+            if end >= total:
+                chunks.append((start, total))
+                break
+            search_from = end - int(window * _SILENCE_SEARCH_FRACTION)
+            cut = _quietest_frame(reader, search_from, end)
+            chunks.append((start, cut))
+            start = cut
+        return chunks, False
+    step = max(1, window - int(overlap_seconds * rate))
+    start = 0
+    while start < total:
+        end = min(start + window, total)
+        chunks.append((start, end))
+        if end >= total:
+            break
+        start += step
+    return chunks, step < window and len(chunks) > 1
+
+
+def _split_audio(
+    audio_path: str,
+    workdir: str,
+    window_seconds: float,
+    overlap_seconds: float,
+    split_on_silence: bool,
+) -> Tuple[List[Tuple[float, float, str]], bool]:
+    """Write chunk WAV files to ``workdir``; return ``(start_s, end_s, path)``.
+
+    Audio is streamed one window at a time, so memory stays bounded.  The
+    flag from :func:`_plan_chunks` (whether chunks overlap) is passed through.
+    """
+    wav_path = _as_wav(audio_path, workdir)
+    chunks = []
+    with wave.open(wav_path, "rb") as reader:
+        rate = reader.getframerate()
+        plan, overlapped = _plan_chunks(
+            reader, window_seconds, overlap_seconds, split_on_silence
+        )
+        for i, (start, end) in enumerate(plan):
+            reader.setpos(start)
+            chunk_path = os.path.join(workdir, f"chunk_{i:05d}.wav")
+            with wave.open(chunk_path, "wb") as writer:
+                writer.setparams(reader.getparams())
+                writer.writeframes(reader.readframes(end - start))
+            chunks.append((start / rate, end / rate, chunk_path))
+    return chunks, overlapped
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def _trim_overlap(previous: str, current: str, max_words: int = 30) -> str:
+    """Drop the words at the start of ``current`` that repeat ``previous``'s tail."""
+    prev_words = [_normalize_word(w) for w in previous.split()[-max_words:]]
+    cur_words = current.split()
+    cur_norm = [_normalize_word(w) for w in cur_words[:max_words]]
+    for k in range(min(len(prev_words), len(cur_norm)), 0, -1):
+        if prev_words[-k:] == cur_norm[:k]:
+            return " ".join(cur_words[k:])
+    return current
+
+
+def _stitch(
+    chunks: List[Tuple[float, float, str]], texts: List[str], overlapped: bool
+) -> ChunkedTranscript:
+    segments = []
+    previous = ""
+    for (start, end, _), text in zip(chunks, texts):
+        text = (text or "").strip()
+        if overlapped and previous:
+            text = _trim_overlap(previous, text)
+        segments.append(TranscriptSegment(start, end, text))
+        previous = text or previous
+    return ChunkedTranscript(
+        " ".join(seg.text for seg in segments if seg.text), segments
+    )
+
+
+def transcribe_audio_chunked(
+    audio_path: str,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    language_code: str = "en-US",
+    *,
+    window_seconds: float = DEFAULT_WINDOW_SECONDS,
+    overlap_seconds: float = DEFAULT_OVERLAP_SECONDS,
+    split_on_silence: bool = False,
+    max_concurrency: int = 4,
+) -> ChunkedTranscript:
+    """Transcribe long audio by splitting it into chunks transcribed in parallel.
+
+    Chunks are fixed windows with ``overlap_seconds`` of overlap (duplicated
+    words at the seams are removed) or, with ``split_on_silence=True``, cut
+    at the quietest point near each window end (16-bit audio only; other
+    sample widths fall back to overlapping windows).  WAV input is handled with
+    the standard library; other formats need ``pydub`` and ffmpeg.
+
+    Raises
+    ------
+    ProviderOperationError
+        If the request is invalid or any chunk fails.
+
+    Example
+    -------
+    >>> result = transcribe_audio_chunked("meeting.wav", client, "whisper-1", "openai")
+    >>> result.segments[0].start, result.text[:80]
+    """
+    _check_request(audio_path, client, model_name, api_provider)
+    with tempfile.TemporaryDirectory(prefix="transcribe_") as workdir:
+        chunks, overlapped = _chunks_or_error(
+            audio_path, workdir, model_name, api_provider,
+            window_seconds, overlap_seconds, split_on_silence,
+        )
+        workers = max(1, min(max_concurrency, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            texts = list(
+                pool.map(
+                    lambda chunk: transcribe_audio(
+                        chunk[2],
+                        client,
+                        model_name,
+                        api_provider,
+                        language_code,
+                        cache=False,
+                    ),
+                    chunks,
+                )
+            )
+    return _stitch(chunks, texts, overlapped=overlapped)
+
+
+async def async_transcribe_audio_chunked(
+    audio_path: str,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    language_code: str = "en-US",
+    *,
+    window_seconds: float = DEFAULT_WINDOW_SECONDS,
+    overlap_seconds: float = DEFAULT_OVERLAP_SECONDS,
+    split_on_silence: bool = False,
+    max_concurrency: int = 4,
+) -> ChunkedTranscript:
+    """Asynchronous :func:`transcribe_audio_chunked`."""
+    _check_request(audio_path, client, model_name, api_provider)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    with tempfile.TemporaryDirectory(prefix="transcribe_") as workdir:
+        chunks, overlapped = await asyncio.to_thread(
+            _chunks_or_error, audio_path, workdir, model_name, api_provider,
+            window_seconds, overlap_seconds, split_on_silence,
+        )
+
+        async def run(chunk_path: str) -> str:
+            async with semaphore:
+                return await async_transcribe_audio(
+                    chunk_path,
+                    client,
+                    model_name,
+                    api_provider,
+                    language_code,
+                    cache=False,
+                )
+
+        texts = await asyncio.gather(*(run(path) for _, _, path in chunks))
+    return _stitch(chunks, list(texts), overlapped=overlapped)
+
+
+def _chunks_or_error(
+    audio_path: str,
+    workdir: str,
+    model_name: str,
+    api_provider: str,
+    window_seconds: float,
+    overlap_seconds: float,
+    split_on_silence: bool,
+) -> Tuple[List[Tuple[float, float, str]], bool]:
+    if overlap_seconds >= window_seconds:
         raise ProviderOperationError(
-            api_provider,
-            model_name,
-            "audio transcription",
-            f"Model '{model_name}' does not support audio transcription.",
+            api_provider, model_name, "audio transcription",
+            "overlap_seconds must be smaller than window_seconds.",
+        )
+    try:
+        return _split_audio(
+            audio_path, workdir, window_seconds, overlap_seconds, split_on_silence
         )
-    if not os.path.exists(audio_path):
+    except (ValueError, wave.Error, EOFError) as e:
         raise ProviderOperationError(
-            api_provider,
-            model_name,
-            "audio transcription",
-            f"Audio file not found at {audio_path}",
+            api_provider, model_name, "audio transcription", str(e)
         )
-    if hasattr(provider_module, "async_transcribe_audio"):
-        return await provider_module.async_transcribe_audio(
-            client, audio_path, model_name, language_code
+
+
+DEFAULT_STREAM_WINDOW_SECONDS = 5.0
+
+
+def _windowed_stream(
+    provider_module: Any,
+    chunks: Iterable[bytes],
+    client: Any,
+    model_name: str,
+    language_code: str,
+    sample_rate_hertz: int,
+    channels: int,
+    window_seconds: float,
+) -> Iterator[TranscriptSegment]:
+    """Transcribe buffered PCM in windows for providers without streaming."""
+    bytes_per_second = sample_rate_hertz * channels * 2
+    window_bytes = max(2 * channels, int(window_seconds * bytes_per_second))
+    window_bytes -= window_bytes % (2 * channels)
+    buffer = bytearray()
+    offset = 0.0
+    with tempfile.TemporaryDirectory(prefix="transcribe_stream_") as workdir:
+        wav_path = os.path.join(workdir, "window.wav")
+
+        def flush(data: bytes) -> TranscriptSegment:
+            nonlocal offset
+            with wave.open(wav_path, "wb") as writer:
+                writer.setnchannels(channels)
+                writer.setsampwidth(2)
+                writer.setframerate(sample_rate_hertz)
+                writer.writeframes(data)
+            text = provider_module.transcribe_audio(
+                client, wav_path, model_name, language_code
+            )
+            start, offset = offset, offset + len(data) / bytes_per_second
+            return TranscriptSegment(start, offset, (text or "").strip())
+
+        for chunk in chunks:
+            buffer.extend(chunk)
+            while len(buffer) >= window_bytes:
+                data = bytes(buffer[:window_bytes])
+                del buffer[:window_bytes]
+                yield flush(data)
+        if buffer:
+            yield flush(bytes(buffer))
+
+
+def stream_transcribe_audio(
+    chunks: Iterable[bytes],
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    language_code: str = "en-US",
+    *,
+    sample_rate_hertz: int = 16000,
+    channels: int = 1,
+    interim_results: bool = True,
+    window_seconds: float = DEFAULT_STREAM_WINDOW_SECONDS,
+) -> Iterator[TranscriptSegment]:
+    """Transcribe audio as it arrives, yielding incremental segments.
+
+    ``chunks`` yields raw 16-bit little-endian PCM (LINEAR16) at
+    ``sample_rate_hertz``, e.g. from a microphone callback.  Providers with
+    native streaming (Google, the fake provider) yield interim hypotheses
+    followed by final segments; others (OpenAI Whisper) buffer
+    ``window_seconds`` of audio and yield one final segment per window.
+
+    Raises
+    ------
+    ProviderOperationError
+        If the model cannot transcribe audio or the provider call fails.
+
+    Example
+    -------
+    >>> for seg in stream_transcribe_audio(mic_chunks(), client, "whisper-1", "openai"):
+    ...     if seg.is_final:
+    ...         print(f"[{seg.start:.1f}s] {seg.text}")
+    """
+    provider_module = _check_model(client, model_name, api_provider)
+    streamer = getattr(provider_module, "stream_transcribe_audio", None)
+    if streamer is not None:
+        return streamer(
+            client,
+            chunks,
+            model_name,
+            language_code,
+            sample_rate_hertz=sample_rate_hertz,
+            channels=channels,
+            interim_results=interim_results,
         )
-    return await asyncio.to_thread(
-        provider_module.transcribe_audio, client, audio_path, model_name, language_code
+    return _windowed_stream(
+        provider_module,
+        chunks,
+        client,
+        model_name,
+        language_code,
+        sample_rate_hertz,
+        channels,
+        window_seconds,
     )
 
 
@@ -108,6 +699,15 @@ async def async_transcribe_audio_compat(
 
 
 __all__ = [
+    "TranscriptSegment",
+    "ChunkedTranscript",
+    "WordTiming",
+    "TimedTranscript",
+    "transcribe_audio_with_timings",
+    "async_transcribe_audio_with_timings",
+    "transcribe_audio_chunked",
+    "async_transcribe_audio_chunked",
+    "stream_transcribe_audio",
     "transcribe_audio",
     "transcribe_audio_compat",
     "async_transcribe_audio",
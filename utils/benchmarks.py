@@ -0,0 +1,438 @@
+"""Micro-benchmarks for the utils package.
+
+Run from the repository root::
+
+    python -m utils.benchmarks import
+    python -m utils.benchmarks load --calls 2000 --concurrency 64
+    python -m utils.benchmarks throughput gpt-4o-mini claude-sonnet-4-20250514
+
+``load`` drives the public request functions against the ``fake`` provider,
+so the numbers are the cost of this package's own wrapper code (provider
+lookup, prompt normalisation, logging context, artifact saving) plus any
+simulated latency, never network time.
+
+``throughput`` is the opposite: it streams :data:`STANDARD_PROMPTS` through
+real models and records time to first token, tokens per second and error
+rate in ``artifacts/benchmarks/model_metrics.json``, which
+:func:`utils.models.load_model_metrics` attaches to ``RECOMMENDED_MODELS``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+# Imports that ``import utils`` must not trigger; they load on first use.
+HEAVY_MODULES = (
+    "IPython",
+    "plantuml",
+    "dotenv",
+    "openai",
+    "anthropic",
+    "google.genai",
+    "google.cloud.speech",
+    "huggingface_hub",
+    "utils.providers.openai",
+    "utils.providers.openai_compatible",
+    "utils.providers.anthropic",
+    "utils.providers.google",
+    "utils.providers.huggingface",
+)
+
+
+def benchmark_import_time(
+    module: str = "utils",
+    *,
+    runs: int = 5,
+    python: Optional[str] = None,
+    cwd: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Time ``import module`` in fresh interpreters.
+
+    Returns the min/median wall time in milliseconds and the heavy modules
+    (see :data:`HEAVY_MODULES`) that the import pulled in.
+    """
+    if cwd is None:
+        cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings: List[float] = []
+    loaded: List[str] = []
+    for _ in range(max(1, runs)):
+        output = subprocess.run(
+            [python or sys.executable, "-c", _IMPORT_PROBE.format(module=module)],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["seconds"] * 1000)
+        loaded = [m for m in HEAVY_MODULES if m in result["modules"]]
+    return {
+        "module": module,
+        "runs": len(timings),
+        "min_ms": round(min(timings), 2),
+        "median_ms": round(statistics.median(timings), 2),
+        "heavy_modules": loaded,
+    }
+
+
+# Operation name -> (is_async, call(client, i)).  Built lazily so importing
+# this module stays as cheap as ``import utils``.
+LOAD_OPERATIONS = (
+    "completion",
+    "async_completion",
+    "vision",
+    "async_vision",
+    "image",
+    "async_image",
+)
+
+
+def _load_calls() -> Dict[str, Any]:
+    from .image_gen import (
+        async_get_image_generation_completion,
+        get_image_generation_completion,
+    )
+    from .llm import (
+        async_get_completion,
+        async_get_vision_completion,
+        get_completion,
+        get_vision_completion,
+    )
+
+    model, provider = "fake-model", "fake"
+    return {
+        "completion": (False, lambda c, i: get_completion(
+            f"benchmark prompt {i}", c, model, provider)),
+        "async_completion": (True, lambda c, i: async_get_completion(
+            f"benchmark prompt {i}", c, model, provider)),
+        "vision": (False, lambda c, i: get_vision_completion(
+            f"describe {i}", "image.png", c, model, provider)),
+        "async_vision": (True, lambda c, i: async_get_vision_completion(
+            f"describe {i}", "image.png", c, model, provider)),
+        "image": (False, lambda c, i: get_image_generation_completion(
+            f"benchmark image {i}", c, model, provider, cache=False)),
+        "async_image": (True, lambda c, i: async_get_image_generation_completion(
+            f"benchmark image {i}", c, model, provider, cache=False)),
+    }
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _timed(call: Callable[[], Any], errors: type) -> tuple[float, bool]:
+    start = time.perf_counter()
+    try:
+        call()
+        ok = True
+    except errors:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+async def _async_timed(call: Callable[[], Awaitable[Any]], errors: type) -> tuple[float, bool]:
+    start = time.perf_counter()
+    try:
+        await call()
+        ok = True
+    except errors:
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def _drive_sync(call: Callable[[int], Any], calls: int, concurrency: int, errors: type) -> List[tuple[float, bool]]:
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(lambda i: _timed(lambda: call(i), errors), range(calls)))
+
+
+def _drive_async(call: Callable[[int], Awaitable[Any]], calls: int, concurrency: int, errors: type) -> List[tuple[float, bool]]:
+    async def run() -> List[tuple[float, bool]]:
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one(i: int) -> tuple[float, bool]:
+            async with gate:
+                return await _async_timed(lambda: call(i), errors)
+
+        return await asyncio.gather(*(one(i) for i in range(calls)))
+
+    return asyncio.run(run())
+
+
+def benchmark_fake_provider(
+    operations: Sequence[str] = LOAD_OPERATIONS,
+    *,
+    calls: int = 1000,
+    concurrency: int = 32,
+    behavior: Any = None,
+    artifacts_dir: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Load-test the request functions against the ``fake`` provider.
+
+    Parameters
+    ----------
+    operations:
+        Names from :data:`LOAD_OPERATIONS`.
+    calls, concurrency:
+        Requests per operation and how many are in flight at once (threads
+        for sync functions, tasks for async ones).
+    behavior:
+        :class:`utils.providers.fake.FakeBehavior` for simulated latency,
+        error rate and token counts; the default simulates none.
+    artifacts_dir:
+        Where image operations save files; a temporary directory by default.
+
+    Returns one dict per operation with ``throughput_per_s``, ``p50_ms``,
+    ``p99_ms``, ``cpu_ms_per_call``, ``errors`` and ``overhead_ms`` (mean
+    call time minus mean simulated provider latency).
+
+    Raises
+    ------
+    ValueError
+        For unknown operation names.
+    """
+    from . import artifacts
+    from .errors import ProviderOperationError
+    from .providers.fake import FakeBehavior, FakeClient
+
+    available = _load_calls()
+    unknown = [op for op in operations if op not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown operations {unknown}; expected some of {', '.join(LOAD_OPERATIONS)}."
+        )
+    behavior = behavior or FakeBehavior()
+    previous_dir = artifacts._ARTIFACTS_DIR
+    with tempfile.TemporaryDirectory(prefix="utils-bench-") as scratch:
+        artifacts.set_artifacts_dir(artifacts_dir or scratch)
+        try:
+            results = []
+            for name in operations:
+                is_async, call = available[name]
+                client = FakeClient("fake-model", behavior=behavior)
+                driver = _drive_async if is_async else _drive_sync
+                cpu_start, wall_start = time.process_time(), time.perf_counter()
+                samples = driver(
+                    lambda i: call(client, i), calls, max(1, concurrency),
+                    ProviderOperationError,
+                )
+                wall = time.perf_counter() - wall_start
+                cpu = time.process_time() - cpu_start
+                latencies = sorted(seconds for seconds, _ in samples)
+                mean_call = statistics.fmean(latencies) if latencies else 0.0
+                results.append({
+                    "operation": name,
+                    "calls": len(samples),
+                    "concurrency": concurrency,
+                    "errors": sum(not ok for _, ok in samples),
+                    "wall_s": round(wall, 4),
+                    "throughput_per_s": round(len(samples) / wall, 1) if wall else 0.0,
+                    "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+                    "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+                    "cpu_ms_per_call": round(cpu / max(1, len(samples)) * 1000, 3),
+                    "overhead_ms": round(
+                        (mean_call - client.simulated_seconds / max(1, len(samples))) * 1000, 3
+                    ),
+                    "prompt_tokens": client.prompt_tokens,
+                    "completion_tokens": client.completion_tokens,
+                })
+            return results
+        finally:
+            artifacts._ARTIFACTS_DIR = previous_dir
+
+
+# Short to long replies, so tokens/sec is not dominated by time to first token.
+STANDARD_PROMPTS = (
+    "Reply with the single word: ready.",
+    "Summarize the purpose of a software requirements specification in three sentences.",
+    "List five benefits of automated unit tests as short bullet points.",
+    "Write a Python function that checks whether a string is a palindrome, "
+    "with a docstring and two doctest examples.",
+)
+
+
+def _stream_sample(prompt: str, client: Any, model: str, provider: str, temperature: float) -> Dict[str, float]:
+    from .helpers import estimate_tokens
+    from .llm import stream_completion
+
+    start = time.perf_counter()
+    first = None
+    parts = []
+    for delta in stream_completion(prompt, client, model, provider, temperature):
+        if first is None:
+            first = time.perf_counter()
+        parts.append(delta)
+    end = time.perf_counter()
+    first = end if first is None else first
+    # Providers report usage differently (or not at all when streaming).
+    tokens = max(1, estimate_tokens("".join(parts)))
+    generation = end - first
+    return {
+        "ttft": first - start,
+        "total": end - start,
+        "tokens": tokens,
+        "tokens_per_second": tokens / (generation if generation > 0 else end - start),
+    }
+
+
+def benchmark_model_throughput(
+    models: Optional[Sequence[str]] = None,
+    *,
+    prompts: Sequence[str] = STANDARD_PROMPTS,
+    runs: int = 1,
+    temperature: float = 0.0,
+    save: bool = True,
+    base_dir: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Measure streaming latency and throughput of text models.
+
+    Parameters
+    ----------
+    models:
+        Model names; by default every text model in ``RECOMMENDED_MODELS``
+        whose client can be configured (API key present).
+    prompts, runs:
+        Each prompt is sent ``runs`` times per model, sequentially.
+    save:
+        Merge the results into the model metrics artifact (see
+        :func:`utils.models.save_model_metrics`).  Models of test providers
+        such as ``fake`` are measured when named but never saved.
+
+    Returns model name -> ``ttft_ms``, ``latency_ms`` and
+    ``tokens_per_second`` (medians over successful requests),
+    ``error_rate``, ``samples`` and ``measured_at``.  Token counts are
+    estimated from the streamed text.
+    """
+    from .errors import ProviderOperationError
+    from .llm import setup_llm_client
+    from .models import (
+        RECOMMENDED_MODELS,
+        TEST_PROVIDERS,
+        Capability,
+        save_model_metrics,
+    )
+
+    if models is None:
+        models = [
+            spec.name
+            for spec in RECOMMENDED_MODELS.query(Capability.TEXT)
+            if spec.provider not in TEST_PROVIDERS
+        ]
+    results: Dict[str, Dict[str, Any]] = {}
+    measured: Dict[str, Dict[str, Any]] = {}  # excludes test providers
+    for model_name in models:
+        client, model, provider = setup_llm_client(model_name)
+        if client is None:
+            continue
+        samples, errors = [], 0
+        for prompt in list(prompts) * max(1, runs):
+            try:
+                samples.append(_stream_sample(prompt, client, model, provider, temperature))
+            except ProviderOperationError:
+                errors += 1
+        attempts = len(samples) + errors
+        metrics: Dict[str, Any] = {
+            "samples": attempts,
+            "error_rate": round(errors / attempts, 4) if attempts else 0.0,
+            "measured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        if samples:
+            metrics.update(
+                ttft_ms=round(statistics.median(s["ttft"] for s in samples) * 1000, 1),
+                latency_ms=round(statistics.median(s["total"] for s in samples) * 1000, 1),
+                tokens_per_second=round(
+                    statistics.median(s["tokens_per_second"] for s in samples), 1
+                ),
+            )
+        results[model_name] = metrics
+        if provider not in TEST_PROVIDERS:
+            measured[model_name] = metrics
+    if save and measured:
+        save_model_metrics(measured, base_dir=base_dir)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utils.benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    imports = commands.add_parser("import", help="time `import utils` in a fresh interpreter")
+    imports.add_argument("module", nargs="?", default="utils")
+    load = commands.add_parser("load", help="load-test the wrappers with the fake provider")
+    load.add_argument("operations", nargs="*", default=list(LOAD_OPERATIONS))
+    load.add_argument("--calls", type=int, default=1000)
+    load.add_argument("--concurrency", type=int, default=32)
+    load.add_argument("--latency-ms", type=float, default=0.0)
+    load.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    load.add_argument("--latency-distribution", default="constant")
+    load.add_argument("--error-rate", type=float, default=0.0)
+    load.add_argument("--output-tokens", type=int, default=None)
+    load.add_argument("--seed", type=int, default=None)
+    throughput = commands.add_parser(
+        "throughput", help="measure TTFT and tokens/sec of configured models"
+    )
+    throughput.add_argument("models", nargs="*", help="default: all configured text models")
+    throughput.add_argument("--runs", type=int, default=1)
+    throughput.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.command == "import":
+        result = benchmark_import_time(args.module)
+        print(json.dumps(result, indent=2))
+        return 1 if result["heavy_modules"] else 0
+
+    if args.command == "throughput":
+        results = benchmark_model_throughput(
+            args.models or None, runs=args.runs, save=not args.no_save
+        )
+        print(json.dumps(results, indent=2))
+        return 0 if results else 1
+
+    from .providers.fake import FakeBehavior
+
+    behavior = FakeBehavior(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        latency_distribution=args.latency_distribution,
+        error_rate=args.error_rate,
+        output_tokens=args.output_tokens,
+        seed=args.seed,
+    )
+    results = benchmark_fake_provider(
+        args.operations, calls=args.calls, concurrency=args.concurrency, behavior=behavior
+    )
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    sys.exit(main())
+
+
+__all__ = [
+    "HEAVY_MODULES",
+    "LOAD_OPERATIONS",
+    "STANDARD_PROMPTS",
+    "benchmark_import_time",
+    "benchmark_fake_provider",
+    "benchmark_model_throughput",
+]
@@ -0,0 +1,240 @@
+"""Persistent artifact-backed caches with TTL and size eviction.
+
+Each cache keeps a JSON manifest at ``<artifacts>/.cache/<namespace>/manifest.json``
+mapping a key to a small JSON value plus the artifact files that hold the
+payload.  Entries expire after ``ttl_seconds`` and the least recently used
+ones are evicted once ``max_entries`` or ``max_bytes`` is exceeded.
+
+Cache hits only update recency in memory; the manifest is written on
+``put``/eviction/invalidation, by :meth:`ArtifactCache.flush` and at exit.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Union
+
+from .artifacts import (
+    _stored_forms,
+    get_artifacts_dir,
+    load_artifact,
+    resolve_artifact_path,
+    save_artifact,
+)
+from .errors import ArtifactError
+from .logging import get_logger
+
+logger = get_logger()
+
+CACHE_DIRNAME = ".cache"
+
+# Caches with unsaved recency updates are flushed when the interpreter exits.
+_LIVE_CACHES: "weakref.WeakSet[ArtifactCache]" = weakref.WeakSet()
+
+
+class ArtifactCache:
+    """Key/value cache whose payloads are artifacts.
+
+    ``owns_files`` controls whether evicting an entry deletes its files
+    (``True`` for payloads written only for the cache, ``False`` for entries
+    that point at artifacts users keep, such as generated images).
+
+    ``files`` passed to :meth:`put` should be the paths returned by
+    :func:`~utils.artifacts.save_artifact`; plain names are resolved to the
+    compressed form actually stored when only that exists.
+
+    Each artifacts directory has its own manifest; ``base_dir`` on the
+    methods overrides the one given here for that call.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        owns_files: bool = True,
+        base_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.owns_files = owns_files
+        self.base_dir = base_dir
+        self._lock = threading.RLock()
+        # Manifests are cached per artifacts directory, which may change.
+        self._manifests: Dict[Path, Dict[str, Dict[str, Any]]] = {}
+        self._dirty: Set[Path] = set()  # manifests with unsaved recency updates
+        _LIVE_CACHES.add(self)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Return a stable SHA-256 key for JSON-serialisable ``parts``."""
+        encoded = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @property
+    def directory(self) -> str:
+        """Artifact-relative directory for payloads owned by this cache."""
+        return f"{CACHE_DIRNAME}/{self.namespace}"
+
+    def _manifest_name(self) -> str:
+        return f"{self.directory}/manifest.json"
+
+    def _manifest(
+        self, base_dir: Optional[Union[str, Path]] = None
+    ) -> tuple[Path, Dict[str, Dict[str, Any]]]:
+        base = get_artifacts_dir(self.base_dir if base_dir is None else base_dir)
+        manifest = self._manifests.get(base)
+        if manifest is None:
+            try:
+                manifest = load_artifact(
+                    self._manifest_name(), base_dir=base, as_="json"
+                )
+            except ArtifactError:
+                manifest = {}
+            except ValueError:
+                logger.warning("Discarding corrupt %s cache manifest.", self.namespace)
+                manifest = {}
+            self._manifests[base] = manifest
+        return base, manifest
+
+    def _persist(self, base: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+        save_artifact(
+            manifest, self._manifest_name(), base_dir=base, overwrite=True, index=False
+        )
+        self._dirty.discard(base)
+
+    def flush(self) -> None:
+        """Write recency updates from cache hits to the manifests."""
+        with self._lock:
+            for base in list(self._dirty):
+                self._persist(base, self._manifests[base])
+
+    def _stored_path(self, base: Path, name: Union[str, Path]) -> Path:
+        path = resolve_artifact_path(name, base_dir=base)
+        if path.exists():
+            return path
+        # A name saved with compression lives at name.gz / name.zst.
+        return next((p for p in _stored_forms(path)[1:] if p.exists()), path)
+
+    def _delete_files(self, base: Path, files: Iterable[str]) -> None:
+        if not self.owns_files:
+            return
+        for rel in files:
+            try:
+                resolve_artifact_path(rel, base_dir=base).unlink(missing_ok=True)
+            except (ArtifactError, OSError):  # pragma: no cover - best effort
+                pass
+
+    def _drop(self, base: Path, manifest: Dict[str, Dict[str, Any]], key: str) -> None:
+        entry = manifest.pop(key, None)
+        if entry:
+            self._delete_files(base, entry.get("files", []))
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry["created"] > self.ttl_seconds
+
+    def get(
+        self, key: str, *, base_dir: Optional[Union[str, Path]] = None
+    ) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None``.
+
+        Expired entries and entries whose files disappeared are dropped.
+        """
+        with self._lock:
+            base, manifest = self._manifest(base_dir)
+            entry = manifest.get(key)
+            if entry is None:
+                return None
+            now = time.time()
+            missing = any(
+                not resolve_artifact_path(rel, base_dir=base).exists()
+                for rel in entry.get("files", [])
+            )
+            if missing or self._expired(entry, now):
+                self._drop(base, manifest, key)
+                self._persist(base, manifest)
+                return None
+            entry["accessed"] = now
+            self._dirty.add(base)
+            return entry["value"]
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        files: Iterable[Union[str, Path]] = (),
+        *,
+        base_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """Store ``value`` (JSON-serialisable) and the artifact ``files`` it uses."""
+        with self._lock:
+            base, manifest = self._manifest(base_dir)
+            rel_files = []
+            size = 0
+            for f in files:
+                path = self._stored_path(base, f)
+                rel_files.append(path.relative_to(base).as_posix())
+                size += path.stat().st_size if path.exists() else 0
+            now = time.time()
+            previous = manifest.pop(key, None)
+            if previous:
+                self._delete_files(base, set(previous.get("files", [])) - set(rel_files))
+            manifest[key] = {
+                "value": value,
+                "files": rel_files,
+                "bytes": size,
+                "created": now,
+                "accessed": now,
+            }
+            self._evict(base, manifest, now)
+            self._persist(base, manifest)
+
+    def invalidate(
+        self, key: str, *, base_dir: Optional[Union[str, Path]] = None
+    ) -> None:
+        with self._lock:
+            base, manifest = self._manifest(base_dir)
+            if key in manifest:
+                self._drop(base, manifest, key)
+                self._persist(base, manifest)
+
+    def clear(self) -> None:
+        with self._lock:
+            base, manifest = self._manifest()
+            for key in list(manifest):
+                self._drop(base, manifest, key)
+            self._persist(base, manifest)
+
+    def _evict(self, base: Path, manifest: Dict[str, Dict[str, Any]], now: float) -> None:
+        for key in [k for k, e in manifest.items() if self._expired(e, now)]:
+            self._drop(base, manifest, key)
+        by_age = sorted(manifest, key=lambda k: manifest[k]["accessed"])
+        total = sum(e.get("bytes", 0) for e in manifest.values())
+        while by_age and (
+            (self.max_entries is not None and len(manifest) > self.max_entries)
+            or (self.max_bytes is not None and total > self.max_bytes)
+        ):
+            key = by_age.pop(0)
+            total -= manifest[key].get("bytes", 0)
+            self._drop(base, manifest, key)
+
+
+@atexit.register
+def _flush_caches() -> None:  # pragma: no cover - runs at interpreter exit
+    for cache in list(_LIVE_CACHES):
+        try:
+            cache.flush()
+        except Exception:
+            pass
+
+
+__all__ = ["ArtifactCache"]
@@ -0,0 +1,166 @@
+"""Compression codecs for the artifact storage tier.
+
+Compressed artifacts keep their original name plus a codec suffix
+(``prd.md`` -> ``prd.md.gz`` / ``prd.md.zst``) and are recognised on load by
+suffix and verified by their magic header.  ``gzip`` is always available;
+``zstd`` requires the optional ``zstandard`` package and additionally supports
+shared dictionaries trained on many small JSON artifacts.
+"""
+from __future__ import annotations
+
+import functools
+import gzip
+import os
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .errors import ArtifactError
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - gzip is used instead
+    zstandard = None  # type: ignore[assignment]
+
+GZIP, ZSTD = "gzip", "zstd"
+SUFFIXES = {GZIP: ".gz", ZSTD: ".zst"}
+_MAGIC = {GZIP: b"\x1f\x8b", ZSTD: b"\x28\xb5\x2f\xfd"}
+
+# Text-like artifacts that compress well; binaries (png, wav, db) are left
+# alone in every mode, since their readers expect the raw format.
+COMPRESSIBLE_EXTENSIONS = frozenset({
+    ".json", ".jsonl", ".md", ".sql", ".txt", ".csv", ".tsv", ".log", ".py",
+    ".html", ".puml", ".svg", ".xml", ".yaml", ".yml",
+})
+MIN_COMPRESS_BYTES = int(os.getenv("AGA_ARTIFACT_COMPRESS_MIN_BYTES", "1024"))
+ZSTD_LEVEL = int(os.getenv("AGA_ARTIFACT_ZSTD_LEVEL", "3"))
+GZIP_LEVEL = int(os.getenv("AGA_ARTIFACT_GZIP_LEVEL", "6"))
+
+DICT_DIRNAME = ".zstd_dicts"
+_ACTIVE_DICT_FILE = "active"
+
+
+def default_mode() -> Optional[str]:
+    """Return the compression mode configured by ``AGA_ARTIFACT_COMPRESSION``."""
+    mode = os.getenv("AGA_ARTIFACT_COMPRESSION", "").strip().lower()
+    return None if mode in {"", "0", "off", "none", "false"} else mode
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def choose_codec(mode: Optional[str], suffix: str, size: int) -> Optional[str]:
+    """Pick a codec for an artifact, or ``None`` to store it raw.
+
+    Only :data:`COMPRESSIBLE_EXTENSIONS` are compressed.  ``mode`` is
+    ``"gzip"``, ``"zstd"`` (compress them at any size) or ``"auto"``
+    (compress them at or above the size threshold, preferring zstd when
+    installed).
+    """
+    if not mode:
+        return None
+    if mode != "auto":
+        if mode == ZSTD and not zstd_available():
+            raise ArtifactError("zstd compression requires 'pip install zstandard'.")
+        if mode not in SUFFIXES:
+            raise ArtifactError(f"Unknown compression mode: {mode!r}")
+    if suffix.lower() not in COMPRESSIBLE_EXTENSIONS:
+        return None
+    if mode == "auto":
+        if size < MIN_COMPRESS_BYTES:
+            return None
+        return ZSTD if zstd_available() else GZIP
+    return mode
+
+
+def codec_for_path(path: Path) -> Optional[str]:
+    """Return the codec implied by ``path``'s suffix, if any."""
+    suffix = path.suffix.lower()
+    for codec, codec_suffix in SUFFIXES.items():
+        if suffix == codec_suffix:
+            return codec
+    return None
+
+
+def sniff_codec(header: bytes) -> Optional[str]:
+    """Return the codec whose magic bytes start ``header``, if any."""
+    for codec, magic in _MAGIC.items():
+        if header.startswith(magic):
+            return codec
+    return None
+
+
+@functools.lru_cache(maxsize=32)
+def _load_dict(dict_path: str, mtime: float) -> "zstandard.ZstdCompressionDict":
+    # ``mtime`` keys the cache so retrained dictionaries are picked up.
+    return zstandard.ZstdCompressionDict(Path(dict_path).read_bytes())
+
+
+def _dict_for_id(dict_dir: Path, dict_id: int) -> "zstandard.ZstdCompressionDict":
+    dict_path = dict_dir / f"{dict_id}.dict"
+    if not dict_path.exists():
+        raise ArtifactError(f"zstd dictionary {dict_id} not found in {dict_dir}")
+    return _load_dict(str(dict_path), dict_path.stat().st_mtime)
+
+
+def _active_dict(dict_dir: Path) -> Optional["zstandard.ZstdCompressionDict"]:
+    pointer = dict_dir / _ACTIVE_DICT_FILE
+    if not pointer.exists():
+        return None
+    return _dict_for_id(dict_dir, int(pointer.read_text().strip()))
+
+
+def compress(data: bytes, codec: str, dict_dir: Optional[Path] = None) -> bytes:
+    if codec == GZIP:
+        # mtime=0 keeps output deterministic so identical content hashes equal
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    dict_data = _active_dict(dict_dir) if dict_dir is not None else None
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data)
+    return compressor.compress(data)
+
+
+def decompress(data: bytes, codec: str, dict_dir: Optional[Path] = None) -> bytes:
+    if codec == GZIP:
+        return gzip.decompress(data)
+    if not zstd_available():
+        raise ArtifactError("Reading .zst artifacts requires 'pip install zstandard'.")
+    dict_id = zstandard.get_frame_parameters(data).dict_id
+    dict_data = None
+    if dict_id:
+        if dict_dir is None:
+            raise ArtifactError(f"zstd dictionary {dict_id} required but no directory given")
+        dict_data = _dict_for_id(dict_dir, dict_id)
+    return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+
+
+def train_dictionary(
+    samples: Iterable[bytes], dict_dir: Path, *, dict_size: int = 112_640
+) -> int:
+    """Train a zstd dictionary, store it in ``dict_dir`` and make it active.
+
+    Returns the dictionary id embedded in frames compressed with it.
+    """
+    if not zstd_available():
+        raise ArtifactError("Dictionary training requires 'pip install zstandard'.")
+    sample_list = [bytes(s) for s in samples]
+    if not sample_list:
+        raise ArtifactError("No samples provided for dictionary training.")
+    trained = zstandard.train_dictionary(dict_size, sample_list)
+    dict_id = trained.dict_id()
+    dict_dir.mkdir(parents=True, exist_ok=True)
+    (dict_dir / f"{dict_id}.dict").write_bytes(trained.as_bytes())
+    (dict_dir / _ACTIVE_DICT_FILE).write_text(str(dict_id))
+    return dict_id
+
+
+__all__ = [
+    "COMPRESSIBLE_EXTENSIONS",
+    "choose_codec",
+    "codec_for_path",
+    "compress",
+    "decompress",
+    "default_mode",
+    "sniff_codec",
+    "train_dictionary",
+    "zstd_available",
+]
@@ -0,0 +1,268 @@
+"""Multi-turn conversations with client-side context management.
+
+:class:`Conversation` keeps the full transcript and sends the provider a
+window of it that fits a token budget.  When the window would overflow,
+the oldest turns are folded into a running summary (or dropped) in one
+step, down to :data:`COMPACT_TARGET` of the budget.  Between compactions
+the request only grows at the end, so the prefix (system prompt, summary,
+earlier turns) is byte-identical from turn to turn and provider prompt
+caches keep hitting; a sliding window that dropped one turn per request
+would change the prefix every time.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+from .helpers import estimate_tokens
+from .llm import async_get_chat_completion, get_chat_completion
+from .logging import get_logger
+from .models import RECOMMENDED_MODELS
+
+logger = get_logger()
+
+# After compaction the window uses at most this share of the budget, leaving
+# room for many turns before the prefix changes again.
+COMPACT_TARGET = 0.5
+DEFAULT_HISTORY_TOKENS = 8_192
+# Output tokens reserved out of the context window when no budget is given.
+DEFAULT_RESERVED_OUTPUT_TOKENS = 8_192
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+_SUMMARY_INSTRUCTIONS = (
+    "Summarize the conversation below for your own later reference. Keep "
+    "facts, decisions, names, numbers and open questions; drop pleasantries. "
+    "Reply with the summary only."
+)
+
+Message = Dict[str, str]
+
+
+def _default_budget(model_name: str) -> int:
+    if model_name not in RECOMMENDED_MODELS:
+        return DEFAULT_HISTORY_TOKENS
+    spec = RECOMMENDED_MODELS.spec(model_name)
+    if not isinstance(spec.context_window_tokens, int) or spec.context_window_tokens <= 0:
+        return DEFAULT_HISTORY_TOKENS
+    output = spec.output_tokens if isinstance(spec.output_tokens, int) else 0
+    reserved = min(max(output, 0), DEFAULT_RESERVED_OUTPUT_TOKENS)
+    return max(spec.context_window_tokens - reserved, 1)
+
+
+class Conversation:
+    """Chat session that manages its own history.
+
+    Parameters
+    ----------
+    client, model_name, api_provider:
+        As returned by :func:`utils.setup_llm_client`.
+    system:
+        Optional system prompt, always sent first.
+    max_history_tokens:
+        Token budget for the messages sent with each request.  Defaults to
+        the model's context window minus reserved output tokens.
+    summarize:
+        Fold trimmed turns into a summary written by the same model
+        (default) instead of dropping them.
+    temperature:
+        Sampling temperature for replies.
+    token_counter:
+        Function estimating the tokens of a string, e.g. backed by
+        ``tiktoken``; defaults to :func:`utils.helpers.estimate_tokens`.
+
+    Example
+    -------
+    >>> chat = Conversation(*setup_llm_client("gpt-4o-mini"), system="Be brief.")
+    >>> chat.send("Design a real-time chat backend.")
+    >>> chat.send("How would you scale the presence service?")
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        model_name: str,
+        api_provider: str,
+        *,
+        system: Optional[str] = None,
+        max_history_tokens: Optional[int] = None,
+        summarize: bool = True,
+        temperature: float = 0.7,
+        token_counter: Callable[[str], int] = estimate_tokens,
+    ) -> None:
+        self.client = client
+        self.model_name = model_name
+        self.api_provider = api_provider
+        self.system = system
+        self.max_history_tokens = max_history_tokens or _default_budget(model_name)
+        self.summarize = summarize
+        self.temperature = temperature
+        self.token_counter = token_counter
+        self.history: List[Message] = []  # full transcript, never trimmed
+        self.summary: Optional[str] = None
+        self._start = 0  # first history index inside the window
+        self._token_counts: List[int] = []  # per history message, counted once
+        self._window_tokens = 0
+
+    # -- history -------------------------------------------------------------
+    def _count(self, text: str) -> int:
+        return self.token_counter(text) + MESSAGE_OVERHEAD_TOKENS
+
+    def _prefix_messages(self) -> List[Message]:
+        prefix = []
+        if self.system:
+            prefix.append({"role": "system", "content": self.system})
+        if self.summary:
+            prefix.append({"role": "system", "content": _SUMMARY_PREFIX + self.summary})
+        return prefix
+
+    def add_message(self, role: str, content: str) -> None:
+        """Append a message without calling the model (e.g. restored history)."""
+        if role not in ("user", "assistant"):
+            raise ValueError(f"Unsupported role '{role}'; use 'user' or 'assistant'.")
+        self.history.append({"role": role, "content": content})
+        tokens = self._count(content)
+        self._token_counts.append(tokens)
+        self._window_tokens += tokens
+
+    @property
+    def messages(self) -> List[Message]:
+        """The messages the next request sends: system, summary, window."""
+        return self._prefix_messages() + self.history[self._start:]
+
+    def context_tokens(self) -> int:
+        """Estimated tokens of :attr:`messages`."""
+        return self._window_tokens + sum(
+            self._count(m["content"]) for m in self._prefix_messages()
+        )
+
+    def reset(self) -> None:
+        """Forget the transcript and summary; the system prompt is kept."""
+        self.history.clear()
+        self._token_counts.clear()
+        self.summary = None
+        self._start = 0
+        self._window_tokens = 0
+
+    # -- compaction ----------------------------------------------------------
+    def _plan_compaction(self) -> Optional[int]:
+        """Return the new window start if the window exceeds the budget."""
+        if self.context_tokens() <= self.max_history_tokens:
+            return None
+        target = self.max_history_tokens * COMPACT_TARGET
+        tokens = self.context_tokens()
+        start = self._start
+        last = len(self.history) - 1  # the pending user message always stays
+        while start < last and tokens > target:
+            tokens -= self._token_counts[start]
+            start += 1
+        # Keep turns whole: the window must open with a user message.
+        while start < last and self.history[start]["role"] != "user":
+            start += 1
+        return start if start > self._start else None
+
+    def _summary_request(self, folded: List[Message]) -> List[Message]:
+        transcript = "\n\n".join(f"{m['role'].upper()}: {m['content']}" for m in folded)
+        if self.summary:
+            transcript = f"EARLIER SUMMARY: {self.summary}\n\n{transcript}"
+        return [{"role": "user", "content": f"{_SUMMARY_INSTRUCTIONS}\n\n{transcript}"}]
+
+    def _apply_compaction(self, start: int, summary: Optional[str]) -> None:
+        logger.info(
+            "Compacted conversation: %d messages folded",
+            start - self._start,
+            extra={"provider": self.api_provider, "model": self.model_name},
+        )
+        self._window_tokens -= sum(self._token_counts[self._start:start])
+        self._start = start
+        if summary is not None:
+            self.summary = summary.strip()
+
+    def compact(self) -> bool:
+        """Fold old turns if over budget; returns whether anything changed."""
+        start = self._plan_compaction()
+        if start is None:
+            return False
+        summary = None
+        if self.summarize:
+            summary = get_chat_completion(
+                self._summary_request(self.history[self._start:start]),
+                self.client,
+                self.model_name,
+                self.api_provider,
+                temperature=0.0,
+            )
+        self._apply_compaction(start, summary)
+        return True
+
+    async def async_compact(self) -> bool:
+        """Asynchronous :meth:`compact`."""
+        start = self._plan_compaction()
+        if start is None:
+            return False
+        summary = None
+        if self.summarize:
+            summary = await async_get_chat_completion(
+                self._summary_request(self.history[self._start:start]),
+                self.client,
+                self.model_name,
+                self.api_provider,
+                temperature=0.0,
+            )
+        self._apply_compaction(start, summary)
+        return True
+
+    # -- turns ---------------------------------------------------------------
+    def _rollback(self) -> None:
+        self.history.pop()
+        self._window_tokens -= self._token_counts.pop()
+
+    def send(self, content: str) -> str:
+        """Send a user message and return (and record) the assistant reply.
+
+        Raises
+        ------
+        ProviderOperationError
+            If the provider call fails; the user message is not kept.
+        """
+        self.add_message("user", content)
+        try:
+            self.compact()
+            reply = get_chat_completion(
+                self.messages,
+                self.client,
+                self.model_name,
+                self.api_provider,
+                self.temperature,
+            )
+        except Exception:
+            self._rollback()
+            raise
+        self.add_message("assistant", reply)
+        return reply
+
+    async def async_send(self, content: str) -> str:
+        """Asynchronous :meth:`send`."""
+        self.add_message("user", content)
+        try:
+            await self.async_compact()
+            reply = await async_get_chat_completion(
+                self.messages,
+                self.client,
+                self.model_name,
+                self.api_provider,
+                self.temperature,
+            )
+        except Exception:
+            self._rollback()
+            raise
+        self.add_message("assistant", reply)
+        return reply
+
+    def __repr__(self) -> str:
+        return (
+            f"Conversation(model={self.model_name!r}, messages={len(self.history)}, "
+            f"window_tokens={self.context_tokens()}/{self.max_history_tokens})"
+        )
+
+
+__all__ = ["Conversation"]
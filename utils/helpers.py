@@ -27,4 +27,9 @@ def normalize_prompt(prompt: str) -> str:
     return prompt.strip()
 
 
-__all__ = ["ensure_provider", "normalize_prompt"]
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for budgeting and stats."""
+    return max(1, round(len(text) / 4)) if text else 0
+
+
+__all__ = ["ensure_provider", "normalize_prompt", "estimate_tokens"]
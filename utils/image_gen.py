@@ -1,61 +1,257 @@
 from __future__ import annotations
 
 import asyncio
-import base64
+import hashlib
 import mimetypes
+import os
+import re
+import secrets
+import string
+import threading
 import time
-from typing import Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
-from .artifacts import save_artifact
+from .artifact_index import hash_file
+from .artifacts import (
+    _run_io,
+    async_save_artifact,
+    get_artifacts_dir,
+    resolve_artifact_path,
+    save_artifact,
+    save_artifacts,
+)
+from .cache import ArtifactCache
 from .errors import ProviderOperationError
 from .helpers import ensure_provider
-from .logging import get_logger
+from .images import ImageData, SavedImage
+from .logging import get_logger, log_context
 
 logger = get_logger()
 
+# Fields: {ulid} {timestamp} (ms) {hash} (content sha256 prefix) {index}
+# {prompt_slug} {ext}.  ``{ext}`` is appended when the template omits it.
+DEFAULT_IMAGE_NAME_TEMPLATE = os.getenv("AGA_IMAGE_NAME_TEMPLATE", "image_{ulid}{ext}")
+IMAGE_NAME_FIELDS = ("ulid", "timestamp", "hash", "index", "prompt_slug", "ext")
 
-def _save_image(image_data_base64: str, image_mime: str) -> Tuple[str, str]:
-    ext = mimetypes.guess_extension(image_mime) or ".png"
-    filename = f"image_{int(time.time())}{ext}"
+# Opt-in cache of generated images keyed by provider, model, prompt and
+# edit inputs.  Entries point at the saved artifacts; eviction only forgets.
+IMAGE_CACHE = ArtifactCache(
+    "images",
+    ttl_seconds=float(os.getenv("AGA_IMAGE_CACHE_TTL", str(7 * 24 * 3600))),
+    max_entries=int(os.getenv("AGA_IMAGE_CACHE_MAX_ENTRIES", "1000")),
+    owns_files=False,
+)
+
+_CROCKFORD32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ULID_LOCK = threading.Lock()
+_ULID_LAST: Tuple[int, int] = (0, 0)
+
+
+def _ulid() -> str:
+    """Return a monotonic ULID: 48-bit ms timestamp + 80 random bits.
+
+    ULIDs sort by creation time, and IDs minted in the same millisecond
+    increment the random part, so names never collide within the process.
+    """
+    global _ULID_LAST
+    with _ULID_LOCK:
+        ms = time.time_ns() // 1_000_000
+        last_ms, last_rand = _ULID_LAST
+        if ms <= last_ms:
+            ms, rand = last_ms, (last_rand + 1) & ((1 << 80) - 1)
+        else:
+            rand = secrets.randbits(80)
+        _ULID_LAST = (ms, rand)
+    value = (ms << 80) | rand
+    return "".join(_CROCKFORD32[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+
+def _prompt_slug(prompt: str, max_len: int = 40) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", prompt.lower()).strip("-")
+    return slug[:max_len].rstrip("-") or "image"
+
+
+@lru_cache(maxsize=64)
+def _name_template(name_template: Optional[str]) -> str:
+    """Return the effective name template, validated once per template.
+
+    Raises
+    ------
+    ValueError
+        If the template is malformed or uses a field outside
+        :data:`IMAGE_NAME_FIELDS`.
+    """
+    template = name_template or DEFAULT_IMAGE_NAME_TEMPLATE
+    try:
+        fields = {
+            re.match(r"[^.\[]*", field).group()
+            for _, field, _, _ in string.Formatter().parse(template)
+            if field is not None
+        }
+    except ValueError as e:
+        raise ValueError(f"Invalid image name template {template!r}: {e}") from None
+    unknown = fields - set(IMAGE_NAME_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s) {', '.join(sorted(repr(f) for f in unknown))} in image "
+            f"name template {template!r}; allowed fields: "
+            + ", ".join("{%s}" % f for f in IMAGE_NAME_FIELDS)
+        )
+    return template if "{ext}" in template else template + "{ext}"
+
+
+def _image_filename(
+    image: ImageData, name_template: Optional[str], prompt: str = "", index: int = 0
+) -> Tuple[str, bool]:
+    """Render the artifact name; return it and whether overwriting is safe."""
+    template = _name_template(name_template)
+    ext = mimetypes.guess_extension(image.mime_type) or ".png"
+    fields = {
+        "ext": ext,
+        "index": index,
+        "prompt_slug": _prompt_slug(prompt),
+        "timestamp": time.time_ns() // 1_000_000,
+    }
+    if "{ulid}" in template:
+        fields["ulid"] = _ulid()
+    if "{hash}" in template:
+        fields["hash"] = hashlib.sha256(image.data).hexdigest()[:16]
+    # A content-addressed name that already exists holds the same bytes.
+    content_addressed = "{hash}" in template and "{ulid}" not in template
+    return template.format(**fields), content_addressed
+
+
+def _save_image(
+    result: Any, name_template: Optional[str] = None, prompt: str = ""
+) -> SavedImage:
+    image = ImageData.coerce(result)
+    filename, overwrite = _image_filename(image, name_template, prompt)
     file_path = save_artifact(
-        base64.b64decode(image_data_base64), filename, subdir="screens"
+        image.data, filename, subdir="screens", overwrite=overwrite
     )
-    image_url = f"data:{image_mime};base64,{image_data_base64}"
-    return str(file_path), image_url
+    return SavedImage(str(file_path), image)
+
+
+async def _async_save_image(
+    result: Any, name_template: Optional[str] = None, prompt: str = ""
+) -> SavedImage:
+    image = ImageData.coerce(result)
+    # Decoding base64 payloads (OpenAI) is CPU work; keep it off the loop too.
+    image_bytes = await _run_io(getattr, image, "data")
+    filename, overwrite = _image_filename(image, name_template, prompt)
+    file_path = await async_save_artifact(
+        image_bytes, filename, subdir="screens", overwrite=overwrite
+    )
+    return SavedImage(str(file_path), image)
+
+
+def _cache_enabled(cache: Optional[bool]) -> bool:
+    if cache is not None:
+        return cache
+    return os.getenv("AGA_IMAGE_CACHE", "0").lower() in {"1", "true", "yes", "on"}
+
+
+def _image_cache_key(
+    operation: str,
+    api_provider: str,
+    model_name: str,
+    prompt: str,
+    edit_params: Optional[dict] = None,
+    image_path: Optional[str] = None,
+) -> str:
+    source_hash = hash_file(Path(image_path)) if image_path else None
+    return IMAGE_CACHE.make_key(
+        operation, api_provider, model_name, prompt, edit_params or {}, source_hash
+    )
+
+
+def _cached_image(key: str) -> Optional[SavedImage]:
+    value = IMAGE_CACHE.get(key)
+    if value is None:
+        return None
+    path = str(resolve_artifact_path(value["path"]))
+    logger.info("Image cache hit.", extra={"artifacts_path": path})
+    return SavedImage(path, ImageData.from_path(path, value["mime_type"]))
+
+
+def _remember_image(key: str, saved: SavedImage) -> SavedImage:
+    rel = Path(saved.path).relative_to(get_artifacts_dir()).as_posix()
+    IMAGE_CACHE.put(key, {"path": rel, "mime_type": saved.mime_type}, files=[rel])
+    return saved
 
 
 def get_image_generation_completion(
-    prompt: str, client: Any, model_name: str, api_provider: str
-) -> Tuple[str, str]:
+    prompt: str,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    *,
+    name_template: Optional[str] = None,
+    cache: Optional[bool] = None,
+    refresh: bool = False,
+) -> SavedImage:
+    """Generate an image for ``prompt`` and save it under ``screens/``.
+
+    With ``cache=True`` (or ``AGA_IMAGE_CACHE=1``) an identical earlier
+    request returns the previously saved artifact instead of calling the
+    provider; ``refresh=True`` forces a fresh sample and updates the cache.
+    """
+    name_template = _name_template(name_template)
     provider_module = ensure_provider(
         client, api_provider, model_name, "image generation"
     )
-    image_data_base64, image_mime = provider_module.image_generation(
-        client, prompt, model_name
-    )
-    return _save_image(image_data_base64, image_mime)
+    key = None
+    if _cache_enabled(cache):
+        key = _image_cache_key("generate", api_provider, model_name, prompt)
+        cached = None if refresh else _cached_image(key)
+        if cached is not None:
+            return cached
+    with log_context(provider=api_provider, model=model_name):
+        result = provider_module.image_generation(client, prompt, model_name)
+        saved = _save_image(result, name_template, prompt)
+    return _remember_image(key, saved) if key else saved
 
 
 async def async_get_image_generation_completion(
-    prompt: str, client: Any, model_name: str, api_provider: str
-) -> Tuple[str, str]:
+    prompt: str,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    *,
+    name_template: Optional[str] = None,
+    cache: Optional[bool] = None,
+    refresh: bool = False,
+) -> SavedImage:
+    """Asynchronous :func:`get_image_generation_completion`."""
+    name_template = _name_template(name_template)
     provider_module = ensure_provider(
         client, api_provider, model_name, "image generation"
     )
-    if hasattr(provider_module, "async_image_generation"):
-        image_data_base64, image_mime = await provider_module.async_image_generation(
-            client, prompt, model_name
-        )
-    else:
-        image_data_base64, image_mime = await asyncio.to_thread(
-            provider_module.image_generation, client, prompt, model_name
-        )
-    return _save_image(image_data_base64, image_mime)
+    key = None
+    if _cache_enabled(cache):
+        key = _image_cache_key("generate", api_provider, model_name, prompt)
+        cached = None if refresh else await _run_io(_cached_image, key)
+        if cached is not None:
+            return cached
+    with log_context(provider=api_provider, model=model_name):
+        if hasattr(provider_module, "async_image_generation"):
+            result = await provider_module.async_image_generation(
+                client, prompt, model_name
+            )
+        else:
+            result = await asyncio.to_thread(
+                provider_module.image_generation, client, prompt, model_name
+            )
+        saved = await _async_save_image(result, name_template, prompt)
+    return await _run_io(_remember_image, key, saved) if key else saved
 
 
 def get_image_generation_completion_compat(
     prompt: str, client: Any, model_name: str, api_provider: str
-) -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+) -> Tuple[Optional[SavedImage], Optional[str]]:
     try:
         return (
             get_image_generation_completion(prompt, client, model_name, api_provider),
@@ -67,7 +263,7 @@ def get_image_generation_completion_compat(
 
 async def async_get_image_generation_completion_compat(
     prompt: str, client: Any, model_name: str, api_provider: str
-) -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+) -> Tuple[Optional[SavedImage], Optional[str]]:
     try:
         return (
             await async_get_image_generation_completion(
@@ -79,19 +275,192 @@ async def async_get_image_generation_completion_compat(
         return None, str(e)
 
 
+def _batch_jobs(
+    provider_module: Any,
+    prompt_or_prompts: Union[str, Sequence[str]],
+    model_name: str,
+    n: int,
+) -> List[Tuple[str, int]]:
+    """Split a batch into ``(prompt, count)`` requests.
+
+    Providers exposing ``image_generation_batch`` get up to their native ``n``
+    per request; everything else is one image per request.
+    """
+    prompts = (
+        [prompt_or_prompts]
+        if isinstance(prompt_or_prompts, str)
+        else list(prompt_or_prompts)
+    )
+    per_request = 1
+    if hasattr(provider_module, "image_generation_batch"):
+        limit = getattr(provider_module, "max_images_per_request", None)
+        per_request = max(1, limit(model_name)) if limit else n
+    jobs = []
+    for prompt in prompts:
+        remaining = n
+        while remaining > 0:
+            count = min(per_request, remaining)
+            jobs.append((prompt, count))
+            remaining -= count
+    return jobs
+
+
+def _generate_job(
+    provider_module: Any, client: Any, prompt: str, model_name: str, count: int
+) -> List[ImageData]:
+    if count == 1:
+        return [ImageData.coerce(provider_module.image_generation(client, prompt, model_name))]
+    results = provider_module.image_generation_batch(client, prompt, model_name, count)
+    return [ImageData.coerce(r) for r in results]
+
+
+async def _async_generate_job(
+    provider_module: Any, client: Any, prompt: str, model_name: str, count: int
+) -> List[ImageData]:
+    if count > 1 and hasattr(provider_module, "async_image_generation_batch"):
+        results = await provider_module.async_image_generation_batch(
+            client, prompt, model_name, count
+        )
+        return [ImageData.coerce(r) for r in results]
+    if count == 1 and hasattr(provider_module, "async_image_generation"):
+        return [
+            ImageData.coerce(
+                await provider_module.async_image_generation(client, prompt, model_name)
+            )
+        ]
+    return await asyncio.to_thread(
+        _generate_job, provider_module, client, prompt, model_name, count
+    )
+
+
+def _save_images(
+    entries: List[Tuple[str, ImageData]], name_template: Optional[str] = None
+) -> List[SavedImage]:
+    items = []
+    overwrite = False
+    for i, (prompt, image) in enumerate(entries):
+        filename, overwrite = _image_filename(image, name_template, prompt, i)
+        items.append((image.data, filename))
+    paths = save_artifacts(items, subdir="screens", overwrite=overwrite)
+    return [SavedImage(str(path), image) for path, (_, image) in zip(paths, entries)]
+
+
+def get_image_generation_batch(
+    prompt_or_prompts: Union[str, Sequence[str]],
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    n: int = 1,
+    *,
+    max_concurrency: int = 4,
+    name_template: Optional[str] = None,
+) -> List[SavedImage]:
+    """Generate ``n`` variants for one or more prompts and save them together.
+
+    Uses the provider's native ``n`` where available (OpenAI, except
+    ``dall-e-3``) and otherwise issues up to ``max_concurrency`` requests in
+    parallel.  Results are ordered by prompt, then variant, and written with
+    one bulk :func:`~utils.artifacts.save_artifacts` call.  ``name_template``
+    may use ``{index}`` and ``{prompt_slug}`` besides the usual fields.
+
+    Example
+    -------
+    >>> images = get_image_generation_batch(
+    ...     ["a waffle", "a pancake"], client, model, provider, n=2
+    ... )
+    >>> [img.path for img in images]
+    """
+    name_template = _name_template(name_template)
+    provider_module = ensure_provider(
+        client, api_provider, model_name, "image generation"
+    )
+    jobs = _batch_jobs(provider_module, prompt_or_prompts, model_name, n)
+    with log_context(provider=api_provider, model=model_name):
+        workers = max(1, min(max_concurrency, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            batches = list(
+                pool.map(
+                    lambda job: _generate_job(
+                        provider_module, client, job[0], model_name, job[1]
+                    ),
+                    jobs,
+                )
+            )
+        entries = [
+            (prompt, image)
+            for (prompt, _), batch in zip(jobs, batches)
+            for image in batch
+        ]
+        return _save_images(entries, name_template)
+
+
+async def async_get_image_generation_batch(
+    prompt_or_prompts: Union[str, Sequence[str]],
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    n: int = 1,
+    *,
+    max_concurrency: int = 4,
+    name_template: Optional[str] = None,
+) -> List[SavedImage]:
+    """Asynchronous :func:`get_image_generation_batch`."""
+    name_template = _name_template(name_template)
+    provider_module = ensure_provider(
+        client, api_provider, model_name, "image generation"
+    )
+    jobs = _batch_jobs(provider_module, prompt_or_prompts, model_name, n)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(prompt: str, count: int) -> List[ImageData]:
+        async with semaphore:
+            return await _async_generate_job(
+                provider_module, client, prompt, model_name, count
+            )
+
+    with log_context(provider=api_provider, model=model_name):
+        batches = await asyncio.gather(*(run(prompt, count) for prompt, count in jobs))
+        entries = [
+            (prompt, image)
+            for (prompt, _), batch in zip(jobs, batches)
+            for image in batch
+        ]
+        return await _run_io(_save_images, entries, name_template)
+
+
 def get_image_edit_completion(
     prompt: str,
     image_path: str,
     client: Any,
     model_name: str,
     api_provider: str,
+    *,
+    name_template: Optional[str] = None,
+    cache: Optional[bool] = None,
+    refresh: bool = False,
     **edit_params: Any,
-) -> Tuple[str, str]:
+) -> SavedImage:
+    """Edit ``image_path`` according to ``prompt`` and save the result.
+
+    Caching works as in :func:`get_image_generation_completion`; the key also
+    covers ``edit_params`` and the SHA-256 of the source image.
+    """
+    name_template = _name_template(name_template)
     provider_module = ensure_provider(client, api_provider, model_name, "image edit")
-    image_data_base64, image_mime = provider_module.image_edit(
-        client, prompt, image_path, model_name, **edit_params
-    )
-    return _save_image(image_data_base64, image_mime)
+    key = None
+    if _cache_enabled(cache):
+        key = _image_cache_key(
+            "edit", api_provider, model_name, prompt, edit_params, image_path
+        )
+        cached = None if refresh else _cached_image(key)
+        if cached is not None:
+            return cached
+    with log_context(provider=api_provider, model=model_name):
+        result = provider_module.image_edit(
+            client, prompt, image_path, model_name, **edit_params
+        )
+        saved = _save_image(result, name_template, prompt)
+    return _remember_image(key, saved) if key else saved
 
 
 async def async_get_image_edit_completion(
@@ -100,23 +469,45 @@ async def async_get_image_edit_completion(
     client: Any,
     model_name: str,
     api_provider: str,
+    *,
+    name_template: Optional[str] = None,
+    cache: Optional[bool] = None,
+    refresh: bool = False,
     **edit_params: Any,
-) -> Tuple[str, str]:
+) -> SavedImage:
+    """Asynchronous :func:`get_image_edit_completion`."""
+    name_template = _name_template(name_template)
     provider_module = ensure_provider(client, api_provider, model_name, "image edit")
-    if hasattr(provider_module, "async_image_edit"):
-        image_data_base64, image_mime = await provider_module.async_image_edit(
-            client, prompt, image_path, model_name, **edit_params
-        )
-    else:
-        image_data_base64, image_mime = await asyncio.to_thread(
-            provider_module.image_edit,
-            client,
+    key = None
+    if _cache_enabled(cache):
+        key = await _run_io(
+            _image_cache_key,
+            "edit",
+            api_provider,
+            model_name,
             prompt,
+            edit_params,
             image_path,
-            model_name,
-            **edit_params,
         )
-    return _save_image(image_data_base64, image_mime)
+        cached = None if refresh else await _run_io(_cached_image, key)
+        if cached is not None:
+            return cached
+    with log_context(provider=api_provider, model=model_name):
+        if hasattr(provider_module, "async_image_edit"):
+            result = await provider_module.async_image_edit(
+                client, prompt, image_path, model_name, **edit_params
+            )
+        else:
+            result = await asyncio.to_thread(
+                provider_module.image_edit,
+                client,
+                prompt,
+                image_path,
+                model_name,
+                **edit_params,
+            )
+        saved = await _async_save_image(result, name_template, prompt)
+    return await _run_io(_remember_image, key, saved) if key else saved
 
 
 def get_image_edit_completion_compat(
@@ -126,7 +517,7 @@ def get_image_edit_completion_compat(
     model_name: str,
     api_provider: str,
     **edit_params: Any,
-) -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+) -> Tuple[Optional[SavedImage], Optional[str]]:
     try:
         return (
             get_image_edit_completion(
@@ -145,7 +536,7 @@ async def async_get_image_edit_completion_compat(
     model_name: str,
     api_provider: str,
     **edit_params: Any,
-) -> Tuple[Optional[Tuple[str, str]], Optional[str]]:
+) -> Tuple[Optional[SavedImage], Optional[str]]:
     try:
         return (
             await async_get_image_edit_completion(
@@ -158,6 +549,8 @@ async def async_get_image_edit_completion_compat(
 
 
 __all__ = [
+    "get_image_generation_batch",
+    "async_get_image_generation_batch",
     "get_image_generation_completion",
     "get_image_generation_completion_compat",
     "async_get_image_generation_completion",
@@ -0,0 +1,138 @@
+"""Bytes-native image result types.
+
+Providers hand back whichever representation they received (raw bytes from
+Hugging Face and Gemini, base64 from OpenAI) and the other forms are only
+computed when a caller asks for them.  Both types still unpack like the
+tuples they replace: ``b64, mime = ImageData(...)`` and
+``path, data_url = SavedImage(...)``.
+"""
+from __future__ import annotations
+
+import base64 as _base64
+from typing import Any, Iterator, Optional
+
+
+class ImageData:
+    """Image payload holding raw bytes and/or base64, converted lazily."""
+
+    __slots__ = ("mime_type", "_data", "_base64", "_path")
+
+    def __init__(
+        self,
+        data: Optional[bytes] = None,
+        mime_type: str = "image/png",
+        *,
+        base64_data: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> None:
+        if data is None and base64_data is None and path is None:
+            raise ValueError("ImageData requires raw bytes, base64 data or a path.")
+        self.mime_type = mime_type
+        self._data = data
+        self._base64 = base64_data
+        self._path = path
+
+    @classmethod
+    def from_bytes(cls, data: bytes, mime_type: str = "image/png") -> "ImageData":
+        return cls(data, mime_type)
+
+    @classmethod
+    def from_base64(cls, base64_data: str, mime_type: str = "image/png") -> "ImageData":
+        return cls(None, mime_type, base64_data=base64_data)
+
+    @classmethod
+    def from_path(cls, path: str, mime_type: str = "image/png") -> "ImageData":
+        """Reference an image file; its bytes are read on first access."""
+        return cls(None, mime_type, path=path)
+
+    @classmethod
+    def coerce(cls, value: Any) -> "ImageData":
+        """Accept an :class:`ImageData` or a legacy ``(base64, mime)`` tuple."""
+        if isinstance(value, cls):
+            return value
+        base64_data, mime_type = value
+        return cls.from_base64(base64_data, mime_type)
+
+    @property
+    def data(self) -> bytes:
+        """Raw image bytes (decoded from base64 on first access)."""
+        if self._data is None:
+            if self._base64 is not None:
+                self._data = _base64.b64decode(self._base64)
+            else:
+                with open(self._path, "rb") as fh:
+                    self._data = fh.read()
+        return self._data
+
+    @property
+    def base64(self) -> str:
+        """Base64 string (encoded from the raw bytes on first access)."""
+        if self._base64 is None:
+            self._base64 = _base64.b64encode(self.data).decode("ascii")
+        return self._base64
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.base64}"
+
+    def __iter__(self) -> Iterator[str]:
+        yield self.base64
+        yield self.mime_type
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, index: int) -> str:
+        return (self.base64, self.mime_type)[index]
+
+    def __repr__(self) -> str:
+        size = len(self._data) if self._data is not None else None
+        return f"ImageData(mime_type={self.mime_type!r}, bytes={size})"
+
+
+class SavedImage:
+    """A generated image persisted as an artifact.
+
+    ``path`` is available immediately; ``data_url`` is built only on access
+    (including tuple unpacking, which yields ``(path, data_url)``).
+    """
+
+    __slots__ = ("path", "image")
+
+    def __init__(self, path: str, image: ImageData) -> None:
+        self.path = path
+        self.image = image
+
+    @property
+    def mime_type(self) -> str:
+        return self.image.mime_type
+
+    @property
+    def data_url(self) -> str:
+        return self.image.data_url
+
+    def __iter__(self) -> Iterator[str]:
+        yield self.path
+        yield self.data_url
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, index: int) -> str:
+        return (self.path, self.data_url)[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SavedImage):
+            return self.path == other.path
+        if isinstance(other, tuple):
+            return tuple(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def __repr__(self) -> str:
+        return f"SavedImage(path={self.path!r}, mime_type={self.mime_type!r})"
+
+
+__all__ = ["ImageData", "SavedImage"]
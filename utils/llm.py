@@ -2,8 +2,11 @@
 from __future__ import annotations
 
 import asyncio
-import re
-from typing import Any, Optional, Tuple
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
 
 from .errors import ProviderOperationError
 from .helpers import ensure_provider, normalize_prompt
@@ -11,6 +14,12 @@ from .logging import get_logger
 from .models import RECOMMENDED_MODELS
 from .providers import PROVIDERS
 from .settings import load_environment
+from .structured import (
+    extract_code_block,
+    extract_json,
+    schema_instructions,
+    validate_structured,
+)
 
 logger = get_logger()
 
@@ -147,6 +156,259 @@ async def async_get_completion(
     )
 
 
+def stream_completion(
+    prompt: str,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    temperature: float = 0.7,
+) -> Iterator[str]:
+    """Fetch a text completion as an iterator of text deltas.
+
+    Providers without ``stream_text_completion`` are called through
+    ``text_completion`` and yield the whole reply as a single delta.
+
+    Raises
+    ------
+    ProviderOperationError
+        If the provider call fails (possibly while iterating).
+
+    Example
+    -------
+    >>> for delta in stream_completion("Hello", client, model, provider):
+    ...     print(delta, end="", flush=True)
+    """
+    prompt = normalize_prompt(prompt)
+    provider_module = ensure_provider(client, api_provider, model_name, "completion")
+    if hasattr(provider_module, "stream_text_completion"):
+        return provider_module.stream_text_completion(
+            client, prompt, model_name, temperature
+        )
+    return iter(
+        [provider_module.text_completion(client, prompt, model_name, temperature)]
+    )
+
+
+def _flatten_messages(messages: list[dict[str, Any]]) -> str:
+    return "\n\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages)
+
+
+def get_chat_completion(
+    messages: list[dict[str, Any]],
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    temperature: float = 0.7,
+) -> str:
+    """Fetch the next assistant message for a list of chat ``messages``.
+
+    Messages are ``{"role": "system" | "user" | "assistant", "content": str}``
+    dicts.  Providers without ``chat_completion`` receive the conversation
+    flattened into a single prompt.  See :class:`utils.Conversation` for
+    history management.
+
+    Raises
+    ------
+    ProviderOperationError
+        If the provider call fails.
+
+    Example
+    -------
+    >>> get_chat_completion(
+    ...     [{"role": "user", "content": "Hi"}], client, model, provider
+    ... )
+    """
+    provider_module = ensure_provider(client, api_provider, model_name, "chat completion")
+    if hasattr(provider_module, "chat_completion"):
+        return provider_module.chat_completion(client, messages, model_name, temperature)
+    return provider_module.text_completion(
+        client, _flatten_messages(messages), model_name, temperature
+    )
+
+
+async def async_get_chat_completion(
+    messages: list[dict[str, Any]],
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    temperature: float = 0.7,
+) -> str:
+    """Asynchronous :func:`get_chat_completion`.
+
+    Raises
+    ------
+    ProviderOperationError
+        If the provider call fails.
+    """
+    provider_module = ensure_provider(client, api_provider, model_name, "chat completion")
+    if hasattr(provider_module, "async_chat_completion"):
+        return await provider_module.async_chat_completion(
+            client, messages, model_name, temperature
+        )
+    if hasattr(provider_module, "chat_completion"):
+        return await asyncio.to_thread(
+            provider_module.chat_completion, client, messages, model_name, temperature
+        )
+    return await async_get_completion(
+        _flatten_messages(messages), client, model_name, api_provider, temperature
+    )
+
+
+def _repair_prompt(prompt: str, error: Exception) -> str:
+    return (
+        f"{prompt}\n\nYour previous reply did not match the required schema "
+        f"({error}). Reply again with corrected JSON only."
+    )
+
+
+def _structured_call(
+    provider_module: Any, client: Any, prompt: str, model_name: str, schema: Any, temperature: float
+) -> Any:
+    if hasattr(provider_module, "structured_completion"):
+        return provider_module.structured_completion(
+            client, prompt, model_name, schema, temperature
+        )
+    text = provider_module.text_completion(
+        client, prompt + schema_instructions(schema), model_name, temperature
+    )
+    return extract_json(text)
+
+
+async def _async_structured_call(
+    provider_module: Any, client: Any, prompt: str, model_name: str, schema: Any, temperature: float
+) -> Any:
+    if hasattr(provider_module, "async_structured_completion"):
+        return await provider_module.async_structured_completion(
+            client, prompt, model_name, schema, temperature
+        )
+    if hasattr(provider_module, "structured_completion"):
+        return await asyncio.to_thread(
+            provider_module.structured_completion, client, prompt, model_name, schema, temperature
+        )
+    if hasattr(provider_module, "async_text_completion"):
+        text = await provider_module.async_text_completion(
+            client, prompt + schema_instructions(schema), model_name, temperature
+        )
+    else:
+        text = await asyncio.to_thread(
+            provider_module.text_completion,
+            client, prompt + schema_instructions(schema), model_name, temperature,
+        )
+    return extract_json(text)
+
+
+def _validation_failed(
+    api_provider: str, model_name: str, attempts: int, error: Exception
+) -> ProviderOperationError:
+    return ProviderOperationError(
+        api_provider,
+        model_name,
+        "structured completion",
+        f"Output failed validation after {attempts} attempt(s): {error}",
+    )
+
+
+def get_structured_completion(
+    prompt: str,
+    schema: Any,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    temperature: float = 0.7,
+    *,
+    max_retries: int = 2,
+) -> Any:
+    """Fetch a completion constrained to ``schema`` and validate it.
+
+    ``schema`` is a pydantic model class (a validated instance is returned)
+    or a JSON-schema ``dict`` (the parsed JSON is returned, checked with
+    ``jsonschema`` when installed).  The provider's native mode is used:
+    OpenAI ``response_format`` json_schema, Gemini ``response_schema`` and
+    Anthropic forced tool use; other providers get the schema in the prompt.
+    Only invalid output is retried, up to ``max_retries`` times, with the
+    validation error appended to the prompt.
+
+    Raises
+    ------
+    ProviderOperationError
+        If the provider call fails or the output is still invalid after
+        the retries.
+
+    Example
+    -------
+    >>> class Story(BaseModel):
+    ...     title: str
+    ...     points: int
+    >>> story = get_structured_completion(
+    ...     "Write a user story for login", Story, client, model, provider
+    ... )
+    """
+    prompt = normalize_prompt(prompt)
+    provider_module = ensure_provider(
+        client, api_provider, model_name, "structured completion"
+    )
+    attempt_prompt = prompt
+    for attempt in range(1, max_retries + 2):
+        try:
+            data = _structured_call(
+                provider_module, client, attempt_prompt, model_name, schema, temperature
+            )
+            return validate_structured(data, schema)
+        except ValueError as e:
+            error = e
+        logger.warning(
+            "Structured output invalid (attempt %d of %d): %s",
+            attempt,
+            max_retries + 1,
+            error,
+            extra={"provider": api_provider, "model": model_name},
+        )
+        attempt_prompt = _repair_prompt(prompt, error)
+    raise _validation_failed(api_provider, model_name, max_retries + 1, error)
+
+
+async def async_get_structured_completion(
+    prompt: str,
+    schema: Any,
+    client: Any,
+    model_name: str,
+    api_provider: str,
+    temperature: float = 0.7,
+    *,
+    max_retries: int = 2,
+) -> Any:
+    """Asynchronous :func:`get_structured_completion`.
+
+    Raises
+    ------
+    ProviderOperationError
+        If the provider call fails or the output is still invalid after
+        the retries.
+    """
+    prompt = normalize_prompt(prompt)
+    provider_module = ensure_provider(
+        client, api_provider, model_name, "structured completion"
+    )
+    attempt_prompt = prompt
+    for attempt in range(1, max_retries + 2):
+        try:
+            data = await _async_structured_call(
+                provider_module, client, attempt_prompt, model_name, schema, temperature
+            )
+            return validate_structured(data, schema)
+        except ValueError as e:
+            error = e
+        logger.warning(
+            "Structured output invalid (attempt %d of %d): %s",
+            attempt,
+            max_retries + 1,
+            error,
+            extra={"provider": api_provider, "model": model_name},
+        )
+        attempt_prompt = _repair_prompt(prompt, error)
+    raise _validation_failed(api_provider, model_name, max_retries + 1, error)
+
+
 def get_completion_compat(
     prompt: str,
     client: Any,
@@ -380,62 +642,16 @@ async def async_get_image_generation_completion_compat(
 
 
 def clean_llm_output(output_str: str, language: str = "json") -> str:
-    """Cleans markdown code fences from LLM output."""
-    if "```" in output_str:
-        pattern = re.compile(
-            r"```(?:" + re.escape(language) + r")?\s*\n(.*?)\n```",
-            re.DOTALL | re.IGNORECASE,
-        )
-        match = pattern.search(output_str)
-        if match:
-            return match.group(1).strip()
-        parts = output_str.split("```")
-        if len(parts) >= 3:
-            return parts[1].strip()
-        return output_str.strip()
-    return output_str.strip()
-
-
-def prompt_enhancer(
-    user_input: str,
-    model_name: str = "o3",
-    client: Any | None = None,
-    api_provider: str | None = None,
-) -> str:
-    """Enhance a raw user prompt using a meta-prompt optimization system.
-
-    Raises
-    ------
-    ProviderOperationError
-        If prompt enhancement fails.
+    """Cleans markdown code fences from LLM output.
 
-    Example
-    -------
-    >>> client, model, provider = setup_llm_client("o3")
-    >>> prompt_enhancer("write a poem", model, client, provider)
+    See :mod:`utils.structured` for extracting every block or parsing JSON.
     """
-    user_input = normalize_prompt(user_input)
-    if not user_input:
-        prov = api_provider or RECOMMENDED_MODELS.get(model_name, {}).get(
-            "provider", "unknown"
-        )
-        raise ProviderOperationError(
-            prov,
-            model_name,
-            "prompt enhancement",
-            "No user input provided for enhancement.",
-        )
+    return extract_code_block(output_str, language)
 
-    if model_name not in RECOMMENDED_MODELS:
-        prov = api_provider or "unknown"
-        raise ProviderOperationError(
-            prov,
-            model_name,
-            "prompt enhancement",
-            f"Model '{model_name}' not found in RECOMMENDED_MODELS. Original input: {user_input}",
-        )
 
-    optimization_prompt = f"""You are an elite Prompt Optimization Engine. Your design is based on the understanding that prompt engineering is a rigorous technical discipline, essential for maximizing LLM efficacy and reliability. Your function is to analyze raw user inputs and systematically compile them into optimized, high-quality prompts.
+# Built once; the user input is spliced between a fixed prefix and suffix,
+# which also keeps the long prefix identical for provider prompt caches.
+_OPTIMIZATION_TEMPLATE = """You are an elite Prompt Optimization Engine. Your design is based on the understanding that prompt engineering is a rigorous technical discipline, essential for maximizing LLM efficacy and reliability. Your function is to analyze raw user inputs and systematically compile them into optimized, high-quality prompts.
 
 **User Input:**
 <user_input>
@@ -475,55 +691,271 @@ and the core task (e.g., using XML tags such as `<persona>`, `<context>`,
 
 ### Output
 Generate only the final, optimized prompt."""
+_OPTIMIZATION_PREFIX, _OPTIMIZATION_SUFFIX = _OPTIMIZATION_TEMPLATE.split("{user_input}")
+_ENHANCER_TEMPERATURE = 0.3
+
+PROMPT_ENHANCER_CACHE_SIZE = int(os.getenv("AGA_PROMPT_ENHANCER_CACHE_SIZE", "1024"))
+_ENHANCED: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+_ENHANCED_LOCK = threading.Lock()
+_CLIENT_POOL: dict[str, Tuple[Any, str, str]] = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+# Async SDK clients hold connections bound to the loop that created them.
+_ASYNC_CLIENT_POOLS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Tuple[Any, str, str]]]" = weakref.WeakKeyDictionary()
+
+
+def _optimization_prompt(user_input: str) -> str:
+    return _OPTIMIZATION_PREFIX + user_input + _OPTIMIZATION_SUFFIX
+
+
+def _enhancer_key(
+    user_input: str, model_name: str, client: Any, api_provider: Optional[str]
+) -> Tuple[str, str, str]:
+    # The provider that will serve the request: the caller's, or the one the
+    # pooled client is set up for.
+    if client and api_provider:
+        provider = api_provider
+    else:
+        provider = RECOMMENDED_MODELS.get(model_name, {}).get("provider") or ""
+    return (user_input, model_name, provider)
+
+
+def _remembered(key: Tuple[str, str, str]) -> Optional[str]:
+    with _ENHANCED_LOCK:
+        value = _ENHANCED.get(key)
+        if value is not None:
+            _ENHANCED.move_to_end(key)
+        return value
+
+
+def _remember(key: Tuple[str, str, str], value: str) -> str:
+    with _ENHANCED_LOCK:
+        _ENHANCED[key] = value
+        _ENHANCED.move_to_end(key)
+        while len(_ENHANCED) > PROMPT_ENHANCER_CACHE_SIZE:
+            _ENHANCED.popitem(last=False)
+    return value
+
+
+def clear_prompt_enhancer_cache() -> None:
+    """Forget memoized enhancements and pooled enhancer clients."""
+    with _ENHANCED_LOCK:
+        _ENHANCED.clear()
+    with _CLIENT_POOL_LOCK:
+        _CLIENT_POOL.clear()
+    _ASYNC_CLIENT_POOLS.clear()
+
+
+def _client_setup_failed(provider: Optional[str], model_name: str, user_input: str) -> ProviderOperationError:
+    return ProviderOperationError(
+        provider or "unknown",
+        model_name,
+        "prompt enhancement",
+        (
+            f"Failed to initialize LLM client for model '{model_name}'. "
+            f"Original input: {user_input}"
+        ),
+    )
+
+
+def _pooled_client(model_name: str, user_input: str) -> Tuple[Any, str, str]:
+    with _CLIENT_POOL_LOCK:
+        pooled = _CLIENT_POOL.get(model_name)
+    if pooled is None:
+        # Set up outside the lock so a slow provider does not block the
+        # others; if two threads race, the first client stored wins.
+        client, actual_model, provider = setup_llm_client(model_name)
+        if not client or actual_model is None or provider is None:
+            raise _client_setup_failed(provider, model_name, user_input)
+        with _CLIENT_POOL_LOCK:
+            pooled = _CLIENT_POOL.setdefault(model_name, (client, actual_model, provider))
+    return pooled
+
+
+async def _async_pooled_client(model_name: str, user_input: str) -> Tuple[Any, str, str]:
+    pool = _ASYNC_CLIENT_POOLS.setdefault(asyncio.get_running_loop(), {})
+    pooled = pool.get(model_name)
+    if pooled is None:
+        client, actual_model, provider = await async_setup_llm_client(model_name)
+        if not client or actual_model is None or provider is None:
+            raise _client_setup_failed(provider, model_name, user_input)
+        pooled = pool.setdefault(model_name, (client, actual_model, provider))
+    return pooled
+
+
+def _check_enhancer_input(
+    user_input: str, model_name: str, api_provider: Optional[str]
+) -> str:
+    user_input = normalize_prompt(user_input)
+    if not user_input:
+        prov = api_provider or RECOMMENDED_MODELS.get(model_name, {}).get(
+            "provider", "unknown"
+        )
+        raise ProviderOperationError(
+            prov,
+            model_name,
+            "prompt enhancement",
+            "No user input provided for enhancement.",
+        )
+    if model_name not in RECOMMENDED_MODELS:
+        prov = api_provider or "unknown"
+        raise ProviderOperationError(
+            prov,
+            model_name,
+            "prompt enhancement",
+            f"Model '{model_name}' not found in RECOMMENDED_MODELS. Original input: {user_input}",
+        )
+    return user_input
+
+
+def _enhancement_failed(
+    error: Exception, model_name: str, api_provider: Optional[str], user_input: str
+) -> ProviderOperationError:
+    if isinstance(error, ProviderOperationError):
+        return ProviderOperationError(
+            error.provider, error.model, "prompt enhancement", str(error)
+        )
+    return ProviderOperationError(
+        api_provider or "unknown",
+        model_name,
+        "prompt enhancement",
+        f"{error}. Original input: {user_input}",
+    )
+
+
+def prompt_enhancer(
+    user_input: str,
+    model_name: str = "o3",
+    client: Any | None = None,
+    api_provider: str | None = None,
+    *,
+    cache: bool = True,
+) -> str:
+    """Enhance a raw user prompt using a meta-prompt optimization system.
+
+    Results are memoized per ``(user_input, model_name, provider)`` (up to
+    ``AGA_PROMPT_ENHANCER_CACHE_SIZE`` entries); ``cache=False`` always
+    calls the model.  Without ``client``/``api_provider`` a client per model
+    is created once and reused.
+
+    Raises
+    ------
+    ProviderOperationError
+        If prompt enhancement fails.
 
+    Example
+    -------
+    >>> client, model, provider = setup_llm_client("o3")
+    >>> prompt_enhancer("write a poem", model, client, provider)
+    """
+    user_input = _check_enhancer_input(user_input, model_name, api_provider)
+    key = _enhancer_key(user_input, model_name, client, api_provider)
+    if cache:
+        remembered = _remembered(key)
+        if remembered is not None:
+            return remembered
     try:
-        actual_model: str | None
-        provider: str | None
         if client and api_provider:
-            actual_model = model_name
-            provider = api_provider
+            actual_model, provider = model_name, api_provider
         else:
-            client, actual_model, provider = setup_llm_client(model_name)
-            if not client:
-                raise ProviderOperationError(
-                    provider or "unknown",
-                    model_name,
-                    "prompt enhancement",
-                    (
-                        f"Failed to initialize LLM client for model '{model_name}'. "
-                        f"Original input: {user_input}"
-                    ),
-                )
-
-        if actual_model is None or provider is None:
-            raise ProviderOperationError(
-                provider or "unknown",
-                model_name,
-                "prompt enhancement",
-                (
-                    f"LLM client setup returned None for model or provider. "
-                    f"actual_model: {actual_model}, provider: {provider}. "
-                    f"Original input: {user_input}"
-                ),
-            )
+            client, actual_model, provider = _pooled_client(model_name, user_input)
         enhanced_prompt = get_completion(
-            optimization_prompt,
+            _optimization_prompt(user_input),
             client,
             actual_model,
             provider,
-            temperature=0.3,
-        )
-        return enhanced_prompt.strip()
-    except ProviderOperationError as e:
-        raise ProviderOperationError(e.provider, e.model, "prompt enhancement", str(e))
+            temperature=_ENHANCER_TEMPERATURE,
+        ).strip()
     except Exception as e:
-        prov = api_provider or locals().get("provider", "unknown")
-        raise ProviderOperationError(
-            prov,
-            model_name,
-            "prompt enhancement",
-            f"{e}. Original input: {user_input}",
-        )
+        raise _enhancement_failed(e, model_name, api_provider, user_input)
+    return _remember(key, enhanced_prompt) if cache else enhanced_prompt
+
+
+async def async_prompt_enhancer(
+    user_input: str,
+    model_name: str = "o3",
+    client: Any | None = None,
+    api_provider: str | None = None,
+    *,
+    cache: bool = True,
+) -> str:
+    """Asynchronous :func:`prompt_enhancer`; shares its memoized results.
+
+    Raises
+    ------
+    ProviderOperationError
+        If prompt enhancement fails.
+    """
+    user_input = _check_enhancer_input(user_input, model_name, api_provider)
+    key = _enhancer_key(user_input, model_name, client, api_provider)
+    if cache:
+        remembered = _remembered(key)
+        if remembered is not None:
+            return remembered
+    try:
+        if client and api_provider:
+            actual_model, provider = model_name, api_provider
+        else:
+            client, actual_model, provider = await _async_pooled_client(
+                model_name, user_input
+            )
+        enhanced_prompt = (
+            await async_get_completion(
+                _optimization_prompt(user_input),
+                client,
+                actual_model,
+                provider,
+                temperature=_ENHANCER_TEMPERATURE,
+            )
+        ).strip()
+    except Exception as e:
+        raise _enhancement_failed(e, model_name, api_provider, user_input)
+    return _remember(key, enhanced_prompt) if cache else enhanced_prompt
+
+
+async def prompt_enhancer_batch(
+    user_inputs: Sequence[str],
+    model_name: str = "o3",
+    client: Any | None = None,
+    api_provider: str | None = None,
+    *,
+    max_concurrency: int = 8,
+    cache: bool = True,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """Enhance many prompts concurrently, in input order.
+
+    Duplicate inputs are enhanced once, memoized inputs are not sent again
+    and at most ``max_concurrency`` requests are in flight.  With
+    ``return_exceptions=True`` failures are returned in place as
+    :class:`ProviderOperationError` instead of raised.
+
+    Raises
+    ------
+    ProviderOperationError
+        For the first failed input, unless ``return_exceptions`` is set.
+
+    Example
+    -------
+    >>> prompts = await prompt_enhancer_batch(raw_prompts, max_concurrency=16)
+    """
+    gate = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def enhance(text: str) -> str:
+        async with gate:
+            return await async_prompt_enhancer(
+                text, model_name, client, api_provider, cache=cache
+            )
+
+    unique = list(dict.fromkeys(user_inputs))
+    results = await asyncio.gather(
+        *(enhance(text) for text in unique), return_exceptions=True
+    )
+    by_input = dict(zip(unique, results))
+    if not return_exceptions:
+        for text in user_inputs:
+            if isinstance(by_input[text], BaseException):
+                raise by_input[text]
+    return [by_input[text] for text in user_inputs]
 
 
 def prompt_enhancer_compat(
@@ -550,6 +982,11 @@ __all__ = [
     "get_completion_compat",
     "async_get_completion",
     "async_get_completion_compat",
+    "stream_completion",
+    "get_chat_completion",
+    "async_get_chat_completion",
+    "get_structured_completion",
+    "async_get_structured_completion",
     "get_vision_completion",
     "get_vision_completion_compat",
     "async_get_vision_completion",
@@ -560,5 +997,8 @@ __all__ = [
     "async_get_image_generation_completion_compat",
     "clean_llm_output",
     "prompt_enhancer",
+    "async_prompt_enhancer",
+    "prompt_enhancer_batch",
+    "clear_prompt_enhancer_cache",
     "prompt_enhancer_compat",
 ]
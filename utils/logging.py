@@ -1,14 +1,41 @@
 import logging
 import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator
+
+_CONTEXT_FIELDS = ("provider", "model", "latency_ms", "artifacts_path")
+_LOG_CONTEXT: ContextVar[Dict[str, Any]] = ContextVar("utils_log_context", default={})
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[Dict[str, Any]]:
+    """Bind context fields (e.g. ``provider``, ``model``) for the current task.
+
+    Bound values fill in log records that do not pass them via ``extra`` and
+    are available to other helpers through :func:`get_log_context`.
+    """
+    merged = {**_LOG_CONTEXT.get(), **fields}
+    token = _LOG_CONTEXT.set(merged)
+    try:
+        yield merged
+    finally:
+        _LOG_CONTEXT.reset(token)
+
+
+def get_log_context() -> Dict[str, Any]:
+    """Return a copy of the fields bound by :func:`log_context`."""
+    return dict(_LOG_CONTEXT.get())
 
 
 class _ContextFilter(logging.Filter):
     """Ensure log records always have provider, model, latency_ms, artifacts_path."""
 
     def filter(self, record: logging.LogRecord) -> bool:
-        for attr in ("provider", "model", "latency_ms", "artifacts_path"):
+        context = _LOG_CONTEXT.get()
+        for attr in _CONTEXT_FIELDS:
             if not hasattr(record, attr):
-                setattr(record, attr, None)
+                setattr(record, attr, context.get(attr))
         return True
 
 
@@ -36,3 +63,6 @@ def get_logger() -> logging.Logger:
             h.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
         root_logger.setLevel(level)
     return logger
+
+
+__all__ = ["get_logger", "log_context", "get_log_context"]
@@ -1,12 +1,353 @@
 """Model metadata and helper utilities."""
 from __future__ import annotations
 
-from typing import Any, Dict
+import enum
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+
+class Capability(enum.IntFlag):
+    """Model capabilities as bit flags; combine with ``|``."""
+
+    NONE = 0
+    TEXT = enum.auto()
+    VISION = enum.auto()
+    IMAGE_GENERATION = enum.auto()
+    IMAGE_MODIFICATION = enum.auto()
+    AUDIO_TRANSCRIPTION = enum.auto()
+
+    @classmethod
+    def parse(cls, value: Union["Capability", str, Iterable[str], None]) -> "Capability":
+        """Accept a flag, a name (``"vision"``) or an iterable of names."""
+        if value is None:
+            return cls.NONE
+        if isinstance(value, cls):
+            return value
+        names = [value] if isinstance(value, str) else list(value)
+        flags = cls.NONE
+        for name in names:
+            key = _CAPABILITY_ALIASES.get(name.lower(), name.upper())
+            try:
+                flags |= cls[key]
+            except KeyError:
+                raise ValueError(f"Unknown capability '{name}'.") from None
+        return flags
+
+
+# Config key in RECOMMENDED_MODELS -> capability flag.
+_CAPABILITY_KEYS: Tuple[Tuple[str, Capability], ...] = (
+    ("text_generation", Capability.TEXT),
+    ("vision", Capability.VISION),
+    ("image_generation", Capability.IMAGE_GENERATION),
+    ("image_modification", Capability.IMAGE_MODIFICATION),
+    ("audio_transcription", Capability.AUDIO_TRANSCRIPTION),
+)
+_CAPABILITY_ALIASES = {key: flag.name for key, flag in _CAPABILITY_KEYS}
+_ALL_CAPABILITIES = [flag for _, flag in _CAPABILITY_KEYS]
+
+# Offline providers for tests and load simulation.  Their models are left out
+# of queries (and so of tables, ``best`` and benchmark defaults) unless the
+# provider is named explicitly.
+TEST_PROVIDERS = frozenset({"fake"})
+
+# Providers that serve models from user-run endpoints, with the environment
+# variable that configures them.  Their models are likewise left out of
+# default queries until ``base_urls`` or the variable gives them endpoints.
+ENDPOINT_PROVIDERS = {"openai_compatible": "OPENAI_COMPATIBLE_BASE_URLS"}
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """Indexed view of one ``RECOMMENDED_MODELS`` entry.
+
+    ``metrics`` holds runtime measurements attached with
+    :meth:`ModelRegistry.attach_metrics`, e.g. ``latency_ms``,
+    ``ttft_ms``, ``tokens_per_second``, ``input_cost_per_mtok`` and
+    ``output_cost_per_mtok``.
+    """
+
+    name: str
+    provider: str
+    capabilities: Capability
+    context_window_tokens: Optional[int]
+    output_tokens: Optional[int]
+    config: Mapping[str, Any] = field(repr=False, compare=False)
+    metrics: Mapping[str, Any] = field(default_factory=dict, compare=False)
+
+    def supports(self, capabilities: Union[Capability, str, Iterable[str]]) -> bool:
+        wanted = Capability.parse(capabilities)
+        return self.capabilities & wanted == wanted
+
+    def sort_value(self, key: str) -> Any:
+        """Return a metric named ``key`` or, failing that, the attribute."""
+        if key in self.metrics:
+            return self.metrics[key]
+        return getattr(self, key, None)
+
+
+def _first(config: Mapping[str, Any], *keys: str) -> Any:
+    for key in keys:
+        value = config.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _build_spec(name: str, config: Mapping[str, Any], metrics: Mapping[str, Any]) -> ModelSpec:
+    caps = Capability.NONE
+    for key, flag in _CAPABILITY_KEYS:
+        if config.get(key):
+            caps |= flag
+    return ModelSpec(
+        name=name,
+        provider=(config.get("provider") or "").lower(),
+        capabilities=caps,
+        context_window_tokens=_first(config, "context_window_tokens", "context_window"),
+        output_tokens=_first(config, "output_tokens", "max_output_tokens"),
+        config=MappingProxyType(config),
+        metrics=MappingProxyType(dict(metrics)),
+    )
+
+
+class ModelRegistry(dict):
+    """``RECOMMENDED_MODELS`` with precomputed capability and provider indexes.
+
+    It is a plain ``dict`` of model name -> config, so existing lookups and
+    assignments keep working; any assignment or deletion marks the indexes
+    stale and they are rebuilt on the next query.  Call :meth:`invalidate`
+    after mutating a config dict in place.
+
+    Every capability combination (there are 2**5) maps to the sorted tuple of
+    models supporting it, so :meth:`query` filters only the ``k`` candidates
+    for the requested capabilities instead of scanning all models.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._lock = threading.RLock()
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+        self._stale = True
+        self._specs: Dict[str, ModelSpec] = {}
+        self._by_caps: Dict[int, Tuple[str, ...]] = {}
+        self._by_provider: Dict[str, frozenset] = {}
+        self._tables: Dict[Tuple[str, ...], str] = {}
+
+    # -- dict mutation hooks -------------------------------------------------
+    def invalidate(self) -> None:
+        """Mark the indexes stale after in-place config changes."""
+        self._stale = True
+
+    def __setitem__(self, name: str, config: Dict[str, Any]) -> None:
+        super().__setitem__(name, config)
+        self._stale = True
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._stale = True
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._stale = True
+
+    def setdefault(self, name: str, default: Any = None) -> Any:
+        self._stale = True
+        return super().setdefault(name, default)
+
+    def pop(self, name: str, *default: Any) -> Any:
+        self._stale = True
+        return super().pop(name, *default)
+
+    def popitem(self) -> Tuple[str, Any]:
+        self._stale = True
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self._stale = True
+
+    def __ior__(self, other: Any) -> "ModelRegistry":
+        self.update(other)
+        return self
+
+    def __reduce__(self) -> Any:
+        return (type(self), (dict(self),))
+
+    # -- indexes -------------------------------------------------------------
+    def _ensure_index(self) -> None:
+        if not self._stale:
+            return
+        with self._lock:
+            if not self._stale:
+                return
+            specs = {
+                name: _build_spec(name, config, self._metrics.get(name, {}))
+                for name, config in sorted(super().items())
+            }
+            by_caps: Dict[int, List[str]] = {}
+            for mask in range(1 << len(_ALL_CAPABILITIES)):
+                by_caps[mask] = [
+                    name for name, spec in specs.items() if spec.capabilities & mask == mask
+                ]
+            by_provider: Dict[str, set] = {}
+            for name, spec in specs.items():
+                by_provider.setdefault(spec.provider, set()).add(name)
+            self._specs = specs
+            self._by_caps = {mask: tuple(names) for mask, names in by_caps.items()}
+            self._by_provider = {p: frozenset(names) for p, names in by_provider.items()}
+            self._tables.clear()
+            self._stale = False
+
+    def spec(self, model_name: str) -> ModelSpec:
+        """Return the :class:`ModelSpec` for ``model_name`` (``KeyError`` if unknown)."""
+        self._ensure_index()
+        return self._specs[model_name]
+
+    def specs(self) -> List[ModelSpec]:
+        self._ensure_index()
+        return list(self._specs.values())
+
+    def providers(self) -> List[str]:
+        self._ensure_index()
+        return sorted(self._by_provider)
+
+    def attach_metrics(self, model_name: str, **metrics: Any) -> ModelSpec:
+        """Merge runtime metrics (latency, price, throughput) into a model's spec.
+
+        Metrics survive config changes and are usable as ``order_by`` keys
+        in :meth:`query`.
+
+        Raises
+        ------
+        KeyError
+            If ``model_name`` is not registered.
+        """
+        with self._lock:
+            if model_name not in self:
+                raise KeyError(model_name)
+            merged = self._metrics.setdefault(model_name, {})
+            merged.update(metrics)
+            self._ensure_index()
+            spec = self._specs[model_name] = replace(
+                self._specs[model_name], metrics=MappingProxyType(dict(merged))
+            )
+            return spec
+
+    def query(
+        self,
+        capabilities: Union[Capability, str, Iterable[str], None] = None,
+        *,
+        exclude: Union[Capability, str, Iterable[str], None] = None,
+        provider: Optional[str] = None,
+        min_context: Optional[int] = None,
+        min_output_tokens: Optional[int] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[ModelSpec]:
+        """Return model specs supporting ``capabilities``.
+
+        Parameters
+        ----------
+        capabilities:
+            Required capabilities; every match supports all of them.
+        exclude:
+            Capabilities a match must not have.
+        provider:
+            Restrict to one provider.  Models of :data:`TEST_PROVIDERS`,
+            and of :data:`ENDPOINT_PROVIDERS` without configured endpoints,
+            are only returned when their provider is named here.
+        min_context, min_output_tokens:
+            Lower bounds; models with unknown limits are excluded.
+        order_by:
+            Metric or :class:`ModelSpec` attribute to sort by, ascending;
+            prefix with ``-`` for descending.  Models without a value sort
+            last.  Results are ordered by name otherwise.
+        limit:
+            Maximum number of specs to return.
+
+        Example
+        -------
+        >>> fastest = RECOMMENDED_MODELS.query(
+        ...     Capability.TEXT | Capability.VISION,
+        ...     min_context=200_000, order_by="latency_ms", limit=1,
+        ... )
+        """
+        self._ensure_index()
+        wanted = int(Capability.parse(capabilities))
+        excluded = int(Capability.parse(exclude))
+        names: Iterable[str] = self._by_caps.get(wanted, ())
+        if provider is not None:
+            members = self._by_provider.get(provider.lower(), frozenset())
+            names = [name for name in names if name in members]
+        else:
+            names = [n for n in names if self._listed_by_default(n)]
+        results = []
+        for name in names:
+            spec = self._specs[name]
+            if excluded and spec.capabilities & excluded:
+                continue
+            if min_context and not _at_least(spec.context_window_tokens, min_context):
+                continue
+            if min_output_tokens and not _at_least(spec.output_tokens, min_output_tokens):
+                continue
+            results.append(spec)
+        if order_by:
+            key = order_by.lstrip("-")
+            descending = order_by.startswith("-")
+            known = [s for s in results if s.sort_value(key) is not None]
+            unknown = [s for s in results if s.sort_value(key) is None]
+            known.sort(key=lambda s: s.sort_value(key), reverse=descending)
+            results = known + unknown
+        return results[:limit] if limit is not None else results
+
+    def _listed_by_default(self, name: str) -> bool:
+        provider = self._specs[name].provider
+        if provider in TEST_PROVIDERS:
+            return False
+        if provider in ENDPOINT_PROVIDERS:
+            config = dict.get(self, name) or {}
+            return bool(
+                config.get("base_urls")
+                or config.get("base_url")
+                or os.getenv(ENDPOINT_PROVIDERS[provider])
+            )
+        return True
+
+    def markdown_table(self, *args: Any, **kwargs: Any) -> Optional[str]:
+        """Render :meth:`query` results as a markdown table.
+
+        Takes the arguments of :meth:`query`; returns ``None`` when nothing
+        matches.  Tables are cached until the registry changes.
+        """
+        specs = self.query(*args, **kwargs)
+        if not specs:
+            return None
+        key = tuple(spec.name for spec in specs)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is None:
+                table = self._tables[key] = _TABLE_HEADER + "\n".join(
+                    _table_row(spec) for spec in specs
+                )
+        return table
+
+    def best(self, *args: Any, **kwargs: Any) -> Optional[ModelSpec]:
+        """First result of :meth:`query`, or ``None`` when nothing matches."""
+        kwargs["limit"] = 1
+        found = self.query(*args, **kwargs)
+        return found[0] if found else None
+
+
+def _at_least(value: Any, minimum: int) -> bool:
+    if value is None:
+        return False
+    return not isinstance(value, int) or value >= minimum
 
-from .settings import display, Markdown
 
 # --- Model & Provider Configuration ---
-RECOMMENDED_MODELS: Dict[str, Dict[str, Any]] = {
+RECOMMENDED_MODELS: ModelRegistry = ModelRegistry({
     "gpt-5-nano-2025-08-07": {"provider": "openai", "vision": True, "text_generation": True, "image_generation": False, "image_modification": False, "audio_transcription": False, "context_window_tokens": 400_000, "output_tokens": 128_000},
     "gpt-5-mini-2025-08-07": {"provider": "openai", "vision": True, "text_generation": True, "image_generation": False, "image_modification": False, "audio_transcription": False, "context_window_tokens": 400_000, "output_tokens": 128_000},
     "gpt-5-2025-08-07": {"provider": "openai", "vision": True, "text_generation": True, "image_generation": False, "image_modification": False, "audio_transcription": False, "context_window_tokens": 400_000, "output_tokens": 128_000},
@@ -43,9 +384,113 @@ RECOMMENDED_MODELS: Dict[str, Dict[str, Any]] = {
     "Qwen/Qwen-Image-Edit": {"provider": "huggingface", "vision": False, "text_generation": False, "image_generation": False, "image_modification": True, "audio_transcription": False, "context_window_tokens": None, "output_tokens": None},
     "stabilityai/stable-diffusion-3.5-large": {"provider": "huggingface", "vision": False, "text_generation": False, "image_generation": True, "image_modification": False, "audio_transcription": False, "context_window_tokens": None, "output_tokens": None},
     "black-forest-labs/FLUX.1-Kontext-dev": {"provider": "huggingface", "vision": False, "text_generation": False, "image_generation": False, "image_modification": True, "audio_transcription": False, "context_window_tokens": None, "output_tokens": None},
+    "fake-model": {"provider": "fake", "vision": True, "text_generation": True, "image_generation": True, "image_modification": True, "audio_transcription": True, "context_window_tokens": 128_000, "output_tokens": 4_096},
+    # Self-hosted server(s); endpoints from OPENAI_COMPATIBLE_BASE_URLS, served name from OPENAI_COMPATIBLE_MODEL.
+    # Listed by default only once endpoints are configured (see ENDPOINT_PROVIDERS).
+    "local-openai-compatible": {"provider": "openai_compatible", "vision": False, "text_generation": True, "image_generation": False, "image_modification": False, "audio_transcription": False, "context_window_tokens": 32_768, "output_tokens": 4_096},
+})
+
+
+MODEL_METRICS_FILE = "model_metrics.json"
+MODEL_METRICS_SUBDIR = "benchmarks"
+
+
+def save_model_metrics(
+    metrics: Mapping[str, Mapping[str, Any]],
+    *,
+    base_dir: Optional[str] = None,
+) -> Any:
+    """Merge per-model ``metrics`` into ``artifacts/benchmarks/model_metrics.json``.
+
+    Entries for other models already in the file are kept, so benchmarks
+    can be run for a few models at a time.  Returns the artifact path.
+    """
+    from .artifacts import save_artifact
+
+    stored = _read_model_metrics(base_dir)
+    stored.update({name: dict(values) for name, values in metrics.items()})
+    return save_artifact(
+        {"version": 1, "models": stored},
+        MODEL_METRICS_FILE,
+        base_dir=base_dir,
+        subdir=MODEL_METRICS_SUBDIR,
+        overwrite=True,
+    )
+
+
+def _read_model_metrics(base_dir: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    from .artifacts import load_artifact
+    from .errors import ArtifactNotFoundError
+
+    try:
+        data = load_artifact(
+            MODEL_METRICS_FILE, base_dir=base_dir, subdir=MODEL_METRICS_SUBDIR, as_="json"
+        )
+    except ArtifactNotFoundError:
+        return {}
+    return dict(data.get("models", {}))
+
+
+def load_model_metrics(
+    *,
+    base_dir: Optional[str] = None,
+    registry: Optional[ModelRegistry] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Attach saved benchmark metrics to the models in ``registry``.
+
+    Reads the artifact written by :func:`save_model_metrics` (e.g. by
+    ``python -m utils.benchmarks throughput``) and returns the metrics
+    that were attached; a missing file attaches nothing.
+
+    Example
+    -------
+    >>> load_model_metrics()
+    >>> RECOMMENDED_MODELS.best("text", order_by="ttft_ms")
+    """
+    registry = RECOMMENDED_MODELS if registry is None else registry
+    attached = {}
+    for name, metrics in _read_model_metrics(base_dir).items():
+        if name in registry:
+            registry.attach_metrics(name, **metrics)
+            attached[name] = metrics
+    return attached
+
+
+_TASK_CAPABILITIES = {
+    "vision": "vision", "multimodal": "vision", "vl": "vision",
+    "image": "image_generation", "image_generation": "image_generation",
+    "image-generation": "image_generation",
+    "image_modification": "image_modification", "image-edit": "image_modification",
+    "image_edit": "image_modification", "image-editing": "image_modification",
+    "editing": "image_modification",
+    "audio": "audio_transcription", "speech": "audio_transcription",
+    "audio_transcription": "audio_transcription", "stt": "audio_transcription",
 }
 
 
+def _fmt_num(x: Any) -> str:
+    if x is None:
+        return "-"
+    try:
+        return f"{int(x):,}"
+    except Exception:
+        return str(x)
+
+
+_TABLE_HEADER = (
+    "| Model | Provider | Text | Vision | Image Gen | Image Edit | Audio Transcription | Context Window | Max Output Tokens |\n"
+    "|---|---|---|---|---|---|---|---|---|\n"
+)
+
+
+def _table_row(spec: ModelSpec) -> str:
+    marks = ["✅" if spec.capabilities & flag else "❌" for flag in _ALL_CAPABILITIES]
+    return (
+        f"| {spec.name} | {spec.provider or '-'} | {' | '.join(marks)} | "
+        f"{_fmt_num(spec.context_window_tokens)} | {_fmt_num(spec.output_tokens)} |"
+    )
+
+
 def recommended_models_table(task: str | None = None,
                              provider: str | None = None,
                              text_generation: bool | None = None,
@@ -55,83 +500,43 @@ def recommended_models_table(task: str | None = None,
                              min_context: int | None = None,
                              min_output_tokens: int | None = None,
                              image_modification: bool | None = None) -> str:
-    """Return a markdown table of recommended models filtered by capabilities."""
+    """Return a markdown table of recommended models filtered by capabilities.
+
+    Use :meth:`ModelRegistry.query` on ``RECOMMENDED_MODELS`` to select
+    models programmatically; this renders the same filters for display.
+    """
+    flags = {
+        "text_generation": text_generation,
+        "vision": vision,
+        "image_generation": image_generation,
+        "image_modification": image_modification,
+        "audio_transcription": audio_transcription,
+    }
     if task:
         t = task.lower()
-        if t in {"vision", "multimodal", "vl"} and vision is None:
-            vision = True
-        elif t in {"image", "image_generation", "image-generation"} and image_generation is None:
-            image_generation = True
-        elif t in {"image_modification", "image-edit", "image_edit", "image-editing", "editing"} and image_modification is None:
-            image_modification = True
-        elif t in {"audio", "speech", "audio_transcription", "stt"} and audio_transcription is None:
-            audio_transcription = True
+        if t in _TASK_CAPABILITIES and flags[_TASK_CAPABILITIES[t]] is None:
+            flags[_TASK_CAPABILITIES[t]] = True
         elif t == "text" and text_generation is None:
-            text_generation = True
-            vision = False if vision is None else vision
-            image_generation = False if image_generation is None else image_generation
-            image_modification = False if image_modification is None else image_modification
-            audio_transcription = False if audio_transcription is None else audio_transcription
-
-    rows = []
-    for model_name in sorted(RECOMMENDED_MODELS.keys()):
-        cfg = RECOMMENDED_MODELS[model_name]
-        model_provider = (cfg.get("provider") or "").lower()
-        model_text = cfg.get("text_generation", False)
-        model_vision = cfg.get("vision", False)
-        model_image = cfg.get("image_generation", False)
-        model_image_mod = cfg.get("image_modification", False)
-        model_audio = cfg.get("audio_transcription", False)
-
-        context = cfg.get("context_window_tokens")
-        if context is None:
-            context = cfg.get("context_window")
-
-        max_tokens = cfg.get("output_tokens")
-        if max_tokens is None:
-            max_tokens = cfg.get("max_output_tokens")
-
-        if provider and model_provider != provider.lower():
-            continue
-        if text_generation is not None and bool(model_text) != bool(text_generation):
-            continue
-        if vision is not None and bool(model_vision) != bool(vision):
-            continue
-        if image_generation is not None and bool(model_image) != bool(image_generation):
-            continue
-        if image_modification is not None and bool(model_image_mod) != bool(image_modification):
-            continue
-        if audio_transcription is not None and bool(model_audio) != bool(audio_transcription):
-            continue
-        if min_context and (context is None or (isinstance(context, int) and context < min_context)):
-            continue
-        if min_output_tokens and (max_tokens is None or (isinstance(max_tokens, int) and max_tokens < min_output_tokens)):
-            continue
-
-        def _fmt_num(x: Any) -> str:
-            if x is None:
-                return "-"
-            try:
-                return f"{int(x):,}"
-            except Exception:
-                return str(x)
-
-        rows.append(
-            f"| {model_name} | {model_provider or '-'} | {'✅' if model_text else '❌'} | "
-            f"{'✅' if model_vision else '❌'} | {'✅' if model_image else '❌'} | "
-            f"{'✅' if model_image_mod else '❌'} | {'✅' if model_audio else '❌'} | "
-            f"{_fmt_num(context)} | {_fmt_num(max_tokens)} |"
-        )
+            flags = {key: (key == "text_generation") if value is None else value
+                     for key, value in flags.items()}
 
-    if not rows:
+    table = RECOMMENDED_MODELS.markdown_table(
+        [name for name, value in flags.items() if value],
+        exclude=[name for name, value in flags.items() if value is False],
+        provider=provider,
+        min_context=min_context,
+        min_output_tokens=min_output_tokens,
+    )
+    if table is None:
         return "No models match the specified criteria."
+    from . import settings  # IPython is only needed when a table is shown
 
-    header = (
-        "| Model | Provider | Text | Vision | Image Gen | Image Edit | Audio Transcription | Context Window | Max Output Tokens |\n"
-        "|---|---|---|---|---|---|---|---|---|\n"
-    )
-    table = header + "\n".join(rows)
-    display(Markdown(table))
+    settings.display(settings.Markdown(table))
     return table
 
-__all__ = ['RECOMMENDED_MODELS', 'recommended_models_table']
+
+__all__ = [
+    'RECOMMENDED_MODELS', 'recommended_models_table',
+    'Capability', 'ModelRegistry', 'ModelSpec', 'TEST_PROVIDERS', 'ENDPOINT_PROVIDERS',
+    'MODEL_METRICS_FILE', 'save_model_metrics', 'load_model_metrics',
+]
@@ -1,27 +1,270 @@
-"""PlantUML diagram helpers."""
+"""PlantUML diagram helpers.
+
+Diagrams are rendered either by a PlantUML server (``PLANTUML_SERVER_URL``,
+the public server by default) or locally by a persistent ``plantuml.jar``
+process (``PLANTUML_JAR``) that stays up for the lifetime of the
+interpreter.  With the render cache enabled (``AGA_PLANTUML_CACHE=1`` or
+``cache=True``) an unchanged diagram source is never rendered twice by the
+same backend.
+"""
 from __future__ import annotations
 
+import atexit
+import base64
+import hashlib
 import os
+import shutil
+import socket
+import string
+import subprocess
 import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
 
-from .artifacts import resolve_artifact_path
+from .artifacts import load_artifact, resolve_artifact_path, save_artifact
+from .cache import ArtifactCache
 from .errors import ArtifactError
 from .logging import get_logger
-from .settings import PlantUML
 
 logger = get_logger()
 DEFAULT_PLANTUML_SERVER = os.getenv(
     "PLANTUML_SERVER_URL", "https://www.plantuml.com/plantuml/img/"
 )
+# Path to plantuml.jar for local rendering; ``java`` must be on PATH.
+PLANTUML_JAR = os.getenv("PLANTUML_JAR")
+# "auto" renders locally when PLANTUML_JAR is set, "local" or "server" force one.
+DEFAULT_PLANTUML_BACKEND = os.getenv("AGA_PLANTUML_BACKEND", "auto").lower()
+LOCAL_STARTUP_TIMEOUT = float(os.getenv("AGA_PLANTUML_STARTUP_TIMEOUT", "60"))
 
+RENDER_CACHE = ArtifactCache(
+    "plantuml",
+    max_entries=int(os.getenv("AGA_PLANTUML_CACHE_MAX_ENTRIES", "500")),
+)
+
+_FORMATS = {".svg": "svg", ".txt": "txt"}
+# PlantUML's URL encoding is base64 over its own alphabet; its zero-filled
+# final group matches standard padding with "=" mapped to "0".
+_TO_PLANTUML = bytes.maketrans(
+    (string.ascii_uppercase + string.ascii_lowercase + string.digits + "+/=").encode(),
+    (string.digits + string.ascii_uppercase + string.ascii_lowercase + "-_0").encode(),
+)
+
+
+def _encode_source(source: str) -> str:
+    """Encode diagram text for PlantUML server URLs (raw deflate + custom base64)."""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    deflated = compressor.compress(source.encode("utf-8")) + compressor.flush()
+    return base64.b64encode(deflated).translate(_TO_PLANTUML).decode("ascii")
+
+
+def _output_format(destination: Path) -> str:
+    return _FORMATS.get(destination.suffix.lower(), "png")
+
+
+class LocalPlantUMLServer:
+    """A ``plantuml.jar -picoweb`` process bound to localhost.
+
+    The JVM is started on first use and reused for every later render, which
+    avoids paying JVM start-up per diagram.  Rendering is thread-safe.
+    """
+
+    def __init__(self, jar_path: Union[str, Path], *, java: str = "java") -> None:
+        self.jar_path = str(jar_path)
+        self.java = java
+        self.port: Optional[int] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _free_port() -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def _wait_until_ready(self) -> None:
+        deadline = time.monotonic() + LOCAL_STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise ArtifactError(
+                    "plantuml.jar exited during start-up "
+                    f"(code {self._process.returncode})."
+                )
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.5):
+                    return
+            except OSError:
+                time.sleep(0.1)
+        self.close()
+        raise ArtifactError("Timed out waiting for the local PlantUML server.")
+
+    def start(self) -> None:
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                return
+            if shutil.which(self.java) is None:
+                raise ArtifactError(f"Local PlantUML rendering requires '{self.java}'.")
+            if not os.path.exists(self.jar_path):
+                raise ArtifactError(f"plantuml.jar not found at {self.jar_path}")
+            self.port = self._free_port()
+            self._process = subprocess.Popen(
+                [
+                    self.java,
+                    "-Djava.awt.headless=true",
+                    "-jar",
+                    self.jar_path,
+                    f"-picoweb:{self.port}:127.0.0.1",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            self._wait_until_ready()
+            logger.info("Local PlantUML server started on port %s.", self.port)
+
+    def render(self, source: str, fmt: str = "png") -> bytes:
+        """Return the rendered diagram in ``fmt`` (``png``, ``svg`` or ``txt``)."""
+        self.start()
+        url = f"http://127.0.0.1:{self.port}/{fmt}/{_encode_source(source)}"
+        try:
+            with urllib.request.urlopen(url, timeout=LOCAL_STARTUP_TIMEOUT) as response:
+                return response.read()
+        except urllib.error.HTTPError as exc:
+            # PlantUML answers syntax errors with an error image and HTTP 400.
+            raise ArtifactError(f"PlantUML rendering failed: {exc}") from exc
+        except OSError as exc:
+            raise ArtifactError(f"Local PlantUML server unavailable: {exc}") from exc
+
+    def close(self) -> None:
+        process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:  # pragma: no cover - stubborn JVM
+                process.kill()
+
+
+_LOCAL_SERVERS: Dict[str, LocalPlantUMLServer] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_local_plantuml_server(
+    jar_path: Optional[Union[str, Path]] = None,
+) -> LocalPlantUMLServer:
+    """Return the shared local server for ``jar_path`` (default ``PLANTUML_JAR``)."""
+    jar = jar_path or PLANTUML_JAR
+    if not jar:
+        raise ArtifactError(
+            "Set PLANTUML_JAR to the path of plantuml.jar for local rendering."
+        )
+    key = os.path.abspath(str(jar))
+    with _REGISTRY_LOCK:
+        server = _LOCAL_SERVERS.get(key)
+        if server is None:
+            server = _LOCAL_SERVERS[key] = LocalPlantUMLServer(key)
+        return server
+
+
+@atexit.register
+def _close_local_servers() -> None:  # pragma: no cover - interpreter shutdown
+    for server in list(_LOCAL_SERVERS.values()):
+        server.close()
 
-def _instantiate_plantuml(server_url: Optional[str]) -> PlantUML:
-    """Return a PlantUML client, tolerating placeholder implementations."""
 
+class _RemoteRenderer:
+    """PlantUML clients for one server plus the call style they accept.
+
+    plantuml client versions differ in how ``processes`` takes the output
+    file; the working style is probed on the first render and reused.
+    Each thread gets its own persistent client because the HTTP connection
+    inside the plantuml client is not thread-safe.
+    """
+
+    _STYLES = ("outfile", "outfile positional", "bytes")
+
+    def __init__(self, server_url: Optional[str]) -> None:
+        self.server_url = server_url
+        self.style: Optional[str] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def client(self) -> Any:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = _instantiate_plantuml(self.server_url)
+        return client
+
+    def _call(self, style: str, source: str, destination: Path) -> Any:
+        if style == "outfile":
+            return self.client.processes(source, outfile=str(destination))
+        if style == "outfile positional":
+            return self.client.processes(source, str(destination))
+        return self.client.processes(source)
+
+    def render(self, source: str, destination: Path) -> Any:
+        if self.style is None:
+            with self._lock:
+                if self.style is None:
+                    return self._probe(source, destination)
+        try:
+            return self._call(self.style, source, destination)
+        except Exception as exc:  # pragma: no cover - pass through diagnostics
+            raise ArtifactError(f"PlantUML rendering failed: {exc}") from exc
+
+    def _probe(self, source: str, destination: Path) -> Any:
+        """Render with the first call style the client accepts and remember it."""
+        attempts = []
+        for style in self._STYLES:
+            try:
+                result = self._call(style, source, destination)
+            except TypeError as exc:  # Older plantuml libraries reject the form.
+                if style == self._STYLES[-1]:
+                    return self._fail(attempts, exc)
+                attempts.append((style, exc))
+                continue
+            except Exception as exc:  # pragma: no cover - pass through diagnostics
+                return self._fail(attempts, exc)
+            last = style == self._STYLES[-1]
+            if result is None and not last and not destination.exists():
+                attempts.append((style, "no output"))
+                continue
+            self.style = style
+            return result
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    @staticmethod
+    def _fail(attempts: list, exc: Exception) -> None:
+        if attempts:
+            detail = "; ".join(f"{label}: {err}" for label, err in attempts)
+            message = f"PlantUML rendering failed after attempts [{detail}]: {exc}"
+        else:
+            message = f"PlantUML rendering failed: {exc}"
+        raise ArtifactError(message) from exc
+
+
+_REMOTE_RENDERERS: Dict[Tuple[Any, str], _RemoteRenderer] = {}
+
+
+def _plantuml_class() -> Any:
+    """Return ``utils.PlantUML`` (which tests may patch), imported on demand."""
     utils_module = sys.modules.get(__package__)
-    plantuml_cls = getattr(utils_module, "PlantUML", PlantUML) if utils_module else PlantUML
+    if utils_module is not None:
+        return getattr(utils_module, "PlantUML")
+    from . import settings
+
+    return settings.PlantUML
+
+
+def _instantiate_plantuml(server_url: Optional[str]) -> Any:
+    """Return a PlantUML client, tolerating placeholder implementations."""
+
+    plantuml_cls = _plantuml_class()
 
     url = server_url or DEFAULT_PLANTUML_SERVER
     try:
@@ -31,14 +274,121 @@ def _instantiate_plantuml(server_url: Optional[str]) -> PlantUML:
         return plantuml_cls()
 
 
+def _remote_renderer(server_url: Optional[str]) -> _RemoteRenderer:
+    """Return the shared renderer for ``server_url``."""
+    key = (_plantuml_class(), server_url or DEFAULT_PLANTUML_SERVER)
+    with _REGISTRY_LOCK:
+        renderer = _REMOTE_RENDERERS.get(key)
+        if renderer is None:
+            renderer = _REMOTE_RENDERERS[key] = _RemoteRenderer(server_url)
+        return renderer
+
+
+def _use_local(backend: Optional[str], server_url: Optional[str]) -> bool:
+    backend = (backend or DEFAULT_PLANTUML_BACKEND).lower()
+    if backend not in {"auto", "local", "server"}:
+        raise ArtifactError(f"Unknown PlantUML backend: {backend!r}")
+    if backend == "auto":
+        return bool(PLANTUML_JAR) and server_url is None
+    return backend == "local"
+
+
+def _render(
+    source: str,
+    destination: Path,
+    *,
+    server_url: Optional[str],
+    backend: Optional[str],
+) -> None:
+    """Render ``source`` into ``destination`` with the selected backend."""
+    if _use_local(backend, server_url):
+        data = get_local_plantuml_server().render(source, _output_format(destination))
+        destination.write_bytes(data)
+        return
+
+    result = _remote_renderer(server_url).render(source, destination)
+    if isinstance(result, (bytes, bytearray)):
+        destination.write_bytes(result)
+    elif hasattr(result, "read") and callable(getattr(result, "read")):
+        destination.write_bytes(result.read())
+    else:
+        if not destination.exists():
+            raise ArtifactError(
+                "PlantUML client did not produce output; verify dependencies."
+            )
+
+
+def _cache_enabled(cache: Optional[bool]) -> bool:
+    if cache is not None:
+        return cache
+    return os.getenv("AGA_PLANTUML_CACHE", "0").lower() in {"1", "true", "yes", "on"}
+
+
+def _render_cache_key(
+    source: str,
+    destination: Path,
+    *,
+    server_url: Optional[str],
+    backend: Optional[str],
+) -> str:
+    # Servers and jar versions can render the same source differently.
+    if _use_local(backend, server_url):
+        renderer = ("local", os.path.abspath(PLANTUML_JAR or ""))
+    else:
+        renderer = ("server", server_url or DEFAULT_PLANTUML_SERVER)
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    return RENDER_CACHE.make_key(digest, _output_format(destination), *renderer)
+
+
+def _restore_cached(
+    key: str, destination: Path, base_dir: Optional[Union[str, Path]]
+) -> bool:
+    """Write a cached render to ``destination``; return ``False`` on a miss.
+
+    Renders are cached in the artifacts directory they were written to.
+    """
+    value = RENDER_CACHE.get(key, base_dir=base_dir)
+    if value is None:
+        return False
+    try:
+        # Loads by the original name, so compressed renders are decompressed.
+        data = load_artifact(value["path"], base_dir=base_dir, as_="bytes")
+    except ArtifactError:
+        RENDER_CACHE.invalidate(key, base_dir=base_dir)
+        return False
+    if not (destination.exists() and destination.read_bytes() == data):
+        destination.write_bytes(data)
+    return True
+
+
+def _remember_render(
+    key: str, destination: Path, base_dir: Optional[Union[str, Path]]
+) -> None:
+    name = f"{RENDER_CACHE.directory}/{key}{destination.suffix.lower() or '.png'}"
+    stored = save_artifact(
+        destination.read_bytes(), name, base_dir=base_dir, overwrite=True, index=False
+    )
+    RENDER_CACHE.put(key, {"path": name}, files=[stored], base_dir=base_dir)
+
+
 def render_plantuml_diagram(
     diagram_source: str,
     output_filename: Union[str, Path],
     *,
     server_url: Optional[str] = None,
     base_dir: Optional[Union[str, Path]] = None,
+    backend: Optional[str] = None,
+    cache: Optional[bool] = None,
 ) -> Path:
-    """Render PlantUML text into an artifact image."""
+    """Render PlantUML text into an artifact image.
+
+    ``backend`` is ``"server"`` (``server_url`` or ``PLANTUML_SERVER_URL``),
+    ``"local"`` (a persistent ``plantuml.jar`` process, see
+    ``PLANTUML_JAR``) or ``"auto"`` (local when ``PLANTUML_JAR`` is set and
+    no ``server_url`` is given); it defaults to ``AGA_PLANTUML_BACKEND``.
+    With ``cache=True`` (or ``AGA_PLANTUML_CACHE=1``) renders are cached
+    by source hash, output format and backend.
+    """
 
     if not isinstance(diagram_source, str) or not diagram_source.strip():
         raise ArtifactError("diagram_source must be a non-empty string.")
@@ -48,46 +398,21 @@ def render_plantuml_diagram(
     )
     destination.parent.mkdir(parents=True, exist_ok=True)
 
-    client = _instantiate_plantuml(server_url)
+    key = None
+    if _cache_enabled(cache):
+        key = _render_cache_key(
+            diagram_source, destination, server_url=server_url, backend=backend
+        )
+    if key and _restore_cached(key, destination, base_dir):
+        logger.info(
+            "PlantUML render cache hit.",
+            extra={"artifacts_path": str(destination)},
+        )
+        return destination
 
-    attempts = []
-    result = None
-
-    try:
-        result = client.processes(diagram_source, outfile=str(destination))
-    except TypeError as exc:  # Older plantuml libraries reject the keyword.
-        attempts.append(("outfile", exc))
-    except Exception as exc:  # pragma: no cover - pass through diagnostics
-        raise ArtifactError(f"PlantUML rendering failed: {exc}") from exc
-
-    if result is None:
-        try:
-            result = client.processes(diagram_source, str(destination))
-        except TypeError as exc:
-            attempts.append(("outfile positional", exc))
-        except Exception as exc:  # pragma: no cover - pass through diagnostics
-            raise ArtifactError(f"PlantUML rendering failed: {exc}") from exc
-
-    if result is None:
-        try:
-            result = client.processes(diagram_source)
-        except Exception as exc:  # pragma: no cover - pass through diagnostics
-            if attempts:
-                detail = "; ".join(f"{label}: {err}" for label, err in attempts)
-                message = f"PlantUML rendering failed after attempts [{detail}]: {exc}"
-            else:
-                message = f"PlantUML rendering failed: {exc}"
-            raise ArtifactError(message) from exc
-
-    if isinstance(result, (bytes, bytearray)):
-        destination.write_bytes(result)
-    elif hasattr(result, "read") and callable(getattr(result, "read")):
-        destination.write_bytes(result.read())
-    else:
-        if not destination.exists():
-            raise ArtifactError(
-                "PlantUML client did not produce output; verify dependencies."
-            )
+    _render(diagram_source, destination, server_url=server_url, backend=backend)
+    if key:
+        _remember_render(key, destination, base_dir)
 
     logger.info(
         "PlantUML diagram rendered.",
@@ -97,4 +422,71 @@ def render_plantuml_diagram(
     return destination
 
 
-__all__ = ["render_plantuml_diagram"]
+def render_plantuml_diagrams(
+    sources: Mapping[str, str],
+    *,
+    server_url: Optional[str] = None,
+    base_dir: Optional[Union[str, Path]] = None,
+    backend: Optional[str] = None,
+    cache: Optional[bool] = None,
+    max_concurrency: int = 4,
+) -> Dict[str, Path]:
+    """Render several diagrams concurrently and return ``{name: path}``.
+
+    ``sources`` maps output filenames (``.png`` is added when the name has
+    no suffix) to PlantUML text.  All renders share the persistent server
+    clients or local PlantUML process; with the render cache enabled,
+    diagrams whose source is unchanged are restored without a round-trip.
+
+    Raises
+    ------
+    ArtifactError
+        If any diagram fails; the others are still rendered.
+
+    Example
+    -------
+    >>> paths = render_plantuml_diagrams({
+    ...     "diagrams/components.png": component_puml,
+    ...     "diagrams/sequence.svg": sequence_puml,
+    ... })
+    """
+    names = {
+        name: name if Path(name).suffix else f"{name}.png" for name in sources
+    }
+
+    def render(name: str) -> Path:
+        return render_plantuml_diagram(
+            sources[name],
+            names[name],
+            server_url=server_url,
+            base_dir=base_dir,
+            backend=backend,
+            cache=cache,
+        )
+
+    results: Dict[str, Path] = {}
+    errors: Dict[str, Exception] = {}
+    if not sources:
+        return results
+    workers = max(1, min(max_concurrency, len(sources)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(render, name) for name in sources}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as exc:
+                errors[name] = exc
+    if errors:
+        detail = "; ".join(f"{name}: {exc}" for name, exc in errors.items())
+        raise ArtifactError(
+            f"{len(errors)} of {len(sources)} diagrams failed to render: {detail}"
+        ) from next(iter(errors.values()))
+    return results
+
+
+__all__ = [
+    "render_plantuml_diagram",
+    "render_plantuml_diagrams",
+    "LocalPlantUMLServer",
+    "get_local_plantuml_server",
+]
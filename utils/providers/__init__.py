@@ -1,12 +1,231 @@
-"""Provider specific implementations."""
-from . import openai, anthropic, huggingface, google
-
-PROVIDERS = {
-    'openai': openai,
-    'anthropic': anthropic,
-    'huggingface': huggingface,
-    'google': google,
-    'gemini': google,  # alias
+"""Provider specific implementations.
+
+``PROVIDERS`` maps provider names to provider modules (or any object with
+the same functions, see :class:`utils.providers.base.Provider`).  Entries
+come from three places, all resolved lazily on first lookup and cached:
+
+* the built-in providers of this package;
+* installed plugins advertising an entry point in the
+  ``ag_aisoftdev.providers`` group, e.g. in a plugin's ``pyproject.toml``::
+
+      [project.entry-points."ag_aisoftdev.providers"]
+      vllm = "my_plugin.vllm_provider"
+
+* :func:`register_provider` at runtime.
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import MutableMapping
+from importlib import import_module
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from ..logging import get_logger
+
+logger = get_logger()
+
+ENTRY_POINT_GROUP = 'ag_aisoftdev.providers'
+
+_BUILTIN_PROVIDERS: Dict[str, str] = {
+    'openai': f'{__name__}.openai',
+    'anthropic': f'{__name__}.anthropic',
+    'huggingface': f'{__name__}.huggingface',
+    'google': f'{__name__}.google',
+    'gemini': f'{__name__}.google',  # alias
+    'fake': f'{__name__}.fake',  # offline, deterministic
+    'openai_compatible': f'{__name__}.openai_compatible',  # vLLM, llama.cpp, TGI
 }
 
-__all__ = ['PROVIDERS']
+
+def _entry_points() -> Dict[str, Any]:
+    from importlib import metadata  # scanning installed packages is not free
+
+    try:
+        found = metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # pragma: no cover - Python < 3.10 selection API
+        found = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+    return {ep.name: ep for ep in found}
+
+
+class _ProviderRegistry(MutableMapping):
+    """Provider name -> provider mapping that imports providers on first access.
+
+    Pending entries are import paths (``"pkg.module"`` or
+    ``"pkg.module:attr"``) or entry points; a loaded provider is cached.
+    """
+
+    def __init__(self, builtins: Dict[str, str]) -> None:
+        self._pending: Dict[str, Any] = dict(builtins)
+        self._loaded: Dict[str, Any] = {}
+        self._discovered = False
+        self._lock = threading.RLock()
+
+    def _discover(self) -> None:
+        """Add entry-point plugins once; they never shadow existing names."""
+        if self._discovered:
+            return
+        with self._lock:
+            if self._discovered:
+                return
+            for name, entry_point in _entry_points().items():
+                if name not in self._pending and name not in self._loaded:
+                    self._pending[name] = entry_point
+            self._discovered = True
+
+    @staticmethod
+    def _load(target: Any) -> Any:
+        if isinstance(target, str):
+            module_name, _, attr = target.partition(':')
+            module = import_module(module_name)
+            return getattr(module, attr) if attr else module
+        return target.load()  # importlib.metadata.EntryPoint
+
+    def __getitem__(self, name: str) -> Any:
+        provider = self._loaded.get(name)
+        if provider is not None:
+            return provider
+        if name not in self._pending:
+            self._discover()
+        with self._lock:
+            if name in self._loaded:
+                return self._loaded[name]
+            if name not in self._pending:
+                raise KeyError(name)
+            target = self._pending.pop(name)
+            if isinstance(target, str):
+                provider = self._loaded[name] = self._load(target)
+                return provider
+            # A broken plugin must not break lookups of every other provider;
+            # it is dropped, so later lookups see an unknown name.
+            try:
+                provider = self._load(target)
+            except Exception:
+                logger.exception(
+                    "Could not load provider plugin %r (%s)",
+                    name,
+                    getattr(target, "value", target),
+                    extra={"provider": name},
+                )
+                raise KeyError(name) from None
+            self._loaded[name] = provider
+            return provider
+
+    def __setitem__(self, name: str, provider: Any) -> None:
+        with self._lock:
+            self._pending.pop(name, None)
+            self._loaded[name] = provider
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            found = self._loaded.pop(name, None) is not None
+            if self._pending.pop(name, None) is None and not found:
+                raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        pending = [name for name in self._pending if name not in self._loaded]
+        return iter(list(self._loaded) + pending)
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(set(self._loaded) | set(self._pending))
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._loaded or name in self._pending:
+            return True
+        self._discover()
+        return name in self._pending
+
+    def register(self, name: str, provider: Any, *, replace: bool = False) -> None:
+        with self._lock:
+            if not replace and name in self:
+                raise ValueError(
+                    f"Provider '{name}' is already registered; pass replace=True."
+                )
+            self._loaded.pop(name, None)
+            if isinstance(provider, str):
+                self._pending[name] = provider
+            else:
+                self[name] = provider
+
+    def __repr__(self) -> str:
+        return f'PROVIDERS({sorted(self)!r})'
+
+
+PROVIDERS: _ProviderRegistry = _ProviderRegistry(_BUILTIN_PROVIDERS)
+
+# Provider name -> {model name: config it replaced (None if new)}, so that
+# unregistering restores RECOMMENDED_MODELS.
+_ADDED_MODELS: Dict[str, Dict[str, Optional[Mapping[str, Any]]]] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def _restore_models(name: str) -> None:
+    added = _ADDED_MODELS.pop(name, None)
+    if not added:
+        return
+    from ..models import RECOMMENDED_MODELS
+
+    for model_name, previous in added.items():
+        if previous is None:
+            RECOMMENDED_MODELS.pop(model_name, None)
+        else:
+            RECOMMENDED_MODELS[model_name] = previous
+
+
+def register_provider(
+    name: str,
+    provider: Any,
+    *,
+    models: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    replace: bool = False,
+) -> None:
+    """Register a provider under ``name``.
+
+    ``provider`` is a module or object implementing the provider functions,
+    or an import path (``"pkg.module"`` / ``"pkg.module:attr"``) imported on
+    first use.  ``models`` adds entries to ``RECOMMENDED_MODELS`` whose
+    ``provider`` defaults to ``name``, so :func:`utils.setup_llm_client`
+    can select them.  Replacing a provider first undoes the model entries
+    of its previous registration; :func:`unregister_provider` undoes them
+    too.
+
+    Raises
+    ------
+    ValueError
+        If ``name`` is taken and ``replace`` is false.
+
+    Example
+    -------
+    >>> register_provider(
+    ...     "local", "my_backends.vllm",
+    ...     models={"llama-3-8b-local": {"text_generation": True}},
+    ... )
+    """
+    with _MODELS_LOCK:
+        PROVIDERS.register(name, provider, replace=replace)
+        _restore_models(name)
+        if models:
+            from ..models import RECOMMENDED_MODELS
+
+            added = _ADDED_MODELS[name] = {}
+            for model_name, config in models.items():
+                added[model_name] = RECOMMENDED_MODELS.get(model_name)
+                RECOMMENDED_MODELS[model_name] = {'provider': name, **config}
+
+
+def unregister_provider(name: str) -> None:
+    """Remove ``name`` from the registry; unknown names are ignored.
+
+    Models added by :func:`register_provider` are removed, and entries
+    they replaced are restored.
+    """
+    with _MODELS_LOCK:
+        try:
+            del PROVIDERS[name]
+        except KeyError:
+            pass
+        _restore_models(name)
+
+
+__all__ = ['PROVIDERS', 'ENTRY_POINT_GROUP', 'register_provider', 'unregister_provider']
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import os
-from typing import Any, Tuple
+from typing import Any, Iterator
 
 from ..errors import ProviderOperationError
 from ..http import TOTAL_TIMEOUT
+from ..images import ImageData
 from ..rate_limit import rate_limit
 
 
@@ -48,6 +49,120 @@ async def async_text_completion(
     )
 
 
+def _split_system(
+    messages: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Move system messages into a cacheable ``system`` block."""
+    system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+    turns = [
+        {"role": m["role"], "content": m["content"]}
+        for m in messages
+        if m["role"] != "system"
+    ]
+    blocks = []
+    if system:
+        # Marks the stable prefix (instructions, summary) for prompt caching.
+        blocks.append(
+            {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+        )
+    return blocks, turns
+
+
+def chat_completion(
+    client: Any, messages: list[dict[str, Any]], model_name: str, temperature: float = 0.7
+) -> str:
+    """Complete a conversation given as ``{"role", "content"}`` messages."""
+    try:
+        api_key = os.getenv("ANTHROPIC_API_KEY", "")
+        rate_limit("anthropic", api_key, model_name)
+        system, turns = _split_system(messages)
+        params: dict[str, Any] = {
+            "model": model_name,
+            "max_tokens": 4096,
+            "temperature": temperature,
+            "messages": turns,
+            "timeout": TOTAL_TIMEOUT,
+        }
+        if system:
+            params["system"] = system
+        response = client.messages.create(**params)
+        return response.content[0].text
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError("anthropic", model_name, "chat completion", str(e))
+
+
+async def async_chat_completion(
+    client: Any, messages: list[dict[str, Any]], model_name: str, temperature: float = 0.7
+) -> str:
+    return await asyncio.to_thread(
+        chat_completion, client, messages, model_name, temperature
+    )
+
+
+def stream_text_completion(
+    client: Any, prompt: str, model_name: str, temperature: float = 0.7
+) -> Iterator[str]:
+    """Yield the completion text in deltas as the model produces them."""
+    try:
+        api_key = os.getenv("ANTHROPIC_API_KEY", "")
+        rate_limit("anthropic", api_key, model_name)
+        with client.messages.stream(
+            model=model_name,
+            max_tokens=4096,
+            temperature=temperature,
+            messages=[{"role": "user", "content": prompt}],
+            timeout=TOTAL_TIMEOUT,
+        ) as stream:
+            yield from stream.text_stream
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError("anthropic", model_name, "completion", str(e))
+
+
+def structured_completion(
+    client: Any, prompt: str, model_name: str, schema: Any, temperature: float = 0.7
+) -> Any:
+    """Return the input of a forced tool call whose input schema is ``schema``."""
+    from ..structured import json_schema_of, schema_name
+
+    json_schema = json_schema_of(schema)
+    # Tool inputs must be objects; other schemas are wrapped and unwrapped.
+    wrapped = json_schema.get("type") != "object"
+    if wrapped:
+        json_schema = {
+            "type": "object",
+            "properties": {"value": json_schema},
+            "required": ["value"],
+        }
+    name = schema_name(schema)
+    try:
+        api_key = os.getenv("ANTHROPIC_API_KEY", "")
+        rate_limit("anthropic", api_key, model_name)
+        response = client.messages.create(
+            model=model_name,
+            max_tokens=4096,
+            temperature=temperature,
+            messages=[{"role": "user", "content": prompt}],
+            tools=[{
+                "name": name,
+                "description": "Record the response in the required structure.",
+                "input_schema": json_schema,
+            }],
+            tool_choice={"type": "tool", "name": name},
+            timeout=TOTAL_TIMEOUT,
+        )
+        data = next(
+            block.input for block in response.content
+            if getattr(block, "type", None) == "tool_use"
+        )
+    except StopIteration:
+        raise ProviderOperationError(
+            "anthropic", model_name, "structured completion", "No tool call in response"
+        )
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError("anthropic", model_name, "structured completion", str(e))
+    return data.get("value") if wrapped else data
+
+
 def vision_completion(
     client: Any, prompt: str, image_path_or_url: str, model_name: str
 ) -> str:
@@ -138,7 +253,7 @@ async def async_vision_completion(*args: Any, **kwargs: Any) -> str:  # pragma:
     return await asyncio.to_thread(vision_completion, *args, **kwargs)
 
 
-def image_generation(*args: Any, **kwargs: Any) -> Tuple[str, str]:  # pragma: no cover
+def image_generation(*args: Any, **kwargs: Any) -> ImageData:  # pragma: no cover
     raise ProviderOperationError(
         "anthropic", kwargs.get("model_name", ""), "image generation", "Not implemented"
     )
@@ -146,11 +261,11 @@ def image_generation(*args: Any, **kwargs: Any) -> Tuple[str, str]:  # pragma: n
 
 async def async_image_generation(
     *args: Any, **kwargs: Any
-) -> Tuple[str, str]:  # pragma: no cover
+) -> ImageData:  # pragma: no cover
     return await asyncio.to_thread(image_generation, *args, **kwargs)
 
 
-def image_edit(*args: Any, **kwargs: Any) -> Tuple[str, str]:  # pragma: no cover
+def image_edit(*args: Any, **kwargs: Any) -> ImageData:  # pragma: no cover
     raise ProviderOperationError(
         "anthropic", kwargs.get("model_name", ""), "image edit", "Not implemented"
     )
@@ -158,7 +273,7 @@ def image_edit(*args: Any, **kwargs: Any) -> Tuple[str, str]:  # pragma: no cove
 
 async def async_image_edit(
     *args: Any, **kwargs: Any
-) -> Tuple[str, str]:  # pragma: no cover
+) -> ImageData:  # pragma: no cover
     return await asyncio.to_thread(image_edit, *args, **kwargs)
 
 
@@ -1,7 +1,9 @@
 """Protocol defining the provider interface."""
 from __future__ import annotations
 
-from typing import Any, Protocol
+from typing import Any, Callable, Protocol
+
+from ..images import ImageData
 
 
 class Provider(Protocol):  # pragma: no cover - structural typing only
@@ -22,7 +24,7 @@ class Provider(Protocol):  # pragma: no cover - structural typing only
 
     def image_generation(
         self, client: Any, prompt: str, model_name: str
-    ) -> tuple[str, str]:
+    ) -> ImageData:
         ...
 
     def image_edit(
@@ -32,7 +34,7 @@ class Provider(Protocol):  # pragma: no cover - structural typing only
         image_path: str,
         model_name: str,
         **edit_params: Any,
-    ) -> tuple[str, str]:
+    ) -> ImageData:
         ...
 
     def transcribe_audio(
@@ -41,5 +43,7 @@ class Provider(Protocol):  # pragma: no cover - structural typing only
         audio_path: str,
         model_name: str,
         language_code: str = "en-US",
+        *,
+        progress: Callable[[float], None] | None = None,
     ) -> str:
         ...
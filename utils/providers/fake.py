@@ -0,0 +1,439 @@
+"""Offline fake provider.
+
+Returns deterministic results without network access or API keys so that
+notebooks and tests can exercise the full request path (client setup,
+validation, artifacts) offline.  Select it with the ``fake-model`` entry of
+:data:`utils.models.RECOMMENDED_MODELS`.
+
+Calls can also simulate provider behaviour for load tests: latency drawn from
+a distribution, injected failures and a fixed completion length.  Configure
+it with ``fake_*`` keys on the model entry, ``AGA_FAKE_*`` environment
+variables (which take precedence) or a :class:`FakeBehavior` passed to
+:class:`FakeClient` directly::
+
+    AGA_FAKE_LATENCY_MS=200 AGA_FAKE_LATENCY_DISTRIBUTION=lognormal \
+    AGA_FAKE_ERROR_RATE=0.01 AGA_FAKE_OUTPUT_TOKENS=50 python app.py
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import math
+import os
+import random
+import threading
+import time
+import wave
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from ..errors import ProviderOperationError
+from ..images import ImageData
+
+# 1x1 transparent PNG.
+_PNG_PIXEL = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal", "exponential")
+INJECTED_FAILURE = "Injected fake provider failure"
+
+
+@dataclass(frozen=True)
+class FakeBehavior:
+    """Simulated provider characteristics.
+
+    Parameters
+    ----------
+    latency_ms:
+        Mean latency per call.
+    latency_jitter_ms:
+        Spread around the mean: half-width for ``uniform``, standard
+        deviation for ``normal`` and ``lognormal``.  Ignored by
+        ``constant`` and ``exponential``.
+    latency_distribution:
+        One of :data:`LATENCY_DISTRIBUTIONS`.
+    error_rate:
+        Probability in ``[0, 1]`` that a call raises
+        :class:`~utils.errors.ProviderOperationError`.
+    output_tokens:
+        Completion length in whitespace-separated tokens; ``None`` echoes
+        the prompt.
+    tokens_per_second:
+        Pace of :func:`stream_text_completion` after the first token;
+        ``None`` streams the rest at once.  The sampled latency is the
+        time to first token.
+    seed:
+        Seed for latency and failure sampling, for reproducible runs.
+    """
+
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    latency_distribution: str = "constant"
+    error_rate: float = 0.0
+    output_tokens: Optional[int] = None
+    tokens_per_second: Optional[float] = None
+    seed: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{self.latency_distribution}'; "
+                f"expected one of {', '.join(LATENCY_DISTRIBUTIONS)}."
+            )
+        if not 0.0 <= self.error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1.")
+        if self.latency_ms < 0 or self.latency_jitter_ms < 0:
+            raise ValueError("Latencies must not be negative.")
+        if self.tokens_per_second is not None and self.tokens_per_second <= 0:
+            raise ValueError("tokens_per_second must be positive.")
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "FakeBehavior":
+        """Read ``fake_<field>`` config keys, overridden by ``AGA_FAKE_<FIELD>``."""
+        values: dict[str, Any] = {}
+        for f in fields(cls):
+            raw = os.getenv(f"AGA_FAKE_{f.name.upper()}", config.get(f"fake_{f.name}"))
+            if raw is None or raw == "":
+                continue
+            if f.name == "latency_distribution":
+                values[f.name] = str(raw).lower()
+            elif f.name in ("output_tokens", "seed"):
+                values[f.name] = int(raw)
+            else:
+                values[f.name] = float(raw)
+        return cls(**values)
+
+    def sample_seconds(self, rng: random.Random) -> float:
+        mean, spread = self.latency_ms, self.latency_jitter_ms
+        if mean <= 0:
+            return 0.0
+        kind = self.latency_distribution
+        if kind == "uniform":
+            ms = rng.uniform(mean - spread, mean + spread)
+        elif kind == "normal":
+            ms = rng.gauss(mean, spread)
+        elif kind == "lognormal":
+            # Parameterised so the samples have the requested mean and std dev.
+            sigma2 = math.log1p((spread / mean) ** 2)
+            ms = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+        elif kind == "exponential":
+            ms = rng.expovariate(1.0 / mean)
+        else:
+            ms = mean
+        return max(ms, 0.0) / 1000
+
+
+@dataclass
+class FakeClient:
+    """Client returned by :func:`setup_client`.
+
+    Records the operations it served, token usage (whitespace tokens) and
+    the total latency it simulated, so load tests can subtract provider time
+    from measured wall time.
+    """
+
+    model_name: str
+    calls: List[str] = field(default_factory=list)
+    behavior: FakeBehavior = field(default_factory=FakeBehavior)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    simulated_seconds: float = 0.0
+    failures: int = 0
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.behavior.seed)
+        self._lock = threading.Lock()
+
+    def _plan(self, operation: str, prompt: str = "") -> Tuple[float, bool]:
+        """Record a call and decide its latency and whether it fails."""
+        with self._lock:
+            self.calls.append(operation)
+            delay = self.behavior.sample_seconds(self._rng)
+            fail = self.behavior.error_rate > 0 and self._rng.random() < self.behavior.error_rate
+            self.simulated_seconds += delay
+            self.prompt_tokens += len(prompt.split())
+            self.failures += fail
+        return delay, fail
+
+    def _count_completion(self, text: str) -> str:
+        with self._lock:
+            self.completion_tokens += len(text.split())
+        return text
+
+
+def setup_client(model_name: str, config: dict[str, Any]) -> Any:
+    return FakeClient(model_name, behavior=FakeBehavior.from_config(config))
+
+
+async def async_setup_client(model_name: str, config: dict[str, Any]) -> Any:
+    return setup_client(model_name, config)
+
+
+def _plan(client: Any, operation: str, prompt: str = "") -> Tuple[float, bool]:
+    if isinstance(client, FakeClient):
+        return client._plan(operation, prompt)
+    calls = getattr(client, "calls", None)
+    if isinstance(calls, list):
+        calls.append(operation)
+    return 0.0, False
+
+
+def _simulate(client: Any, model_name: str, operation: str, prompt: str = "") -> None:
+    delay, fail = _plan(client, operation, prompt)
+    if delay:
+        time.sleep(delay)
+    if fail:
+        raise ProviderOperationError("fake", model_name, operation, INJECTED_FAILURE)
+
+
+async def _async_simulate(
+    client: Any, model_name: str, operation: str, prompt: str = ""
+) -> None:
+    delay, fail = _plan(client, operation, prompt)
+    if delay:
+        await asyncio.sleep(delay)
+    if fail:
+        raise ProviderOperationError("fake", model_name, operation, INJECTED_FAILURE)
+
+
+def _completion(client: Any, text: str) -> str:
+    tokens = getattr(getattr(client, "behavior", None), "output_tokens", None)
+    if tokens is not None:
+        words = text.split() or ["token"]
+        text = " ".join(words[i % len(words)] for i in range(tokens))
+    if isinstance(client, FakeClient):
+        client._count_completion(text)
+    return text
+
+
+def text_completion(
+    client: Any, prompt: str, model_name: str, temperature: float = 0.7
+) -> str:
+    _simulate(client, model_name, "text_completion", prompt)
+    return _completion(client, f"[{model_name}] {prompt}")
+
+
+async def async_text_completion(
+    client: Any, prompt: str, model_name: str, temperature: float = 0.7
+) -> str:
+    await _async_simulate(client, model_name, "text_completion", prompt)
+    return _completion(client, f"[{model_name}] {prompt}")
+
+
+def _last_user_content(messages: list[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return str(message.get("content", ""))
+    return ""
+
+
+def chat_completion(
+    client: Any, messages: list[dict[str, Any]], model_name: str, temperature: float = 0.7
+) -> str:
+    """Echo the last user message, like :func:`text_completion`."""
+    prompt = " ".join(str(m.get("content", "")) for m in messages)
+    _simulate(client, model_name, "chat_completion", prompt)
+    return _completion(client, f"[{model_name}] {_last_user_content(messages)}")
+
+
+async def async_chat_completion(
+    client: Any, messages: list[dict[str, Any]], model_name: str, temperature: float = 0.7
+) -> str:
+    prompt = " ".join(str(m.get("content", "")) for m in messages)
+    await _async_simulate(client, model_name, "chat_completion", prompt)
+    return _completion(client, f"[{model_name}] {_last_user_content(messages)}")
+
+
+def stream_text_completion(
+    client: Any, prompt: str, model_name: str, temperature: float = 0.7
+) -> Iterator[str]:
+    """Yield :func:`text_completion`'s reply word by word."""
+    _simulate(client, model_name, "stream_text_completion", prompt)
+    tokens_per_second = getattr(getattr(client, "behavior", None), "tokens_per_second", None)
+    words = _completion(client, f"[{model_name}] {prompt}").split(" ")
+    for i, word in enumerate(words):
+        if i and tokens_per_second:
+            time.sleep(1 / tokens_per_second)
+        yield word if i == 0 else f" {word}"
+
+
+def _instance_of(schema: dict[str, Any], root: dict[str, Any]) -> Any:
+    """Smallest value satisfying common JSON-schema constructs."""
+    ref = schema.get("$ref")
+    if ref:
+        node: Any = root
+        for part in ref.lstrip("#/").split("/"):
+            node = node[part]
+        return _instance_of(node, root)
+    if "default" in schema:
+        return schema["default"]
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if schema.get(key):
+            return _instance_of(schema[key][0], root)
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = kind[0]
+    if kind == "object":
+        return {
+            name: _instance_of(prop, root)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        count = schema.get("minItems", 0)
+        return [_instance_of(schema.get("items", {}), root) for _ in range(count)]
+    return {"string": "fake", "integer": 0, "number": 0.0, "boolean": False}.get(kind)
+
+
+def structured_completion(
+    client: Any, prompt: str, model_name: str, schema: Any, temperature: float = 0.7
+) -> Any:
+    """Return the minimal instance of ``schema`` (defaults, first enum value)."""
+    from ..structured import json_schema_of
+
+    _simulate(client, model_name, "structured_completion", prompt)
+    json_schema = json_schema_of(schema)
+    return _instance_of(json_schema, json_schema)
+
+
+async def async_structured_completion(
+    client: Any, prompt: str, model_name: str, schema: Any, temperature: float = 0.7
+) -> Any:
+    from ..structured import json_schema_of
+
+    await _async_simulate(client, model_name, "structured_completion", prompt)
+    json_schema = json_schema_of(schema)
+    return _instance_of(json_schema, json_schema)
+
+
+def _describe_image(prompt: str, image_path_or_url: str, model_name: str) -> str:
+    return f"[{model_name}] {prompt} ({os.path.basename(image_path_or_url)})"
+
+
+def vision_completion(
+    client: Any, prompt: str, image_path_or_url: str, model_name: str
+) -> str:
+    _simulate(client, model_name, "vision_completion", prompt)
+    return _completion(client, _describe_image(prompt, image_path_or_url, model_name))
+
+
+async def async_vision_completion(
+    client: Any, prompt: str, image_path_or_url: str, model_name: str
+) -> str:
+    await _async_simulate(client, model_name, "vision_completion", prompt)
+    return _completion(client, _describe_image(prompt, image_path_or_url, model_name))
+
+
+def image_generation(client: Any, prompt: str, model_name: str) -> ImageData:
+    _simulate(client, model_name, "image_generation", prompt)
+    return ImageData.from_bytes(_PNG_PIXEL, "image/png")
+
+
+async def async_image_generation(
+    client: Any, prompt: str, model_name: str
+) -> ImageData:
+    await _async_simulate(client, model_name, "image_generation", prompt)
+    return ImageData.from_bytes(_PNG_PIXEL, "image/png")
+
+
+def image_edit(
+    client: Any, prompt: str, image_path: str, model_name: str, **edit_params: Any
+) -> ImageData:
+    _simulate(client, model_name, "image_edit", prompt)
+    return ImageData.from_bytes(_PNG_PIXEL, "image/png")
+
+
+async def async_image_edit(
+    client: Any, prompt: str, image_path: str, model_name: str, **edit_params: Any
+) -> ImageData:
+    await _async_simulate(client, model_name, "image_edit", prompt)
+    return ImageData.from_bytes(_PNG_PIXEL, "image/png")
+
+
+def _describe_audio(seconds: float) -> str:
+    return f"fake transcript of {seconds:.2f} seconds"
+
+
+def transcribe_audio(
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    progress: Callable[[float], None] | None = None,
+) -> str:
+    _simulate(client, model_name, "transcribe_audio")
+    try:
+        with wave.open(audio_path, "rb") as reader:
+            seconds = reader.getnframes() / reader.getframerate()
+    except (wave.Error, EOFError, OSError) as e:
+        raise ProviderOperationError(
+            "fake", model_name, "audio transcription", f"Unreadable WAV file: {e}"
+        )
+    if progress is not None:
+        progress(1.0)
+    return _describe_audio(seconds)
+
+
+async def async_transcribe_audio(
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    progress: Callable[[float], None] | None = None,
+) -> str:
+    return await asyncio.to_thread(
+        transcribe_audio, client, audio_path, model_name, language_code, progress=progress
+    )
+
+
+def transcribe_audio_words(
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    progress: Callable[[float], None] | None = None,
+) -> Any:
+    """Return the fake transcript with its words spread evenly over the audio."""
+    from ..audio import TimedTranscript, WordTiming
+
+    text = transcribe_audio(client, audio_path, model_name, language_code)
+    with wave.open(audio_path, "rb") as reader:
+        seconds = reader.getnframes() / reader.getframerate()
+    tokens = text.split()
+    step = seconds / len(tokens)
+    words = [WordTiming(w, i * step, (i + 1) * step) for i, w in enumerate(tokens)]
+    if progress is not None:
+        progress(1.0)
+    return TimedTranscript(text, words)
+
+
+def stream_transcribe_audio(
+    client: Any,
+    chunks: Iterable[bytes],
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    sample_rate_hertz: int = 16000,
+    channels: int = 1,
+    interim_results: bool = True,
+) -> Iterator[Any]:
+    """Yield an interim segment per chunk and a final one when input ends."""
+    from ..audio import TranscriptSegment
+
+    _plan(client, "stream_transcribe_audio")
+    bytes_per_second = sample_rate_hertz * channels * 2
+    received = 0
+    for chunk in chunks:
+        received += len(chunk)
+        if interim_results:
+            seconds = received / bytes_per_second
+            yield TranscriptSegment(0.0, seconds, _describe_audio(seconds), is_final=False)
+    seconds = received / bytes_per_second
+    yield TranscriptSegment(0.0, seconds, _describe_audio(seconds))
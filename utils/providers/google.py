@@ -14,14 +14,15 @@ Key Changes (2025):
 from __future__ import annotations
 
 import asyncio
-import base64
 import os
 import random
 import time
-from typing import Any, Tuple
+import wave
+from typing import Any, Callable, Iterable, Iterator
 
 from ..errors import ProviderOperationError
 from ..http import TOTAL_TIMEOUT
+from ..images import ImageData
 from ..rate_limit import rate_limit
 
 
@@ -31,8 +32,8 @@ def _is_image_model(model_name: str) -> bool:
     return "imagen" in lowered or "image" in lowered
 
 
-def _extract_generated_image(response: Any, model_name: str) -> Tuple[str, str]:
-    """Normalize Google image responses to ``(base64, mime_type)``."""
+def _extract_generated_image(response: Any, model_name: str) -> ImageData:
+    """Normalize Google image responses to :class:`ImageData`."""
     generated = getattr(response, "generated_images", None) or []
     if not generated:
         raise ProviderOperationError(
@@ -46,10 +47,10 @@ def _extract_generated_image(response: Any, model_name: str) -> Tuple[str, str]:
         mime_type = getattr(image_obj, "mime_type", None) or "image/png"
         image_bytes = getattr(image_obj, "image_bytes", None)
         if isinstance(image_bytes, bytes) and image_bytes:
-            return base64.b64encode(image_bytes).decode("utf-8"), mime_type
+            return ImageData.from_bytes(image_bytes, mime_type)
         inline_b64 = getattr(image_obj, "bytes_base64", None)
         if isinstance(inline_b64, str) and inline_b64:
-            return inline_b64, mime_type
+            return ImageData.from_base64(inline_b64, mime_type)
 
     raise ProviderOperationError(
         "google",
@@ -97,7 +98,7 @@ def _is_client_not_found(error: Exception) -> bool:
 
 def image_generation(
     client: Any, prompt: str, model_name: str
-) -> tuple[str, str]:
+) -> ImageData:
     """
     Generate an image using a Google image generation model.
 
@@ -107,7 +108,8 @@ def image_generation(
         model_name (str): The name of the image generation model.
 
     Returns:
-        A tuple containing the base64-encoded image data and its MIME type.
+        An :class:`ImageData` with the raw image bytes and MIME type (it
+        still unpacks as ``(base64, mime_type)``).
     """
     _, genai_types = _get_google_genai_imports()
     if not genai_types:
@@ -139,12 +141,12 @@ def image_generation(
                             data = getattr(blob, "data", None)
                             mime_type = getattr(blob, "mime_type", "image/png")
                             if data:
-                                # Return base64-encoded string
+                                # Hand raw bytes through; encode only on demand
                                 if isinstance(data, bytes):
-                                    return base64.b64encode(data).decode("utf-8"), mime_type
+                                    return ImageData.from_bytes(data, mime_type)
                                 elif isinstance(data, str):
                                     # Already base64 encoded
-                                    return data, mime_type
+                                    return ImageData.from_base64(data, mime_type)
 
         raise ProviderOperationError(
             "google", model_name, "image_generation", "No image data found in response"
@@ -229,6 +231,110 @@ def text_completion(
         raise ProviderOperationError("google", model_name, "completion", str(e))
 
 
+def chat_completion(
+    client: Any, messages: list[dict[str, Any]], model_name: str, temperature: float = 0.7
+) -> str:
+    """Complete a conversation given as ``{"role", "content"}`` messages.
+
+    System messages become the ``system_instruction``; assistant turns use
+    Gemini's ``model`` role.
+    """
+    try:
+        api_key = os.getenv("GOOGLE_API_KEY", "")
+        rate_limit("google", api_key, model_name)
+        _, genai_types = _get_google_genai_imports()
+        if not genai_types:
+            raise ProviderOperationError(
+                "google", model_name, "chat completion", "google.genai is not installed"
+            )
+        system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+        contents = [
+            {
+                "role": "model" if m["role"] == "assistant" else "user",
+                "parts": [{"text": m["content"]}],
+            }
+            for m in messages
+            if m["role"] != "system"
+        ]
+        response = client.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=genai_types.GenerateContentConfig(
+                temperature=temperature,
+                system_instruction=system or None,
+                response_modalities=["TEXT"],
+            ),
+        )
+        return response.text or ""
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError("google", model_name, "chat completion", str(e))
+
+
+async def async_chat_completion(
+    client: Any, messages: list[dict[str, Any]], model_name: str, temperature: float = 0.7
+) -> str:
+    return await asyncio.to_thread(
+        chat_completion, client, messages, model_name, temperature
+    )
+
+
+def stream_text_completion(
+    client: Any, prompt: str, model_name: str, temperature: float = 0.7
+) -> Iterator[str]:
+    """Yield the completion text in deltas as the model produces them."""
+    _, genai_types = _get_google_genai_imports()
+    if not genai_types:
+        raise ProviderOperationError(
+            "google", model_name, "completion", "google.genai is not installed"
+        )
+    try:
+        api_key = os.getenv("GOOGLE_API_KEY", "")
+        rate_limit("google", api_key, model_name)
+        for chunk in client.models.generate_content_stream(
+            model=model_name,
+            contents=prompt,
+            config=genai_types.GenerateContentConfig(
+                temperature=temperature,
+                response_modalities=["TEXT"],
+            ),
+        ):
+            if getattr(chunk, "text", None):
+                yield chunk.text
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError("google", model_name, "completion", str(e))
+
+
+def structured_completion(
+    client: Any, prompt: str, model_name: str, schema: Any, temperature: float = 0.7
+) -> Any:
+    """Return JSON from a ``response_schema`` constrained generation."""
+    import json
+
+    _, genai_types = _get_google_genai_imports()
+    if not genai_types:
+        raise ProviderOperationError(
+            "google", model_name, "structured completion", "google.genai is not installed"
+        )
+    try:
+        api_key = os.getenv("GOOGLE_API_KEY", "")
+        rate_limit("google", api_key, model_name)
+        # response_schema takes pydantic classes directly and dicts in the
+        # OpenAPI subset Gemini supports.
+        response = client.models.generate_content(
+            model=model_name,
+            contents=prompt,
+            config=genai_types.GenerateContentConfig(
+                temperature=temperature,
+                response_mime_type="application/json",
+                response_schema=schema,
+            ),
+        )
+        text = response.text
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError("google", model_name, "structured completion", str(e))
+    return json.loads(text)
+
+
 async def async_text_completion(
     client: Any, prompt: str, model_name: str, temperature: float = 0.7
 ) -> str:
@@ -341,13 +447,13 @@ async def async_vision_completion(*args: Any, **kwargs: Any) -> str:  # pragma:
 
 async def async_image_generation(
     client: Any, prompt: str, model_name: str
-) -> Tuple[str, str]:
+) -> ImageData:
     return await asyncio.to_thread(image_generation, client, prompt, model_name)
 
 
 def image_edit(
     client: Any, prompt: str, image_path: str, model_name: str, **edit_params: Any
-) -> Tuple[str, str]:
+) -> ImageData:
     """Edit an image using Google's Gemini image models.
     
     Gemini models support image editing through text+image prompts.
@@ -404,12 +510,12 @@ def image_edit(
                             data = getattr(blob, "data", None)
                             result_mime_type = getattr(blob, "mime_type", "image/png")
                             if data:
-                                # Return base64-encoded string
+                                # Hand raw bytes through; encode only on demand
                                 if isinstance(data, bytes):
-                                    return base64.b64encode(data).decode("utf-8"), result_mime_type
+                                    return ImageData.from_bytes(data, result_mime_type)
                                 elif isinstance(data, str):
                                     # Already base64 encoded
-                                    return data, result_mime_type
+                                    return ImageData.from_base64(data, result_mime_type)
         
         raise ProviderOperationError(
             "google", model_name, "image_edit", "No edited image in response"
@@ -425,23 +531,165 @@ def image_edit(
 
 async def async_image_edit(
     *args: Any, **kwargs: Any
-) -> Tuple[str, str]:  # pragma: no cover
+) -> ImageData:  # pragma: no cover
     return await asyncio.to_thread(image_edit, *args, **kwargs)
 
 
-def transcribe_audio(
-    client: Any, audio_path: str, model_name: str, language_code: str = "en-US"
+# Speech-to-Text limits: sync recognize handles ~1 min, inline content is
+# capped at 10 MB and a streaming session at ~5 min of audio.
+SYNC_RECOGNIZE_MAX_SECONDS = 55.0
+INLINE_AUDIO_MAX_BYTES = 10 * 1024 * 1024
+STREAM_SESSION_SECONDS = 280.0
+LRO_POLL_SECONDS = float(os.getenv("AGA_GOOGLE_LRO_POLL_SECONDS", "5"))
+LRO_TIMEOUT_SECONDS = float(os.getenv("AGA_GOOGLE_LRO_TIMEOUT_SECONDS", "3600"))
+_AUDIO_READ_BYTES = 64 * 1024
+
+
+def _wav_params(audio_path: str) -> tuple[int, int, int, float] | None:
+    """Return ``(sample_rate, channels, sample_width, seconds)`` of a PCM WAV."""
+    try:
+        with wave.open(audio_path, "rb") as reader:
+            rate = reader.getframerate()
+            return (
+                rate,
+                reader.getnchannels(),
+                reader.getsampwidth(),
+                reader.getnframes() / rate,
+            )
+    except (wave.Error, EOFError):
+        return None
+
+
+def _join_results(results: Iterable[Any]) -> str:
+    return " ".join(
+        r.alternatives[0].transcript.strip() for r in results if r.alternatives
+    ).strip()
+
+
+def _report(progress: Callable[[float], None] | None, fraction: float) -> None:
+    if progress is not None:
+        progress(min(1.0, max(0.0, fraction)))
+
+
+def _poll_operation(
+    operation: Any, model_name: str, progress: Callable[[float], None] | None
+) -> Any:
+    """Wait for a long-running recognize operation, reporting its progress."""
+    deadline = time.monotonic() + LRO_TIMEOUT_SECONDS
+    while not operation.done():
+        metadata = getattr(operation, "metadata", None)
+        percent = getattr(metadata, "progress_percent", None)
+        if percent is not None:
+            _report(progress, percent / 100)
+        if time.monotonic() > deadline:
+            raise ProviderOperationError(
+                "google",
+                model_name,
+                "audio transcription",
+                f"long_running_recognize did not finish within {LRO_TIMEOUT_SECONDS:.0f}s",
+            )
+        time.sleep(LRO_POLL_SECONDS)
+    return operation.result()
+
+
+def _iter_pcm(
+    audio_path: str,
+    session_bytes: int,
+    on_read: Callable[[int], None],
+) -> Iterator[Iterator[bytes]]:
+    """Yield one bounded-read chunk iterator per streaming session."""
+    with wave.open(audio_path, "rb") as reader:
+        frame_bytes = reader.getsampwidth() * reader.getnchannels()
+        frames_per_read = max(1, _AUDIO_READ_BYTES // frame_bytes)
+        remaining = reader.getnframes()
+
+        def session() -> Iterator[bytes]:
+            nonlocal remaining
+            sent = 0
+            while remaining and sent < session_bytes:
+                data = reader.readframes(min(frames_per_read, remaining))
+                if not data:
+                    remaining = 0
+                    break
+                remaining -= len(data) // frame_bytes
+                sent += len(data)
+                on_read(len(data))
+                yield data
+
+        while remaining:
+            yield session()
+
+
+def _stream_file(
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str,
+    params: tuple[int, int, int, float],
+    progress: Callable[[float], None] | None,
 ) -> str:
-    api_key = os.getenv("GOOGLE_API_KEY", "")
-    rate_limit("google", api_key, model_name)
+    """Transcribe a large local WAV through consecutive streaming sessions.
+
+    Audio is read in bounded chunks, so memory use does not grow with the
+    file size.
+    """
+    rate, channels, _, _ = params
+    total = max(1, os.path.getsize(audio_path))
+    session_bytes = int(STREAM_SESSION_SECONDS * rate * channels * 2)
+    read = 0
+
+    def on_read(n: int) -> None:
+        nonlocal read
+        read += n
+        _report(progress, read / total)
+
+    texts = []
+    for session in _iter_pcm(audio_path, session_bytes, on_read):
+        segments = stream_transcribe_audio(
+            client,
+            session,
+            model_name,
+            language_code,
+            sample_rate_hertz=rate,
+            channels=channels,
+            interim_results=False,
+        )
+        texts.extend(seg.text for seg in segments if seg.is_final and seg.text)
+    return " ".join(texts)
+
+
+def _recognize(
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    config: dict[str, Any],
+    progress: Callable[[float], None] | None,
+) -> list[Any] | None:
+    """Run recognize or long_running_recognize and return the results.
+
+    Returns ``None`` for local files over the inline limit, which have to be
+    streamed instead.
+    """
+    if audio_path.startswith("gs://"):
+        operation = client.long_running_recognize(
+            config=config, audio={"uri": audio_path}
+        )
+        return list(_poll_operation(operation, model_name, progress).results)
+    if os.path.getsize(audio_path) > INLINE_AUDIO_MAX_BYTES:
+        return None
+    params = _wav_params(audio_path)
     with open(audio_path, "rb") as audio_file:
-        content = audio_file.read()
-    audio = {"content": content}
-    config = {"language_code": language_code}
-    response = client.recognize(config=config, audio=audio, timeout=TOTAL_TIMEOUT)
-    if response.results:
-        return response.results[0].alternatives[0].transcript
-    raise ProviderOperationError(
+        audio = {"content": audio_file.read()}
+    if params is not None and params[3] > SYNC_RECOGNIZE_MAX_SECONDS:
+        operation = client.long_running_recognize(config=config, audio=audio)
+        response = _poll_operation(operation, model_name, progress)
+    else:
+        response = client.recognize(config=config, audio=audio, timeout=TOTAL_TIMEOUT)
+    return list(response.results)
+
+
+def _no_result(model_name: str) -> ProviderOperationError:
+    return ProviderOperationError(
         "google",
         model_name,
         "audio transcription",
@@ -449,9 +697,153 @@ def transcribe_audio(
     )
 
 
+def transcribe_audio(
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    progress: Callable[[float], None] | None = None,
+) -> str:
+    """Transcribe ``audio_path`` with the recognize method suited to its size.
+
+    * ``gs://`` URIs and inline audio over a minute long use
+      ``long_running_recognize``, polled every ``LRO_POLL_SECONDS``.
+    * Local 16-bit WAV files over the 10 MB inline limit are streamed from
+      disk in bounded chunks.
+    * Short clips use synchronous ``recognize``.
+
+    ``progress`` is called with the completed fraction (0.0-1.0).
+    """
+    api_key = os.getenv("GOOGLE_API_KEY", "")
+    rate_limit("google", api_key, model_name)
+    results = _recognize(
+        client, audio_path, model_name, {"language_code": language_code}, progress
+    )
+    if results is None:
+        params = _wav_params(audio_path)
+        if params is None or params[2] != 2:
+            raise ProviderOperationError(
+                "google",
+                model_name,
+                "audio transcription",
+                "Audio over 10 MB must be a 16-bit PCM WAV file or a gs:// URI.",
+            )
+        text = _stream_file(
+            client, audio_path, model_name, language_code, params, progress
+        )
+    else:
+        text = _join_results(results)
+    if not text:
+        raise _no_result(model_name)
+    _report(progress, 1.0)
+    return text
+
+
+def transcribe_audio_words(
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    progress: Callable[[float], None] | None = None,
+) -> Any:
+    """Transcribe ``audio_path`` and return a ``TimedTranscript`` with word offsets."""
+    from ..audio import TimedTranscript, WordTiming
+
+    api_key = os.getenv("GOOGLE_API_KEY", "")
+    rate_limit("google", api_key, model_name)
+    config = {"language_code": language_code, "enable_word_time_offsets": True}
+    results = _recognize(client, audio_path, model_name, config, progress)
+    if results is None:
+        raise ProviderOperationError(
+            "google",
+            model_name,
+            "audio transcription",
+            "Word timings for audio over 10 MB require a gs:// URI.",
+        )
+    if not results:
+        raise _no_result(model_name)
+    _report(progress, 1.0)
+    words = [
+        WordTiming(w.word, w.start_time.total_seconds(), w.end_time.total_seconds())
+        for r in results
+        if r.alternatives
+        for w in r.alternatives[0].words
+    ]
+    return TimedTranscript(_join_results(results), words)
+
+
 async def async_transcribe_audio(
-    client: Any, audio_path: str, model_name: str, language_code: str = "en-US"
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    progress: Callable[[float], None] | None = None,
 ) -> str:
     return await asyncio.to_thread(
-        transcribe_audio, client, audio_path, model_name, language_code
+        transcribe_audio,
+        client,
+        audio_path,
+        model_name,
+        language_code,
+        progress=progress,
+    )
+
+
+def stream_transcribe_audio(
+    client: Any,
+    chunks: Iterable[bytes],
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    sample_rate_hertz: int = 16000,
+    channels: int = 1,
+    interim_results: bool = True,
+) -> Iterator[Any]:
+    """Transcribe LINEAR16 ``chunks`` with Speech-to-Text streaming recognize.
+
+    Google limits a single stream to about five minutes of audio.
+    """
+    from google.cloud import speech
+
+    from ..audio import TranscriptSegment
+
+    api_key = os.getenv("GOOGLE_API_KEY", "")
+    rate_limit("google", api_key, model_name)
+    streaming_config = speech.StreamingRecognitionConfig(
+        config=speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate_hertz,
+            audio_channel_count=channels,
+            language_code=language_code,
+        ),
+        interim_results=interim_results,
     )
+    requests = (
+        speech.StreamingRecognizeRequest(audio_content=chunk) for chunk in chunks
+    )
+    final_end = 0.0
+    try:
+        responses = client.streaming_recognize(
+            config=streaming_config, requests=requests
+        )
+        for response in responses:
+            for result in response.results:
+                if not result.alternatives:
+                    continue
+                end_time = getattr(result, "result_end_time", None)
+                end = end_time.total_seconds() if end_time is not None else final_end
+                yield TranscriptSegment(
+                    final_end,
+                    end,
+                    result.alternatives[0].transcript.strip(),
+                    is_final=bool(result.is_final),
+                )
+                if result.is_final:
+                    final_end = end
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError(
+            "google", model_name, "audio transcription", str(e)
+        )
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import base64
 import os
 from io import BytesIO
-from typing import Any, Tuple
+from typing import Any, Iterator
 
 from ..errors import ProviderOperationError
 from ..http import TOTAL_TIMEOUT
+from ..images import ImageData
 from ..rate_limit import rate_limit
 
 
@@ -48,6 +48,50 @@ async def async_text_completion(
     )
 
 
+def chat_completion(
+    client: Any, messages: list[dict[str, Any]], model_name: str, temperature: float = 0.7
+) -> str:
+    """Complete a conversation given as ``{"role", "content"}`` messages."""
+    try:
+        api_key = os.getenv("HUGGINGFACE_API_KEY", "")
+        rate_limit("huggingface", api_key, model_name)
+        response = client.chat_completion(
+            messages=list(messages),
+            temperature=max(0.1, temperature),
+            max_tokens=4096,
+        )
+        return response.choices[0].message.content
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError("huggingface", model_name, "chat completion", str(e))
+
+
+async def async_chat_completion(
+    client: Any, messages: list[dict[str, Any]], model_name: str, temperature: float = 0.7
+) -> str:
+    return await asyncio.to_thread(
+        chat_completion, client, messages, model_name, temperature
+    )
+
+
+def stream_text_completion(
+    client: Any, prompt: str, model_name: str, temperature: float = 0.7
+) -> Iterator[str]:
+    """Yield the completion text in deltas as the model produces them."""
+    try:
+        api_key = os.getenv("HUGGINGFACE_API_KEY", "")
+        rate_limit("huggingface", api_key, model_name)
+        for chunk in client.chat_completion(
+            messages=[{"role": "user", "content": prompt}],
+            temperature=max(0.1, temperature),
+            max_tokens=4096,
+            stream=True,
+        ):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError("huggingface", model_name, "completion", str(e))
+
+
 def vision_completion(*args: Any, **kwargs: Any) -> str:  # pragma: no cover
     raise ProviderOperationError(
         "huggingface", kwargs.get("model_name", ""), "vision", "Not implemented"
@@ -58,7 +102,7 @@ async def async_vision_completion(*args: Any, **kwargs: Any) -> str:  # pragma:
     return await asyncio.to_thread(vision_completion, *args, **kwargs)
 
 
-def image_generation(client: Any, prompt: str, model_name: str) -> Tuple[str, str]:
+def image_generation(client: Any, prompt: str, model_name: str) -> ImageData:
     api_key = os.getenv("HUGGINGFACE_API_KEY", "")
     rate_limit("huggingface", api_key, model_name)
     # Some versions of huggingface_hub do not support a per-call `timeout` kwarg.
@@ -69,16 +113,16 @@ def image_generation(client: Any, prompt: str, model_name: str) -> Tuple[str, st
         pil_image = client.text_to_image(prompt)
     buffered = BytesIO()
     pil_image.save(buffered, format="PNG")
-    return base64.b64encode(buffered.getvalue()).decode("utf-8"), "image/png"
+    return ImageData.from_bytes(buffered.getvalue(), "image/png")
 
 
 async def async_image_generation(
     client: Any, prompt: str, model_name: str
-) -> Tuple[str, str]:
+) -> ImageData:
     return await asyncio.to_thread(image_generation, client, prompt, model_name)
 
 
-def image_edit(*args: Any, **kwargs: Any) -> Tuple[str, str]:  # pragma: no cover
+def image_edit(*args: Any, **kwargs: Any) -> ImageData:  # pragma: no cover
     try:
         client = args[0] if args else kwargs.get("client")
         prompt = args[1] if len(args) > 1 else kwargs.get("prompt", "")
@@ -115,14 +159,14 @@ def image_edit(*args: Any, **kwargs: Any) -> Tuple[str, str]:  # pragma: no cove
 
         buffered = BytesIO()
         pil_image.save(buffered, format="PNG")
-        return base64.b64encode(buffered.getvalue()).decode("utf-8"), "image/png"
+        return ImageData.from_bytes(buffered.getvalue(), "image/png")
     except Exception as e:  # pragma: no cover - network dependent
         raise ProviderOperationError("huggingface", kwargs.get("model_name", ""), "image edit", str(e))
 
 
 async def async_image_edit(
     *args: Any, **kwargs: Any
-) -> Tuple[str, str]:  # pragma: no cover
+) -> ImageData:  # pragma: no cover
     return await asyncio.to_thread(image_edit, *args, **kwargs)
 
 
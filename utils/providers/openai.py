@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import json
 import os
-from typing import Any, Tuple
+from typing import Any, Callable, Iterator
 
 from ..errors import ProviderOperationError
 from ..http import TOTAL_TIMEOUT, request
+from ..images import ImageData
 from ..rate_limit import rate_limit
 
+# API key variable per provider name served by these functions; the key is
+# part of the rate-limit bucket so each provider/key pair is throttled alone.
+API_KEY_ENVS = {"openai": "OPENAI_API_KEY"}
+
 
 def setup_client(model_name: str, config: dict[str, Any]) -> Any:
     from openai import OpenAI
@@ -28,6 +34,11 @@ async def async_setup_client(model_name: str, config: dict[str, Any]) -> Any:
     return AsyncOpenAI(api_key=api_key)
 
 
+def _rate_limit(provider: str, model_name: str) -> None:
+    api_key = os.getenv(API_KEY_ENVS.get(provider, "OPENAI_API_KEY"), "")
+    rate_limit(provider, api_key, model_name)
+
+
 def _supports_temperature(model_name: str) -> bool:
     """Return True if we should attempt to set temperature for the model."""
     # Reasoning models (o*) have never supported temperature overrides, so skip
@@ -90,11 +101,15 @@ async def _async_call_with_temperature_retry(
 
 
 def text_completion(
-    client: Any, prompt: str, model_name: str, temperature: float = 0.7
+    client: Any,
+    prompt: str,
+    model_name: str,
+    temperature: float = 0.7,
+    *,
+    provider: str = "openai",
 ) -> str:
     try:
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        rate_limit("openai", api_key, model_name)
+        _rate_limit(provider, model_name)
         try:
             chat_params: dict[str, Any] = {
                 "model": model_name,
@@ -124,15 +139,19 @@ def text_completion(
                 return response.choices[0].text
             raise api_error
     except Exception as e:  # pragma: no cover - network dependent
-        raise ProviderOperationError("openai", model_name, "completion", str(e))
+        raise ProviderOperationError(provider, model_name, "completion", str(e))
 
 
 async def async_text_completion(
-    client: Any, prompt: str, model_name: str, temperature: float = 0.7
+    client: Any,
+    prompt: str,
+    model_name: str,
+    temperature: float = 0.7,
+    *,
+    provider: str = "openai",
 ) -> str:
     try:
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        rate_limit("openai", api_key, model_name)
+        _rate_limit(provider, model_name)
         try:
             chat_params: dict[str, Any] = {
                 "model": model_name,
@@ -162,11 +181,161 @@ async def async_text_completion(
                 return response.choices[0].text
             raise api_error
     except Exception as e:  # pragma: no cover - network dependent
-        raise ProviderOperationError("openai", model_name, "completion", str(e))
+        raise ProviderOperationError(provider, model_name, "completion", str(e))
+
+
+def _chat_params(
+    messages: list[dict[str, Any]], model_name: str, temperature: float
+) -> dict[str, Any]:
+    params: dict[str, Any] = {
+        "model": model_name,
+        "messages": list(messages),
+        "timeout": TOTAL_TIMEOUT,
+    }
+    if _supports_temperature(model_name):
+        params["temperature"] = temperature
+    return params
+
+
+def chat_completion(
+    client: Any,
+    messages: list[dict[str, Any]],
+    model_name: str,
+    temperature: float = 0.7,
+    *,
+    provider: str = "openai",
+) -> str:
+    """Complete a conversation given as ``{"role", "content"}`` messages."""
+    try:
+        _rate_limit(provider, model_name)
+        response = _call_with_temperature_retry(
+            client.chat.completions.create, _chat_params(messages, model_name, temperature)
+        )
+        return response.choices[0].message.content
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError(provider, model_name, "chat completion", str(e))
+
+
+async def async_chat_completion(
+    client: Any,
+    messages: list[dict[str, Any]],
+    model_name: str,
+    temperature: float = 0.7,
+    *,
+    provider: str = "openai",
+) -> str:
+    try:
+        _rate_limit(provider, model_name)
+        response = await _async_call_with_temperature_retry(
+            client.chat.completions.create, _chat_params(messages, model_name, temperature)
+        )
+        return response.choices[0].message.content
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError(provider, model_name, "chat completion", str(e))
+
+
+def stream_text_completion(
+    client: Any,
+    prompt: str,
+    model_name: str,
+    temperature: float = 0.7,
+    *,
+    provider: str = "openai",
+) -> Iterator[str]:
+    """Yield the completion text in deltas as the model produces them."""
+    try:
+        _rate_limit(provider, model_name)
+        params: dict[str, Any] = {
+            "model": model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "timeout": TOTAL_TIMEOUT,
+            "stream": True,
+        }
+        if _supports_temperature(model_name):
+            params["temperature"] = temperature
+        stream = _call_with_temperature_retry(client.chat.completions.create, params)
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError(provider, model_name, "completion", str(e))
+
+
+def _structured_params(
+    prompt: str, model_name: str, schema: Any, temperature: float
+) -> dict[str, Any]:
+    from ..structured import json_schema_of, schema_name
+
+    params: dict[str, Any] = {
+        "model": model_name,
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {
+            "type": "json_schema",
+            # Strict mode rejects common pydantic schemas (optional fields,
+            # additionalProperties); the result is validated afterwards.
+            "json_schema": {
+                "name": schema_name(schema),
+                "schema": json_schema_of(schema),
+                "strict": False,
+            },
+        },
+        "timeout": TOTAL_TIMEOUT,
+    }
+    if _supports_temperature(model_name):
+        params["temperature"] = temperature
+    return params
+
+
+def structured_completion(
+    client: Any,
+    prompt: str,
+    model_name: str,
+    schema: Any,
+    temperature: float = 0.7,
+    *,
+    provider: str = "openai",
+) -> Any:
+    """Return JSON parsed from a ``response_format=json_schema`` completion."""
+    try:
+        _rate_limit(provider, model_name)
+        response = _call_with_temperature_retry(
+            client.chat.completions.create,
+            _structured_params(prompt, model_name, schema, temperature),
+        )
+        content = response.choices[0].message.content
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError(provider, model_name, "structured completion", str(e))
+    return json.loads(content)
+
+
+async def async_structured_completion(
+    client: Any,
+    prompt: str,
+    model_name: str,
+    schema: Any,
+    temperature: float = 0.7,
+    *,
+    provider: str = "openai",
+) -> Any:
+    try:
+        _rate_limit(provider, model_name)
+        response = await _async_call_with_temperature_retry(
+            client.chat.completions.create,
+            _structured_params(prompt, model_name, schema, temperature),
+        )
+        content = response.choices[0].message.content
+    except Exception as e:  # pragma: no cover - network dependent
+        raise ProviderOperationError(provider, model_name, "structured completion", str(e))
+    return json.loads(content)
 
 
 def vision_completion(
-    client: Any, prompt: str, image_path_or_url: str, model_name: str
+    client: Any,
+    prompt: str,
+    image_path_or_url: str,
+    model_name: str,
+    *,
+    provider: str = "openai",
 ) -> str:
     """Process vision inputs with OpenAI's multimodal models (GPT-4o, GPT-4 Vision, etc.).
     
@@ -176,8 +345,7 @@ def vision_completion(
     import requests
     
     try:
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        rate_limit("openai", api_key, model_name)
+        _rate_limit(provider, model_name)
         
         # Load image data
         image_data = None
@@ -230,20 +398,24 @@ def vision_completion(
         
     except Exception as e:
         raise ProviderOperationError(
-            "openai", model_name, "vision_completion", str(e)
+            provider, model_name, "vision_completion", str(e)
         )
 
 
 async def async_vision_completion(
-    client: Any, prompt: str, image_path_or_url: str, model_name: str
+    client: Any,
+    prompt: str,
+    image_path_or_url: str,
+    model_name: str,
+    *,
+    provider: str = "openai",
 ) -> str:
     """Async version of vision_completion for OpenAI models."""
     import mimetypes
     import aiofiles
     
     try:
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        rate_limit("openai", api_key, model_name)
+        _rate_limit(provider, model_name)
         
         # Load image data
         image_data = None
@@ -297,49 +469,109 @@ async def async_vision_completion(
         
     except Exception as e:
         raise ProviderOperationError(
-            "openai", model_name, "vision_completion", str(e)
+            provider, model_name, "vision_completion", str(e)
         )
 
 
-def image_generation(client: Any, prompt: str, model_name: str) -> Tuple[str, str]:
-    api_key = os.getenv("OPENAI_API_KEY", "")
-    rate_limit("openai", api_key, model_name)
-    params = {"model": model_name, "prompt": prompt, "n": 1, "size": "1024x1024"}
+# Images per request; dall-e-3 rejects n > 1.
+_MAX_IMAGES_PER_REQUEST = {"dall-e-3": 1}
+
+
+def max_images_per_request(model_name: str) -> int:
+    return _MAX_IMAGES_PER_REQUEST.get(model_name, 10)
+
+
+def _image_generation_params(prompt: str, model_name: str, n: int) -> dict[str, Any]:
+    params: dict[str, Any] = {
+        "model": model_name,
+        "prompt": prompt,
+        "n": n,
+        "size": "1024x1024",
+    }
     if model_name != "gpt-image-1":
         params["response_format"] = "b64_json"
+    return params
+
+
+def image_generation_batch(
+    client: Any,
+    prompt: str,
+    model_name: str,
+    n: int = 1,
+    *,
+    provider: str = "openai",
+) -> list[ImageData]:
+    """Generate ``n`` variants of ``prompt`` in a single request."""
+    _rate_limit(provider, model_name)
+    params = _image_generation_params(prompt, model_name, n)
     response = client.images.generate(timeout=TOTAL_TIMEOUT, **params)
-    if model_name == "gpt-image-1" and response.data[0].url:
-        img_resp = request("GET", response.data[0].url)
-        img_resp.raise_for_status()
-        image_data_base64 = base64.b64encode(img_resp.content).decode("utf-8")
-    else:
-        image_data_base64 = response.data[0].b64_json
-    return image_data_base64, "image/png"
+    images = []
+    for item in response.data:
+        if model_name == "gpt-image-1" and item.url:
+            img_resp = request("GET", item.url)
+            img_resp.raise_for_status()
+            images.append(ImageData.from_bytes(img_resp.content, "image/png"))
+        else:
+            images.append(ImageData.from_base64(item.b64_json, "image/png"))
+    return images
+
+
+async def async_image_generation_batch(
+    client: Any,
+    prompt: str,
+    model_name: str,
+    n: int = 1,
+    *,
+    provider: str = "openai",
+) -> list[ImageData]:
+    _rate_limit(provider, model_name)
+    params = _image_generation_params(prompt, model_name, n)
+    response = await client.images.generate(timeout=TOTAL_TIMEOUT, **params)
+    images = []
+    for item in response.data:
+        if model_name == "gpt-image-1" and item.url:
+            img_resp = await asyncio.to_thread(request, "GET", item.url)
+            img_resp.raise_for_status()
+            images.append(ImageData.from_bytes(img_resp.content, "image/png"))
+        else:
+            images.append(ImageData.from_base64(item.b64_json, "image/png"))
+    return images
+
+
+def image_generation(
+    client: Any,
+    prompt: str,
+    model_name: str,
+    *,
+    provider: str = "openai",
+) -> ImageData:
+    return image_generation_batch(client, prompt, model_name, n=1, provider=provider)[0]
 
 
 async def async_image_generation(
-    client: Any, prompt: str, model_name: str
-) -> Tuple[str, str]:
-    api_key = os.getenv("OPENAI_API_KEY", "")
-    rate_limit("openai", api_key, model_name)
-    params = {"model": model_name, "prompt": prompt, "n": 1, "size": "1024x1024"}
-    if model_name != "gpt-image-1":
-        params["response_format"] = "b64_json"
-    response = await client.images.generate(timeout=TOTAL_TIMEOUT, **params)
-    if model_name == "gpt-image-1" and response.data[0].url:
-        img_resp = await asyncio.to_thread(request, "GET", response.data[0].url)
-        img_resp.raise_for_status()
-        image_data_base64 = base64.b64encode(img_resp.content).decode("utf-8")
-    else:
-        image_data_base64 = response.data[0].b64_json
-    return image_data_base64, "image/png"
+    client: Any,
+    prompt: str,
+    model_name: str,
+    *,
+    provider: str = "openai",
+) -> ImageData:
+    return (
+        await async_image_generation_batch(
+            client, prompt, model_name, n=1, provider=provider
+        )
+    )[0]
 
 
 def image_edit(
-    client: Any, prompt: str, image_path: str, model_name: str, **edit_params: Any
-) -> Tuple[str, str]:
-    api_key = os.getenv("OPENAI_API_KEY", "")
-    rate_limit("openai", api_key, model_name)
+    client: Any,
+    prompt: str,
+    image_path: str,
+    model_name: str,
+    *,
+    provider: str = "openai",
+    **edit_params: Any,
+) -> ImageData:
+    _rate_limit(provider, model_name)
     with open(image_path, "rb") as image_file:
         response = client.images.edit(
             model=model_name,
@@ -348,14 +580,19 @@ def image_edit(
             timeout=TOTAL_TIMEOUT,
             **edit_params,
         )
-    return response.data[0].b64_json, "image/png"
+    return ImageData.from_base64(response.data[0].b64_json, "image/png")
 
 
 async def async_image_edit(
-    client: Any, prompt: str, image_path: str, model_name: str, **edit_params: Any
-) -> Tuple[str, str]:
-    api_key = os.getenv("OPENAI_API_KEY", "")
-    rate_limit("openai", api_key, model_name)
+    client: Any,
+    prompt: str,
+    image_path: str,
+    model_name: str,
+    *,
+    provider: str = "openai",
+    **edit_params: Any,
+) -> ImageData:
+    _rate_limit(provider, model_name)
     with open(image_path, "rb") as image_file:
         response = await client.images.edit(
             model=model_name,
@@ -364,32 +601,76 @@ async def async_image_edit(
             timeout=TOTAL_TIMEOUT,
             **edit_params,
         )
-    return response.data[0].b64_json, "image/png"
+    return ImageData.from_base64(response.data[0].b64_json, "image/png")
 
 
 def transcribe_audio(
-    client: Any, audio_path: str, model_name: str, language_code: str = "en-US"
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    progress: Callable[[float], None] | None = None,
+    provider: str = "openai",
 ) -> str:
-    api_key = os.getenv("OPENAI_API_KEY", "")
-    rate_limit("openai", api_key, model_name)
+    _rate_limit(provider, model_name)
     with open(audio_path, "rb") as audio_file:
         transcription = client.audio.transcriptions.create(
             model=model_name,
             file=audio_file,
             timeout=TOTAL_TIMEOUT,
         )
+    if progress is not None:
+        progress(1.0)
     return transcription.text
 
 
 async def async_transcribe_audio(
-    client: Any, audio_path: str, model_name: str, language_code: str = "en-US"
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    progress: Callable[[float], None] | None = None,
+    provider: str = "openai",
 ) -> str:
-    api_key = os.getenv("OPENAI_API_KEY", "")
-    rate_limit("openai", api_key, model_name)
+    _rate_limit(provider, model_name)
     with open(audio_path, "rb") as audio_file:
         transcription = await client.audio.transcriptions.create(
             model=model_name,
             file=audio_file,
             timeout=TOTAL_TIMEOUT,
         )
+    if progress is not None:
+        progress(1.0)
     return transcription.text
+
+
+def transcribe_audio_words(
+    client: Any,
+    audio_path: str,
+    model_name: str,
+    language_code: str = "en-US",
+    *,
+    progress: Callable[[float], None] | None = None,
+    provider: str = "openai",
+) -> Any:
+    """Transcribe ``audio_path`` and return a ``TimedTranscript`` with word offsets."""
+    from ..audio import TimedTranscript, WordTiming
+
+    _rate_limit(provider, model_name)
+    with open(audio_path, "rb") as audio_file:
+        transcription = client.audio.transcriptions.create(
+            model=model_name,
+            file=audio_file,
+            response_format="verbose_json",
+            timestamp_granularities=["word"],
+            timeout=TOTAL_TIMEOUT,
+        )
+    if progress is not None:
+        progress(1.0)
+    words = [
+        WordTiming(w.word, float(w.start), float(w.end))
+        for w in getattr(transcription, "words", None) or []
+    ]
+    return TimedTranscript(transcription.text, words)
@@ -0,0 +1,306 @@
+"""Self-hosted OpenAI-compatible endpoints (vLLM, llama.cpp server, TGI).
+
+Requests reuse the OpenAI provider code paths against one or more local
+servers.  With several ``base_urls`` each call goes to the endpoint with the
+fewest requests in flight, so slow generations on one GPU do not queue work
+behind them while another sits idle.
+
+Endpoints come from the model's ``RECOMMENDED_MODELS`` entry::
+
+    "llama-3.1-8b-local": {
+        "provider": "openai_compatible",
+        "base_urls": ["http://gpu1:8000/v1", "http://gpu2:8000/v1"],
+        "served_model_name": "meta-llama/Llama-3.1-8B-Instruct",
+        "text_generation": True,
+    }
+
+or from ``OPENAI_COMPATIBLE_BASE_URLS`` (comma separated).  The API key is
+read from ``OPENAI_COMPATIBLE_API_KEY`` (most local servers accept any).
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import openai as _openai
+
+PROVIDER = "openai_compatible"
+BASE_URLS_ENV = "OPENAI_COMPATIBLE_BASE_URLS"
+API_KEY_ENV = "OPENAI_COMPATIBLE_API_KEY"
+MODEL_ENV = "OPENAI_COMPATIBLE_MODEL"
+
+_openai.API_KEY_ENVS[PROVIDER] = API_KEY_ENV
+
+
+class _Endpoint:
+    __slots__ = ("base_url", "client", "outstanding", "served", "failed")
+
+    def __init__(self, base_url: str, client: Any) -> None:
+        self.base_url = base_url
+        self.client = client
+        self.outstanding = 0
+        self.served = 0
+        self.failed = 0
+
+
+class LeastOutstandingClient:
+    """OpenAI client facade that spreads calls over several endpoints.
+
+    Attribute chains such as ``client.chat.completions.create`` resolve on
+    the endpoint with the fewest in-flight requests (ties go to the one that
+    has served the fewest).  Sync, async and streaming calls are supported;
+    a streamed response counts as in flight until it is consumed or closed.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[Tuple[str, Any]],
+        *,
+        served_model_name: Optional[str] = None,
+    ) -> None:
+        if not clients:
+            raise ValueError("LeastOutstandingClient needs at least one endpoint.")
+        self._endpoints = [_Endpoint(url, client) for url, client in clients]
+        self._served_model_name = served_model_name
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> _Endpoint:
+        with self._lock:
+            endpoint = min(self._endpoints, key=lambda e: (e.outstanding, e.served))
+            endpoint.outstanding += 1
+            return endpoint
+
+    def _release(self, endpoint: _Endpoint, ok: bool = True) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.served += 1
+            if not ok:
+                endpoint.failed += 1
+
+    def _prepare(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if self._served_model_name and "model" in kwargs:
+            kwargs = {**kwargs, "model": self._served_model_name}
+        return kwargs
+
+    def endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Return per-endpoint ``outstanding``/``served``/``failed`` counters."""
+        with self._lock:
+            return [
+                {
+                    "base_url": e.base_url,
+                    "outstanding": e.outstanding,
+                    "served": e.served,
+                    "failed": e.failed,
+                }
+                for e in self._endpoints
+            ]
+
+    def __getattr__(self, name: str) -> "_RoutedAttribute":
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _RoutedAttribute(self, (name,))
+
+    def __repr__(self) -> str:
+        urls = [e.base_url for e in self._endpoints]
+        return f"LeastOutstandingClient({urls!r})"
+
+
+class _RoutedAttribute:
+    """Attribute path on the balanced client, bound to an endpoint when called."""
+
+    __slots__ = ("_balancer", "_path")
+
+    def __init__(self, balancer: LeastOutstandingClient, path: Tuple[str, ...]) -> None:
+        self._balancer = balancer
+        self._path = path
+
+    def __getattr__(self, name: str) -> "_RoutedAttribute":
+        return _RoutedAttribute(self._balancer, self._path + (name,))
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        balancer = self._balancer
+        endpoint = balancer._acquire()
+        target = endpoint.client
+        try:
+            for name in self._path:
+                target = getattr(target, name)
+            result = target(*args, **balancer._prepare(kwargs))
+        except BaseException:
+            balancer._release(endpoint, ok=False)
+            raise
+        release = lambda ok=True: balancer._release(endpoint, ok)  # noqa: E731
+        if inspect.isawaitable(result):
+            return _await_tracked(result, release, bool(kwargs.get("stream")))
+        if kwargs.get("stream"):
+            return _TrackedStream(result, release)
+        release()
+        return result
+
+
+async def _await_tracked(awaitable: Any, release: Callable[..., None], stream: bool) -> Any:
+    # BaseException: a cancelled await (e.g. a wait_for timeout) must free
+    # the slot too, or the endpoint looks busy forever.
+    try:
+        result = await awaitable
+    except BaseException:
+        release(False)
+        raise
+    if stream:
+        return _TrackedStream(result, release)
+    release()
+    return result
+
+
+class _TrackedStream:
+    """Stream proxy that frees its endpoint slot when exhausted or closed."""
+
+    def __init__(self, stream: Any, release: Callable[..., None]) -> None:
+        self._stream = stream
+        self._release = release
+        self._done = False
+
+    def _finish(self, ok: bool = True) -> None:
+        if not self._done:
+            self._done = True
+            self._release(ok)
+
+    def __iter__(self) -> Any:
+        # ``finally`` also covers GeneratorExit from an early ``break``.
+        try:
+            yield from self._stream
+        except Exception:
+            self._finish(False)
+            raise
+        finally:
+            self._finish()
+
+    async def __aiter__(self) -> Any:
+        try:
+            async for chunk in self._stream:
+                yield chunk
+        except Exception:
+            self._finish(False)
+            raise
+        finally:
+            self._finish()
+
+    def __enter__(self) -> "_TrackedStream":
+        enter = getattr(self._stream, "__enter__", None)
+        if enter is not None:
+            enter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> Any:
+        try:
+            exit_ = getattr(self._stream, "__exit__", None)
+            return exit_(exc_type, exc, tb) if exit_ is not None else None
+        finally:
+            self._finish(exc_type is None)
+
+    async def __aenter__(self) -> "_TrackedStream":
+        aenter = getattr(self._stream, "__aenter__", None)
+        if aenter is not None:
+            await aenter()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> Any:
+        try:
+            aexit = getattr(self._stream, "__aexit__", None)
+            return await aexit(exc_type, exc, tb) if aexit is not None else None
+        finally:
+            self._finish(exc_type is None)
+
+    def close(self) -> None:
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._finish()
+
+    async def aclose(self) -> None:
+        try:
+            aclose = getattr(self._stream, "aclose", None) or getattr(
+                self._stream, "close", None
+            )
+            if aclose is not None:
+                result = aclose()
+                if inspect.isawaitable(result):
+                    await result
+        finally:
+            self._finish()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+    def __del__(self) -> None:  # pragma: no cover - abandoned stream
+        self._finish()
+
+
+def _base_urls(config: dict[str, Any]) -> List[str]:
+    urls = config.get("base_urls") or config.get("base_url")
+    if urls is None:
+        urls = os.getenv(BASE_URLS_ENV, "")
+    if isinstance(urls, str):
+        urls = [u for u in (part.strip() for part in urls.split(",")) if u]
+    if not urls:
+        raise ValueError(
+            f"No OpenAI-compatible endpoints configured; set 'base_urls' on the "
+            f"model or {BASE_URLS_ENV}."
+        )
+    return [u.rstrip("/") for u in urls]
+
+
+def _client_settings(config: dict[str, Any]) -> Tuple[List[str], str, Optional[str]]:
+    api_key = os.getenv(config.get("api_key_env", API_KEY_ENV)) or "EMPTY"
+    served = config.get("served_model_name") or os.getenv(MODEL_ENV) or None
+    return _base_urls(config), api_key, served
+
+
+def setup_client(model_name: str, config: dict[str, Any]) -> Any:
+    from openai import OpenAI
+
+    urls, api_key, served = _client_settings(config)
+    return LeastOutstandingClient(
+        [(url, OpenAI(base_url=url, api_key=api_key)) for url in urls],
+        served_model_name=served,
+    )
+
+
+async def async_setup_client(model_name: str, config: dict[str, Any]) -> Any:
+    from openai import AsyncOpenAI
+
+    urls, api_key, served = _client_settings(config)
+    return LeastOutstandingClient(
+        [(url, AsyncOpenAI(base_url=url, api_key=api_key)) for url in urls],
+        served_model_name=served,
+    )
+
+
+def _bind(operation: Callable[..., Any]) -> Callable[..., Any]:
+    """Run an OpenAI provider operation under this provider's name."""
+    bound = functools.partial(operation, provider=PROVIDER)
+    functools.update_wrapper(bound, operation)
+    return bound
+
+
+# Every operation goes through the OpenAI provider implementation, but rate
+# limits and errors are keyed on ``openai_compatible`` and its own API key.
+text_completion = _bind(_openai.text_completion)
+async_text_completion = _bind(_openai.async_text_completion)
+stream_text_completion = _bind(_openai.stream_text_completion)
+chat_completion = _bind(_openai.chat_completion)
+async_chat_completion = _bind(_openai.async_chat_completion)
+structured_completion = _bind(_openai.structured_completion)
+async_structured_completion = _bind(_openai.async_structured_completion)
+vision_completion = _bind(_openai.vision_completion)
+async_vision_completion = _bind(_openai.async_vision_completion)
+image_generation = _bind(_openai.image_generation)
+async_image_generation = _bind(_openai.async_image_generation)
+image_edit = _bind(_openai.image_edit)
+async_image_edit = _bind(_openai.async_image_edit)
+transcribe_audio = _bind(_openai.transcribe_audio)
+async_transcribe_audio = _bind(_openai.async_transcribe_audio)
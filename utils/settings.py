@@ -1,49 +1,98 @@
 import os
-from typing import Any
+from typing import Any, Callable, Dict
 
 from .logging import get_logger
 
 logger = get_logger()
 
-# Optional dependencies: dotenv and IPython display utilities
-try:
-    from dotenv import load_dotenv
-    from IPython.display import Image as IPyImage
-    from IPython.display import Markdown, display
-    from plantuml import PlantUML
-except ImportError:  # pragma: no cover - graceful fallback when deps missing
-    logger.warning(
-        "Optional core dependencies not found. Some features will be degraded."
-    )
+# Optional dependencies (python-dotenv, IPython, plantuml) are imported on
+# first use through the module ``__getattr__`` below, so importing settings
+# does not pay for IPython or plantuml.  Each falls back to a placeholder
+# when missing.
+_INSTALL_HINT = "To enable full functionality run: pip install python-dotenv ipython plantuml"
+
+
+def _missing(package: str) -> None:
     logger.warning(
-        "To enable full functionality run: pip install python-dotenv ipython plantuml"
+        "Optional dependency '%s' not found. Some features will be degraded.", package
     )
+    logger.warning(_INSTALL_HINT)
+
+
+def _resolve_load_dotenv() -> Any:
+    try:
+        from dotenv import load_dotenv
+    except ImportError:  # pragma: no cover - graceful fallback when deps missing
+        _missing("python-dotenv")
+
+        def load_dotenv(*args: Any, **kwargs: Any) -> None:
+            logger.warning("python-dotenv not installed; .env will not be loaded.")
+
+    return load_dotenv
+
+
+def _resolve_ipython() -> Dict[str, Any]:
+    try:
+        from IPython.display import Image as IPyImage
+        from IPython.display import Markdown, display
+    except ImportError:  # pragma: no cover - graceful fallback when deps missing
+        _missing("ipython")
+
+        def display(*args: Any, **kwargs: Any) -> None:
+            return None
+
+        def Markdown(text: str) -> str:
+            return text
+
+        class _IPyImage:
+            """Minimal placeholder used in notebooks."""
+
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                pass
+
+        IPyImage = _IPyImage  # type: ignore[assignment]
+    return {"display": display, "Markdown": Markdown, "IPyImage": IPyImage}
+
+
+def _resolve_plantuml() -> Any:
+    try:
+        from plantuml import PlantUML
+    except ImportError:  # pragma: no cover - graceful fallback when deps missing
+        _missing("plantuml")
 
-    def load_dotenv(*args: Any, **kwargs: Any) -> None:
-        logger.warning("python-dotenv not installed; .env will not be loaded.")
+        class _PlantUML:  # pragma: no cover - diagnostic only
+            def __init__(self, url: str | None = None) -> None:
+                logger.warning("plantuml not installed; rendering disabled.")
 
-    def display(*args: Any, **kwargs: Any) -> None:
-        return None
+            def processes(self, *args: Any, **kwargs: Any) -> None:
+                logger.warning("PlantUML rendering skipped (plantuml not installed).")
 
-    def Markdown(text: str) -> str:
-        return text
+        PlantUML = _PlantUML  # type: ignore[assignment]
+    return PlantUML
 
-    class _IPyImage:
-        """Minimal placeholder used in notebooks."""
 
-        def __init__(self, *args: Any, **kwargs: Any) -> None:
-            pass
+_RESOLVERS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "load_dotenv": lambda: {"load_dotenv": _resolve_load_dotenv()},
+    "display": _resolve_ipython,
+    "Markdown": _resolve_ipython,
+    "IPyImage": _resolve_ipython,
+    "PlantUML": lambda: {"PlantUML": _resolve_plantuml()},
+}
 
-    IPyImage = _IPyImage  # type: ignore[assignment]
 
-    class _PlantUML:  # pragma: no cover - diagnostic only
-        def __init__(self, url: str | None = None) -> None:
-            logger.warning("plantuml not installed; rendering disabled.")
+def __getattr__(name: str) -> Any:
+    resolver = _RESOLVERS.get(name)
+    if resolver is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache every name the resolver provides; assigned (patched) values win.
+    for key, value in resolver().items():
+        globals().setdefault(key, value)
+    return globals()[name]
 
-        def processes(self, *args: Any, **kwargs: Any) -> None:
-            logger.warning("PlantUML rendering skipped (plantuml not installed).")
 
-    PlantUML = _PlantUML  # type: ignore[assignment]
+def _optional(name: str) -> Any:
+    """Return optional attribute ``name`` from inside this module."""
+    return globals()[name] if name in globals() else __getattr__(name)
 
 
 def load_environment() -> None:
@@ -66,16 +115,10 @@ def load_environment() -> None:
 
     dotenv_path = os.path.join(project_root, ".env")
     if os.path.exists(dotenv_path):
-        load_dotenv(dotenv_path=dotenv_path)
+        _optional("load_dotenv")(dotenv_path=dotenv_path)
     else:
         logger.warning(".env file not found. API keys may not be loaded.")
 
 
-__all__ = [
-    "load_environment",
-    "load_dotenv",
-    "display",
-    "Markdown",
-    "IPyImage",
-    "PlantUML",
-]
+# The optional names are served lazily by ``__getattr__``.
+__all__ = ["load_environment", *_RESOLVERS]
@@ -0,0 +1,430 @@
+"""Extract code blocks and JSON from LLM output, including streamed output.
+
+Also holds the schema helpers behind :func:`utils.get_structured_completion`:
+a schema is a pydantic model class or a JSON-schema ``dict``.
+
+Fence patterns are compiled once per language and cached.
+:class:`IncrementalJSONParser` consumes a completion chunk by chunk and
+returns each JSON value as soon as it closes; the elements of a top-level
+array are emitted one at a time, so a long list (e.g. generated user
+stories) can be processed while the model is still writing it.
+
+Example
+-------
+>>> parser = IncrementalJSONParser()
+>>> parser.feed('```json\n[{"id": 1}, {"id"')
+[{'id': 1}]
+>>> parser.feed(': 2}]\n```')
+[{'id': 2}]
+"""
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+from .logging import get_logger
+
+logger = get_logger()
+
+_FENCE = "```"
+_ANY_BLOCK = re.compile(r"```[ \t]*([\w+#.-]*)[^\n]*\n(.*?)\n?[ \t]*```", re.DOTALL)
+
+
+@lru_cache(maxsize=64)
+def _fence_pattern(language: str) -> "re.Pattern[str]":
+    return re.compile(
+        r"```(?:" + re.escape(language) + r")?\s*\n(.*?)\n```",
+        re.DOTALL | re.IGNORECASE,
+    )
+
+
+def extract_code_block(text: str, language: str = "json") -> str:
+    """Return the first fenced block (preferring ``language``) or ``text``.
+
+    This is the behaviour of :func:`utils.clean_llm_output`: without fences
+    the stripped input is returned unchanged.
+    """
+    if _FENCE not in text:
+        return text.strip()
+    match = _fence_pattern(language).search(text)
+    if match:
+        return match.group(1).strip()
+    parts = text.split(_FENCE)
+    if len(parts) >= 3:
+        return parts[1].strip()
+    return text.strip()
+
+
+def extract_code_blocks(text: str, language: Optional[str] = None) -> List[str]:
+    """Return the contents of all fenced blocks, in order.
+
+    With ``language`` only blocks whose info string names that language
+    (case-insensitive) are returned; ``language=""`` selects untagged blocks.
+    """
+    wanted = None if language is None else language.lower()
+    return [
+        body.strip()
+        for tag, body in _ANY_BLOCK.findall(text)
+        if wanted is None or tag.lower() == wanted
+    ]
+
+
+def code_blocks_by_language(text: str) -> Dict[str, List[str]]:
+    """Group fenced blocks by their (lower-cased) language tag."""
+    grouped: Dict[str, List[str]] = {}
+    for tag, body in _ANY_BLOCK.findall(text):
+        grouped.setdefault(tag.lower(), []).append(body.strip())
+    return grouped
+
+
+def extract_json(text: str) -> Any:
+    """Parse the JSON in an LLM reply.
+
+    Tries the cleaned reply (see :func:`extract_code_block`) first, then the
+    first complete JSON value in ``text``; values opening at the start of a
+    line win over brackets inside a sentence.
+
+    Raises
+    ------
+    ValueError
+        If no JSON value can be parsed.
+    """
+    try:
+        return json.loads(extract_code_block(text))
+    except ValueError:
+        pass
+    parser = IncrementalJSONParser(stream_arrays=False)
+    values = parser.feed(text)
+    try:
+        values += parser.close()  # values from brackets inside prose come last
+    except ValueError:
+        pass
+    if not values:
+        raise ValueError("No JSON value found in LLM output.")
+    return values[0]
+
+
+class IncrementalJSONParser:
+    """Parse JSON values out of text that arrives in chunks.
+
+    :meth:`feed` returns the values completed by the new chunk.  Text
+    outside JSON values (prose, fence markers) is skipped; once a fenced
+    block has been seen, values are only read inside fences so brackets in
+    prose are not mistaken for JSON.  Before that, a value opening at the
+    start of a line is returned as it completes, while one opening mid-line
+    (``see [1]``) is held back: a later fence discards it, otherwise
+    :meth:`close` returns it.  Several values in a row (JSON lines,
+    multiple blocks) are all returned.
+
+    Parameters
+    ----------
+    stream_arrays:
+        Emit the elements of a top-level array individually as they close
+        (default) instead of the array as a whole.
+
+    Raises
+    ------
+    ValueError
+        From :meth:`feed` when a value inside a fence is malformed, and from
+        :meth:`close` when the input ends inside a value that opened at the
+        start of a line or inside a fence.
+    """
+
+    def __init__(self, *, stream_arrays: bool = True) -> None:
+        self.stream_arrays = stream_arrays
+        self._buf = ""
+        self._pos = 0
+        self._start: Optional[int] = None  # start of the current top-level value
+        self._streaming = False  # current value is an array streamed per element
+        self._elem: Optional[int] = None  # start of the current array element
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._fence_seen = False
+        self._in_fence = False
+        self._line_start = True  # only whitespace so far on the current line
+        self._inline = False  # current value opened mid-line in prose
+        self._held: List[Any] = []  # values from mid-line prose brackets
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume ``chunk`` and return the JSON values it completed."""
+        self._buf += chunk
+        out: List[Any] = []
+        buf = self._buf
+        i = self._pos
+        n = len(buf)
+        while i < n:
+            c = buf[i]
+            if self._start is None:
+                if c == "`":
+                    if n - i < 3:
+                        break  # maybe a fence split across chunks
+                    if buf.startswith(_FENCE, i):
+                        eol = buf.find("\n", i + 3)
+                        if eol < 0:
+                            break  # wait for the rest of the info string
+                        self._fence_seen = True
+                        self._in_fence = not self._in_fence
+                        if self._in_fence:
+                            self._held.clear()  # the brackets were prose
+                        self._line_start = True
+                        i = eol + 1
+                        continue
+                elif c in "{[" and (self._in_fence or not self._fence_seen):
+                    self._start = i
+                    self._depth = 1
+                    self._streaming = c == "[" and self.stream_arrays
+                    self._elem = None
+                    self._inline = not (self._in_fence or self._line_start)
+                if c == "\n":
+                    self._line_start = True
+                elif not c.isspace():
+                    self._line_start = False
+                i += 1
+                continue
+
+            if c == "`" and not self._in_fence and buf[i - 1] == "\n":
+                # A fence opening at the start of a line cannot be part of a
+                # JSON value (strings hold no raw newlines): the bracket that
+                # opened it was prose, so rescan from the fence.
+                if n - i < 3:
+                    break
+                if buf.startswith(_FENCE, i):
+                    self._start = self._elem = None
+                    self._depth = 0
+                    self._in_string = self._escape = False
+                    continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                i += 1
+                continue
+
+            at_elements = self._streaming and self._depth == 1
+            if c == '"':
+                self._in_string = True
+                if at_elements and self._elem is None:
+                    self._elem = i
+            elif c in "{[":
+                if at_elements and self._elem is None:
+                    self._elem = i
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    if self._streaming:
+                        if self._elem is not None:
+                            self._emit(buf[self._elem:i], out)
+                    else:
+                        self._emit(buf[self._start:i + 1], out)
+                    self._start = self._elem = None
+                elif self._streaming and self._depth == 1:
+                    self._emit(buf[self._elem:i + 1], out)
+                    self._elem = None
+            elif c == ",":
+                if at_elements and self._elem is not None:
+                    self._emit(buf[self._elem:i], out)
+                    self._elem = None
+            elif not c.isspace() and at_elements and self._elem is None:
+                self._elem = i
+            i += 1
+        self._compact(i)
+        return out
+
+    def close(self) -> List[Any]:
+        """Signal the end of input and return the values held back from prose.
+
+        Raises if a value other than an unmatched prose bracket is left
+        unfinished.
+        """
+        if self._start is not None and not self._inline:
+            raise ValueError("Input ended inside a JSON value.")
+        held, self._held = self._held, []
+        self._buf, self._pos = "", 0
+        self._start = self._elem = None
+        self._depth = 0
+        self._in_string = self._escape = False
+        self._line_start = True
+        return held
+
+    def _emit(self, text: str, out: List[Any]) -> None:
+        try:
+            (self._held if self._inline else out).append(json.loads(text))
+        except ValueError as e:
+            if self._in_fence:
+                raise ValueError(f"Malformed JSON in LLM output: {e}") from None
+            # Outside fences a bracket may just be prose; drop the value.
+            self._start = self._elem = None
+            self._depth = 0
+
+    def _compact(self, scanned: int) -> None:
+        """Drop text that is no longer needed so memory stays bounded."""
+        if self._start is None:
+            keep = scanned
+        elif self._streaming:
+            keep = scanned if self._elem is None else self._elem
+        else:
+            keep = self._start
+        keep = min(keep, scanned)
+        self._buf = self._buf[keep:]
+        self._pos = scanned - keep
+        if self._start is not None:
+            self._start = max(self._start - keep, 0)
+        if self._elem is not None:
+            self._elem -= keep
+
+
+def iter_json(chunks: Iterable[str], *, stream_arrays: bool = True) -> Iterator[Any]:
+    """Yield JSON values from a stream of text chunks as they complete.
+
+    Example
+    -------
+    >>> for story in iter_json(stream_completion(prompt, client, model, provider)):
+    ...     save_story(story)
+    """
+    parser = IncrementalJSONParser(stream_arrays=stream_arrays)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_json(
+    chunks: AsyncIterable[str], *, stream_arrays: bool = True
+) -> AsyncIterator[Any]:
+    """Asynchronous :func:`iter_json`."""
+    parser = IncrementalJSONParser(stream_arrays=stream_arrays)
+    async for chunk in chunks:
+        for value in parser.feed(chunk):
+            yield value
+    for value in parser.close():
+        yield value
+
+
+def is_pydantic_model(schema: Any) -> bool:
+    return isinstance(schema, type) and hasattr(schema, "model_json_schema")
+
+
+def json_schema_of(schema: Any) -> Dict[str, Any]:
+    """Return the JSON schema for a pydantic model class or schema ``dict``."""
+    if is_pydantic_model(schema):
+        return schema.model_json_schema()
+    if isinstance(schema, dict):
+        return schema
+    raise TypeError(
+        f"Expected a pydantic model class or a JSON-schema dict, got {type(schema).__name__}."
+    )
+
+
+def schema_name(schema: Any) -> str:
+    """Name for the schema in provider requests (``[A-Za-z0-9_-]``, <= 64 chars)."""
+    if is_pydantic_model(schema):
+        raw = schema.__name__
+    else:
+        raw = json_schema_of(schema).get("title") or "response"
+    return re.sub(r"[^A-Za-z0-9_-]", "_", str(raw))[:64]
+
+
+@lru_cache(maxsize=1)
+def _jsonschema() -> Any:
+    try:
+        import jsonschema
+    except ImportError:  # pragma: no cover - optional dependency
+        logger.warning(
+            "jsonschema is not installed; dict schemas are only checked for "
+            "their top-level 'type' and 'required' keys."
+        )
+        return None
+    return jsonschema
+
+
+# JSON-schema type names -> Python types of parsed JSON.  bool is excluded
+# from the numeric types below because it subclasses int.
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+def _is_json_type(data: Any, name: str) -> bool:
+    python_type = _JSON_TYPES.get(name)
+    if python_type is None:
+        return True  # unknown names are left to a full validator
+    if isinstance(data, bool) and name in ("integer", "number"):
+        return False
+    return isinstance(data, python_type)
+
+
+def _check_top_level(data: Any, schema: Dict[str, Any]) -> None:
+    """Check ``type`` and ``required`` only, when jsonschema is unavailable."""
+    expected = schema.get("type")
+    if expected is not None:
+        names = [expected] if isinstance(expected, str) else list(expected)
+        if not any(_is_json_type(data, name) for name in names):
+            raise ValueError(f"{data!r} is not of type {' or '.join(map(repr, names))}")
+    if isinstance(data, dict):
+        for key in schema.get("required", ()):
+            if key not in data:
+                raise ValueError(f"{key!r} is a required property")
+
+
+def validate_structured(data: Any, schema: Any) -> Any:
+    """Validate parsed JSON against ``schema``.
+
+    Returns a model instance for pydantic schemas and ``data`` itself for
+    dict schemas.  Dict schemas are checked with ``jsonschema`` when it is
+    installed; otherwise only their top-level ``type`` and ``required``
+    keys are enforced.
+
+    Raises
+    ------
+    ValueError
+        If ``data`` does not match (pydantic's ``ValidationError`` is a
+        ``ValueError``).
+    """
+    if is_pydantic_model(schema):
+        return schema.model_validate(data)
+    json_schema = json_schema_of(schema)
+    jsonschema = _jsonschema()
+    if jsonschema is None:
+        _check_top_level(data, json_schema)
+        return data
+    try:
+        jsonschema.validate(data, json_schema)
+    except jsonschema.ValidationError as e:
+        raise ValueError(e.message) from None
+    return data
+
+
+def schema_instructions(schema: Any) -> str:
+    """Prompt suffix for providers without a native structured-output mode."""
+    return (
+        "\n\nRespond only with a JSON value that matches this JSON schema, "
+        "without commentary:\n" + json.dumps(json_schema_of(schema))
+    )
+
+
+__all__ = [
+    "json_schema_of",
+    "schema_name",
+    "validate_structured",
+    "schema_instructions",
+    "extract_code_block",
+    "extract_code_blocks",
+    "code_blocks_by_language",
+    "extract_json",
+    "IncrementalJSONParser",
+    "iter_json",
+    "aiter_json",
+]